@@ -1,7 +1,9 @@
 # Inicialización de la aplicación Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from app.db_routing import RoutingSession
 
-# Inicializar SQLAlchemy sin app (se vinculará después)
-db = SQLAlchemy()
+# Inicializar SQLAlchemy sin app (se vinculará después).
+# RoutingSession manda las lecturas de @read_replica a la réplica, si hay.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
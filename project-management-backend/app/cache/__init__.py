@@ -0,0 +1,12 @@
+# Caché de lecturas de servicios
+
+from app.cache.read_cache import read_cache, project_tag, ReadCache
+from app.cache.backends import LocalBackend, RedisBackend
+
+__all__ = [
+    'read_cache',
+    'project_tag',
+    'ReadCache',
+    'LocalBackend',
+    'RedisBackend'
+]
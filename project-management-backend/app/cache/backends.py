@@ -0,0 +1,107 @@
+"""
+Backends de la caché de lecturas
+
+LocalBackend: LRU con TTL en memoria del proceso (por defecto, y stand-in
+cuando no hay Redis). RedisBackend: compartido entre workers; requiere el
+paquete `redis` y CACHE_REDIS_URL.
+
+Ambos guardan los valores serializados con pickle, así quien lee nunca
+comparte (ni puede mutar) el objeto guardado.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # Dependencia opcional
+    redis = None
+
+
+class LocalBackend:
+    name = 'local'
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, data)
+        self._tag_versions = {}
+
+    def get(self, key):
+        """(encontrado, valor)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, pickle.loads(data)
+
+    def set(self, key, value, ttl):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._tag_versions.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_versions.clear()
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    name = 'redis'
+
+    def __init__(self, url, prefix='pm:cache:'):
+        if redis is None:
+            raise RuntimeError('El paquete redis no está instalado')
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        data = self._client.get(self.prefix + key)
+        if data is None:
+            return False, None
+        return True, pickle.loads(data)
+
+    def set(self, key, value, ttl):
+        self._client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=max(1, int(ttl)))
+
+    def tag_versions(self, tags):
+        if not tags:
+            return []
+        values = self._client.mget([f'{self.prefix}tag:{tag}' for tag in tags])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def bump_tags(self, tags):
+        pipe = self._client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f'{self.prefix}tag:{tag}')
+        pipe.execute()
+
+    def clear(self):
+        for key in self._client.scan_iter(match=f'{self.prefix}*'):
+            self._client.delete(key)
+
+    def size(self):
+        return None
@@ -0,0 +1,139 @@
+"""
+Caché de lecturas de servicios con invalidación por etiquetas
+
+Las entradas se guardan bajo una clave que incluye la versión actual de cada
+etiqueta (p. ej. project:<id>:members). Invalidar una etiqueta solo incrementa
+su versión: las entradas viejas dejan de encontrarse y expiran por TTL/LRU.
+Como la invalidación corre después del commit, una lectura concurrente que
+cargó datos viejos los guarda bajo la versión anterior y nunca se sirven.
+
+Con el backend local cada worker tiene su propia copia: la invalidación solo
+alcanza al proceso que escribió y el TTL acota lo que pueden tardar los demás.
+Para varios workers conviene CACHE_BACKEND=redis.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from functools import wraps
+from app.cache.backends import LocalBackend, RedisBackend
+from app.db_routing import replica_router
+
+logger = logging.getLogger(__name__)
+
+
+def project_tag(project_id, domain):
+    """Etiqueta de un dominio del proyecto (mismos dominios que project_versions)"""
+    return f'project:{project_id}:{domain}'
+
+
+class ReadCache:
+    def __init__(self):
+        self.enabled = True
+        self.default_ttl = 30
+        self.backend = LocalBackend()
+        self._lock = threading.Lock()
+        self._metrics = defaultdict(lambda: {'hits': 0, 'misses': 0, 'errors': 0})
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get('CACHE_BACKEND', 'local') != 'none'
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', self.default_ttl)
+        self.backend = LocalBackend(app.config.get('CACHE_MAX_ENTRIES', 2048))
+        if app.config.get('CACHE_BACKEND') == 'redis':
+            try:
+                self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], app.config.get('CACHE_KEY_PREFIX', 'pm:cache:'))
+            except Exception as e:
+                logger.warning(f'Caché Redis no disponible ({e}); se usa la caché local')
+        app.extensions['read_cache'] = self
+
+    def _count(self, name, metric):
+        with self._lock:
+            self._metrics[name][metric] += 1
+
+    def get_or_load(self, name, key, tags, loader, ttl=None):
+        """
+        Devolver el valor en caché o cargarlo con loader() y guardarlo.
+
+        Si el backend falla se responde con loader() sin cachear.
+        """
+        if not self.enabled:
+            return loader()
+        tags = list(tags or [])
+        try:
+            versions = self.backend.tag_versions(tags)
+            full_key = f'{name}|{key}|{",".join(map(str, versions))}'
+            found, value = self.backend.get(full_key)
+        except Exception as e:
+            logger.warning(f'Error leyendo la caché {name}: {e}')
+            self._count(name, 'errors')
+            return loader()
+
+        if found:
+            self._count(name, 'hits')
+            return value
+
+        self._count(name, 'misses')
+        # Lo que se guarda bajo la versión nueva de las etiquetas no puede venir
+        # de una réplica atrasada: se carga siempre del primario
+        with replica_router.primary_reads():
+            value = loader()
+        try:
+            self.backend.set(full_key, value, ttl or self.default_ttl)
+        except Exception as e:
+            logger.warning(f'Error guardando en la caché {name}: {e}')
+            self._count(name, 'errors')
+        return value
+
+    def cached(self, name, tags, ttl=None):
+        """
+        Decorador para lecturas de servicios.
+
+        tags recibe los mismos argumentos que la función y devuelve sus
+        etiquetas. La clave se arma con los argumentos (deben tener repr estable).
+
+        Uso:
+            @staticmethod
+            @read_cache.cached('sprints', tags=lambda project_id, status=None: [project_tag(project_id, 'sprints')])
+            def list_sprints(project_id, status=None): ...
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                key = repr((args, sorted(kwargs.items())))
+                return self.get_or_load(name, key, tags(*args, **kwargs), lambda: fn(*args, **kwargs), ttl)
+            wrapper.uncached = fn
+            return wrapper
+        return decorator
+
+    def invalidate_tags(self, *tags):
+        """Invalidar todas las entradas con alguna de las etiquetas. Llamar después del commit."""
+        if not tags:
+            return
+        try:
+            self.backend.bump_tags(tags)
+            with self._lock:
+                self.invalidations += len(tags)
+        except Exception as e:
+            logger.error(f'Error invalidando la caché ({", ".join(tags)}): {e}')
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            caches = {name: dict(values) for name, values in self._metrics.items()}
+            invalidations = self.invalidations
+        for values in caches.values():
+            total = values['hits'] + values['misses']
+            values['hit_ratio'] = round(values['hits'] / total, 3) if total else None
+        return {
+            'backend': self.backend.name,
+            'enabled': self.enabled,
+            'entries': self.backend.size(),
+            'invalidations': invalidations,
+            'caches': caches
+        }
+
+
+read_cache = ReadCache()
@@ -0,0 +1,201 @@
+"""
+Comandos de línea de comandos (flask <grupo> <comando>)
+"""
+
+import json
+import click
+from flask.cli import AppGroup
+from app.models import Project, User
+
+tasks_cli = AppGroup('tasks', help='Operaciones sobre tareas')
+search_cli = AppGroup('search', help='Índice de búsqueda unificada')
+uuid_cli = AppGroup('uuid', help='Conversión en línea de ids a uuid nativo (PostgreSQL)')
+
+
+def _without_request_timeouts():
+    """Los timeouts del pool web (perfil production) cortarían importaciones, exportaciones y reindexados"""
+    from app import db
+    from app.config.database import disable_session_timeouts
+
+    disable_session_timeouts(db.engine)
+
+
+def _get_project_or_fail(project_id):
+    project = Project.query.get(project_id)
+    if not project:
+        raise click.ClickException(f'Proyecto {project_id} no encontrado')
+    return project
+
+
+@tasks_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--project-id', required=True, help='Proyecto destino')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None,
+              help='Formato del archivo (por defecto, según la extensión)')
+@click.option('--created-by', default=None, help='Usuario creador (por defecto, el Owner del proyecto)')
+def import_tasks_command(path, project_id, fmt, created_by):
+    """Importar tareas desde un archivo CSV o NDJSON"""
+    from app.services import TaskImportService
+
+    _without_request_timeouts()
+    project = _get_project_or_fail(project_id)
+    if created_by and not User.query.get(created_by):
+        raise click.ClickException(f'Usuario {created_by} no encontrado')
+    fmt = fmt or TaskImportService.detect_format(path)
+    if not fmt:
+        raise click.ClickException('No se pudo determinar el formato. Usa --format csv|ndjson')
+
+    with open(path, 'rb') as stream:
+        summary = TaskImportService.import_tasks(project, stream, fmt, created_by or project.owner_id)
+
+    click.echo(f"Importadas: {summary['imported']}  Con errores: {summary['failed']}")
+    for error in summary['errors']:
+        click.echo(f"  línea {error['line']}: {json.dumps(error['errors'], ensure_ascii=False)}", err=True)
+    if summary['errors_truncated']:
+        click.echo('  (se omitieron más errores)', err=True)
+
+
+@tasks_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--project-id', required=True, help='Proyecto a exportar')
+@click.option('--gzip', 'compress', is_flag=True, default=False, help='Comprimir la salida con gzip')
+def export_project_command(path, project_id, compress):
+    """Exportar un proyecto completo a un archivo NDJSON (o NDJSON.gz)"""
+    from app.services import ProjectExportService
+
+    _without_request_timeouts()
+    _get_project_or_fail(project_id)
+    lines = 0
+
+    def counted(chunks):
+        nonlocal lines
+        for chunk in chunks:
+            lines += 1
+            yield chunk
+
+    body = counted(ProjectExportService.iter_ndjson(project_id))
+    if compress:
+        with open(path, 'wb') as output:
+            for block in ProjectExportService.iter_gzip(body):
+                output.write(block)
+    else:
+        with open(path, 'w', encoding='utf-8') as output:
+            for line in body:
+                output.write(line)
+
+    click.echo(f'Exportados {lines} registros a {path}')
+
+
+@search_cli.command('reindex')
+@click.option('--project-id', default=None, help='Proyecto a reindexar (por defecto, todos)')
+def reindex_search_command(project_id):
+    """Reconstruir el índice de búsqueda desde tareas, comentarios, chat y miembros"""
+    from app import db
+    from app.search import SearchIndex
+
+    _without_request_timeouts()
+    if project_id:
+        project_ids = [_get_project_or_fail(project_id).id]
+    else:
+        project_ids = [row[0] for row in db.session.query(Project.id).all()]
+
+    total = 0
+    for pid in project_ids:
+        # Un commit por proyecto: el índice de cada proyecto se reemplaza de forma atómica
+        count = SearchIndex.rebuild_project(pid)
+        db.session.commit()
+        total += count
+        click.echo(f'  {pid}: {count} documentos')
+
+    click.echo(f'Reindexados {len(project_ids)} proyectos ({total} documentos)')
+
+
+def _run_uuid_phase(phase, *args, **kwargs):
+    from app import db
+    from app.dbtools import UuidMigrationError
+
+    _without_request_timeouts()
+    try:
+        return phase(db.engine, db.metadata, *args, **kwargs)
+    except UuidMigrationError as e:
+        raise click.ClickException(str(e))
+
+
+@uuid_cli.command('status')
+def uuid_status_command():
+    """Columnas pendientes, filas sin copiar e índices sombra"""
+    from app.dbtools.uuid_columns import status
+
+    report = _run_uuid_phase(status)
+    if not report:
+        click.echo('Todas las columnas GUID ya son uuid')
+        return
+    for table, entry in report.items():
+        columns = ', '.join(
+            f"{c['column']}" + ('' if not c['shadow'] else f" (sin copiar: {c['remaining']})")
+            for c in entry['columns']
+        )
+        click.echo(f'{table}: {columns}')
+        for index, state in entry['indexes'].items():
+            click.echo(f'  {index}: {state}')
+
+
+@uuid_cli.command('prepare')
+@click.option('--lock-timeout', default='5s', help='lock_timeout de cada ALTER TABLE')
+def uuid_prepare_command(lock_timeout):
+    """Fase 1: columnas sombra, trigger de sincronización y CHECK NOT NULL"""
+    from app.dbtools.uuid_columns import prepare
+
+    pending = _run_uuid_phase(prepare, lock_timeout=lock_timeout)
+    for table, columns in pending.items():
+        click.echo(f"  {table}: {', '.join(column for column, _ in columns)}")
+    click.echo(f'Preparadas {len(pending)} tablas')
+
+
+@uuid_cli.command('backfill')
+@click.option('--batch-size', default=5000, show_default=True, help='Filas por lote (un commit por lote)')
+@click.option('--pause', default=0.0, show_default=True, help='Segundos de pausa entre lotes')
+def uuid_backfill_command(batch_size, pause):
+    """Fase 2: copiar las filas existentes a las columnas sombra"""
+    from app.dbtools.uuid_columns import backfill
+
+    updated = _run_uuid_phase(backfill, batch_size=batch_size, pause=pause)
+    for table, count in updated.items():
+        click.echo(f'  {table}: {count} filas')
+
+
+@uuid_cli.command('index')
+def uuid_index_command():
+    """Fase 3: índices sombra con CREATE INDEX CONCURRENTLY"""
+    from app.dbtools.uuid_columns import build_indexes
+
+    def progress(table, index, seconds):
+        click.echo(f'  {table}: {index} ({seconds:.1f}s)')
+
+    created = _run_uuid_phase(build_indexes, progress=progress)
+    click.echo(f'Creados {len(created)} índices')
+
+
+@uuid_cli.command('swap')
+@click.option('--lock-timeout', default='5s', help='Si no obtiene los locks en este tiempo, falla sin cambios')
+def uuid_swap_command(lock_timeout):
+    """Fase 4: reemplazar las columnas de texto por las uuid (transacción corta)"""
+    from app.dbtools.uuid_columns import swap
+
+    tables = _run_uuid_phase(swap, lock_timeout=lock_timeout)
+    click.echo(f"Convertidas: {', '.join(tables) or 'ninguna'}. Siguiente: flask uuid validate")
+
+
+@uuid_cli.command('validate')
+def uuid_validate_command():
+    """Fase 5: validar las FK recreadas como NOT VALID"""
+    from app.dbtools.uuid_columns import validate_foreign_keys
+
+    validated = _run_uuid_phase(validate_foreign_keys)
+    click.echo(f'Validadas {len(validated)} FK')
+
+
+def register_cli(app):
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(uuid_cli)
@@ -0,0 +1,219 @@
+"""
+Opciones del engine de SQLAlchemy (pool de conexiones)
+
+Perfiles por entorno con valores explícitos para el pool, sobreescribibles
+con variables DB_*. Los valores se validan al cargar la configuración: un
+DB_POOL_SIZE inválido falla al arrancar y no en la primera petición.
+
+Criterio de los valores de producción (gunicorn gthread, 8 threads por worker,
+Postgres administrado que corta conexiones inactivas):
+  - pool_size = threads del worker: cada thread tiene su conexión sin esperar.
+  - max_overflow cubre los threads auxiliares (dashboard, scheduler, eventos).
+  - pool_recycle por debajo del corte de conexiones inactivas del proveedor y
+    pool_pre_ping para descartar las que se cortaron igual (reinicios, failover).
+  - pool_use_lifo: reutiliza las conexiones recientes y deja envejecer las
+    sobrantes, que se reciclan en lugar de quedar abiertas sin uso.
+  - statement_timeout / idle_in_transaction_session_timeout: una consulta o una
+    transacción colgada no retiene una conexión del pool indefinidamente.
+
+Los timeouts son para las peticiones web, pero el engine es uno solo: flask db
+(migraciones), flask uuid, flask search reindex y flask tasks import/export lo
+comparten. Esos comandos llaman a disable_session_timeouts() antes de tocar la
+base, y sus conexiones arrancan sin statement_timeout ni
+idle_in_transaction_session_timeout (un ALTER COLUMN TYPE, un backfill o un
+CREATE INDEX CONCURRENTLY pueden tardar mucho más de 30 s).
+"""
+
+import os
+from dataclasses import dataclass, fields, replace
+from sqlalchemy import event
+
+DB_PROFILES = ('development', 'production', 'testing')
+
+
+@dataclass(frozen=True)
+class EngineOptions:
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = -1
+    pool_pre_ping: bool = False
+    pool_use_lifo: bool = False
+    connect_timeout: int = 10
+    statement_timeout_ms: int = 0
+    idle_in_transaction_timeout_ms: int = 0
+    application_name: str = 'project-management-backend'
+    tcp_keepalives: bool = True
+
+    def __post_init__(self):
+        errors = []
+        if self.pool_size < 1:
+            errors.append('pool_size debe ser >= 1')
+        if self.max_overflow < -1:
+            errors.append('max_overflow debe ser >= -1 (-1 = sin límite)')
+        if self.pool_timeout <= 0:
+            errors.append('pool_timeout debe ser > 0')
+        if self.pool_recycle == 0 or self.pool_recycle < -1:
+            errors.append('pool_recycle debe ser > 0 o -1 (sin reciclar)')
+        if self.connect_timeout < 1:
+            errors.append('connect_timeout debe ser >= 1')
+        if self.statement_timeout_ms < 0 or self.idle_in_transaction_timeout_ms < 0:
+            errors.append('los timeouts de Postgres deben ser >= 0 (0 = sin límite)')
+        if errors:
+            raise ValueError('Configuración de base de datos inválida: ' + '; '.join(errors))
+
+    @classmethod
+    def from_env(cls, profile, environ=None):
+        """Perfil base con los overrides DB_<CAMPO> del entorno (DB_POOL_SIZE, DB_POOL_PRE_PING, ...)"""
+        environ = os.environ if environ is None else environ
+        if profile not in DB_PROFILES:
+            raise ValueError(f'Perfil de base de datos inválido: {profile} (opciones: {", ".join(DB_PROFILES)})')
+        base = _PROFILES[profile]
+
+        overrides = {}
+        for field in fields(cls):
+            name = 'DB_' + field.name.upper()
+            if name not in environ or environ[name] == '':
+                continue
+            overrides[field.name] = _parse(name, environ[name], field.type)
+        return replace(base, **overrides)
+
+    def engine_options(self, database_uri):
+        """Diccionario para SQLALCHEMY_ENGINE_OPTIONS según el dialecto de la URI"""
+        from app.utils.pool_metrics import InstrumentedQueuePool
+
+        if database_uri.startswith('sqlite'):
+            if ':memory:' in database_uri or database_uri in ('sqlite://', 'sqlite:///'):
+                # Base en memoria: Flask-SQLAlchemy usa su propio pool de una conexión
+                return {}
+            return {
+                'poolclass': InstrumentedQueuePool,
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'pool_timeout': self.pool_timeout,
+                'pool_pre_ping': self.pool_pre_ping,
+            }
+
+        options = {
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': self.pool_size,
+            'max_overflow': self.max_overflow,
+            'pool_timeout': self.pool_timeout,
+            'pool_recycle': self.pool_recycle,
+            'pool_pre_ping': self.pool_pre_ping,
+            'pool_use_lifo': self.pool_use_lifo,
+        }
+        if database_uri.startswith('postgresql'):
+            server_options = []
+            if self.statement_timeout_ms:
+                server_options.append(f'-c statement_timeout={self.statement_timeout_ms}')
+            if self.idle_in_transaction_timeout_ms:
+                server_options.append(f'-c idle_in_transaction_session_timeout={self.idle_in_transaction_timeout_ms}')
+            connect_args = {
+                'connect_timeout': self.connect_timeout,
+                'application_name': self.application_name,
+            }
+            if server_options:
+                connect_args['options'] = ' '.join(server_options)
+            if self.tcp_keepalives:
+                # Detectar conexiones cortadas por NAT/proxy antes de usarlas
+                connect_args.update({'keepalives': 1, 'keepalives_idle': 30, 'keepalives_interval': 10, 'keepalives_count': 3})
+            options['connect_args'] = connect_args
+        return options
+
+
+def _parse(name, raw, kind):
+    value = raw.strip()
+    try:
+        if kind in (bool, 'bool'):
+            if value.lower() in ('1', 'true', 'yes', 'on'):
+                return True
+            if value.lower() in ('0', 'false', 'no', 'off'):
+                return False
+            raise ValueError(value)
+        if kind in (int, 'int'):
+            return int(value)
+        if kind in (float, 'float'):
+            return float(value)
+        return value
+    except ValueError:
+        raise ValueError(f'{name} inválido: {raw!r}') from None
+
+
+def _default_threads():
+    try:
+        return max(int(os.getenv('GUNICORN_THREADS', '8')), 1)
+    except ValueError:
+        return 8
+
+
+_PROFILES = {
+    'development': EngineOptions(
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=10.0,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+    ),
+    'production': EngineOptions(
+        pool_size=_default_threads(),
+        max_overflow=8,
+        pool_timeout=10.0,
+        pool_recycle=280,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        connect_timeout=5,
+        statement_timeout_ms=30000,
+        idle_in_transaction_timeout_ms=60000,
+    ),
+    'testing': EngineOptions(
+        pool_size=5,
+        max_overflow=5,
+        pool_timeout=5.0,
+    ),
+}
+
+
+def default_profile(database_uri):
+    """DB_PROFILE del entorno; si no está, production para Postgres y development para el resto"""
+    profile = os.getenv('DB_PROFILE')
+    if profile:
+        return profile
+    return 'production' if database_uri.startswith('postgresql') else 'development'
+
+
+# Reemplaza las opciones -c del perfil en las conexiones de mantenimiento
+MAINTENANCE_SERVER_OPTIONS = '-c statement_timeout=0 -c idle_in_transaction_session_timeout=0'
+
+
+def disable_session_timeouts(engine):
+    """
+    Conexiones sin timeouts de sesión para comandos de mantenimiento (solo Postgres).
+
+    Las conexiones nuevas del engine arrancan con ambos timeouts en 0 (también
+    por encima de un ALTER ROLE ... SET) y se descartan las que el pool ya
+    tenía abiertas. No llamar desde el proceso web: afecta a todo el engine.
+    """
+    if engine.dialect.name != 'postgresql':
+        return
+    if not event.contains(engine, 'do_connect', _maintenance_connect):
+        event.listen(engine, 'do_connect', _maintenance_connect)
+        engine.dispose()
+
+
+def _maintenance_connect(dialect, conn_rec, cargs, cparams):
+    cparams['options'] = MAINTENANCE_SERVER_OPTIONS
+
+
+def replica_binds(replica_uri, options):
+    """SQLALCHEMY_BINDS con la réplica (mismas opciones de pool que el primario), o {} sin réplica"""
+    if not replica_uri:
+        return {}
+    from app.db_routing import REPLICA_BIND_KEY
+
+    engine_options = options.engine_options(replica_uri)
+    if 'connect_args' in engine_options:
+        connect_args = dict(engine_options['connect_args'])
+        connect_args['application_name'] = f'{options.application_name}-replica'
+        engine_options['connect_args'] = connect_args
+    return {REPLICA_BIND_KEY: {'url': replica_uri, **engine_options}}
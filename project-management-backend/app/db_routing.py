@@ -0,0 +1,257 @@
+"""
+Enrutamiento de lecturas a la réplica
+
+Con DATABASE_REPLICA_URL configurada, los endpoints GET marcados con
+@read_replica ejecutan sus SELECT en la réplica (bind 'replica'). Todo lo
+demás va al primario: escrituras, SELECT ... FOR UPDATE, SQL textual, jobs y
+cualquier endpoint sin el decorador.
+
+Lectura de lo propio escrito (read-after-write):
+  - Dentro de una petición, la primera escritura fija el resto de la petición
+    al primario.
+  - Entre peticiones, un commit con escrituras marca al usuario como "escribió
+    hace poco" durante REPLICA_STICKY_SECONDS; mientras dure, sus lecturas van
+    al primario aunque el endpoint use @read_replica.
+
+La marca se guarda en el backend de read_cache: con CACHE_BACKEND=redis la ven
+todos los workers; con el backend local solo el worker que atendió la
+escritura (los demás pueden leer de la réplica durante el retraso).
+
+Sin réplica configurada el decorador no cambia nada.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+import sqlalchemy as sa
+from flask import g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND_KEY = 'replica'
+
+_WROTE_KEY = 'replica_router_wrote'
+
+
+def _is_plain_select(clause):
+    if not isinstance(clause, (sa.Select, sa.CompoundSelect)):
+        return False
+    return getattr(clause, '_for_update_arg', None) is None
+
+
+class RoutingSession(Session):
+    """Sesión de Flask-SQLAlchemy que manda los SELECT a la réplica cuando la petición lo permite"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('db_read_replica'):
+            if not self._flushing and _is_plain_select(clause):
+                engine = self._db.engines.get(REPLICA_BIND_KEY)
+                if engine is not None:
+                    return engine
+            elif self._flushing or clause is not None:
+                # Escritura (o SQL que podría serlo): el resto de la petición lee del primario
+                g.db_read_replica = False
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.enabled = False
+        self.sticky_seconds = 10
+        self._lock = threading.Lock()
+        self._counts = {'replica': 0, 'primary_sticky': 0}
+
+    def init_app(self, app):
+        from app import db
+
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.enabled = REPLICA_BIND_KEY in binds
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', self.sticky_seconds)
+        app.extensions['replica_router'] = self
+
+        if self.enabled:
+            event = sa.event
+            event.listen(db.session, 'after_flush', _record_write)
+            event.listen(db.session, 'do_orm_execute', _record_dml)
+            event.listen(db.session, 'after_commit', self._after_commit)
+            event.listen(db.session, 'after_soft_rollback', _discard_write)
+
+    # --- Estado por usuario ---
+
+    @staticmethod
+    def _sticky_key(user_id):
+        return f'replica-sticky|{user_id}'
+
+    def mark_wrote(self, user_id):
+        """Leer del primario las próximas REPLICA_STICKY_SECONDS para este usuario"""
+        from app.cache import read_cache
+
+        try:
+            read_cache.backend.set(self._sticky_key(user_id), time.time(), self.sticky_seconds)
+        except Exception as e:
+            logger.warning(f'No se pudo registrar la escritura reciente de {user_id}: {e}')
+
+    def recently_wrote(self, user_id):
+        from app.cache import read_cache
+
+        try:
+            found, _ = read_cache.backend.get(self._sticky_key(user_id))
+        except Exception as e:
+            # Ante la duda, primario
+            logger.warning(f'No se pudo leer la escritura reciente de {user_id}: {e}')
+            return True
+        return found
+
+    def _after_commit(self, session):
+        # Liberar un savepoint también emite after_commit: la marca espera al commit externo
+        if session.in_nested_transaction():
+            return
+        if not session.info.pop(_WROTE_KEY, False) or not has_request_context():
+            return
+        user_id = _current_user_id()
+        if user_id:
+            self.mark_wrote(user_id)
+
+    # --- Decisión por petición ---
+
+    def replica_allowed(self):
+        """La petición actual puede leer de la réplica (se decide una vez por petición)"""
+        if 'db_replica_allowed' in g:
+            return g.db_replica_allowed
+        allowed = False
+        if self.enabled and request.method in ('GET', 'HEAD'):
+            user_id = _current_user_id()
+            if user_id and self.recently_wrote(user_id):
+                self._count('primary_sticky')
+            else:
+                allowed = True
+                self._count('replica')
+        g.db_replica_allowed = allowed
+        return allowed
+
+    @contextmanager
+    def replica_reads(self):
+        """Los SELECT dentro del bloque van a la réplica si la petición lo permite"""
+        previous = g.get('db_read_replica', False)
+        g.db_read_replica = self.replica_allowed()
+        try:
+            yield
+        finally:
+            g.db_read_replica = previous
+
+    @contextmanager
+    def primary_reads(self):
+        """Forzar el primario dentro del bloque (p. ej. al cargar valores que se cachean)"""
+        if not has_app_context():
+            yield
+            return
+        previous = g.get('db_read_replica', False)
+        g.db_read_replica = False
+        try:
+            yield
+        finally:
+            g.db_read_replica = previous
+
+    def stream(self, chunks):
+        """
+        Iterar una respuesta en streaming leyendo de la réplica.
+
+        El generador corre después de que la vista retorna (fuera de
+        @read_replica); se usa la decisión tomada al inicio de la petición.
+        """
+        previous = g.get('db_read_replica', False)
+        g.db_read_replica = bool(g.get('db_replica_allowed'))
+        try:
+            yield from chunks
+        finally:
+            g.db_read_replica = previous
+
+    def sync_from_primary(self):
+        """
+        Copiar el primario sobre la réplica (solo SQLite).
+
+        En tests y desarrollo la réplica es una segunda base local sin
+        replicación: esto la pone al día, y lo que se escriba después queda
+        "atrasado" hasta la próxima copia.
+        """
+        from app import db
+
+        replica = db.engines.get(REPLICA_BIND_KEY)
+        if replica is None:
+            raise RuntimeError('No hay réplica configurada (DATABASE_REPLICA_URL)')
+        if db.engine.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            raise RuntimeError('sync_from_primary solo copia bases SQLite; en Postgres replica el servidor')
+
+        source = db.engine.raw_connection()
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+            source.close()
+
+    def _count(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            'enabled': self.enabled,
+            'sticky_seconds': self.sticky_seconds,
+            'requests': counts
+        }
+
+
+def _current_user_id():
+    from flask_jwt_extended import get_jwt_identity
+
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # Petición sin JWT verificado (login, registro, endpoints públicos)
+        return None
+
+
+def _record_write(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+def _record_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+def _discard_write(session, previous_transaction):
+    # Un savepoint deshecho no borra las escrituras de la transacción externa
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_WROTE_KEY, None)
+
+
+replica_router = ReplicaRouter()
+
+
+def read_replica(fn):
+    """
+    Decorador para endpoints de solo lectura que toleran el retraso de la réplica.
+
+    Va debajo de @jwt_required() (la marca de escritura reciente es por
+    usuario) y encima de @conditional_get, para que el ETag y el cuerpo se
+    lean de la misma base.
+
+    Uso:
+        @jwt_required()
+        @read_replica
+        @conditional_get(FreshnessService.tasks)
+        def list_tasks(): ...
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with replica_router.replica_reads():
+            return fn(*args, **kwargs)
+    return wrapper
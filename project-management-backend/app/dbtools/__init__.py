@@ -0,0 +1,5 @@
+# Herramientas de mantenimiento del esquema
+
+from app.dbtools.uuid_columns import UuidMigrationError, uuid_columns
+
+__all__ = ['UuidMigrationError', 'uuid_columns']
@@ -0,0 +1,455 @@
+"""
+Conversión en línea de ids VARCHAR(36) a uuid nativo (PostgreSQL)
+
+ALTER COLUMN ... TYPE uuid reescribe cada tabla y sus índices con un lock
+exclusivo durante toda la operación. Este módulo hace la misma conversión
+en fases que se pueden correr con la aplicación atendiendo tráfico:
+
+  1. prepare   Columnas sombra <col>__uuid, trigger que las mantiene al día en
+               cada INSERT/UPDATE y CHECK (NOT VALID) para las NOT NULL.
+  2. backfill  Copia las filas existentes en lotes cortos por PK (un commit por
+               lote, sin locks largos).
+  3. index     Índices sombra con CREATE INDEX CONCURRENTLY (misma definición
+               sobre las columnas sombra) y VALIDATE de los CHECK.
+  4. swap      Una transacción corta, solo de metadatos: borra las columnas
+               viejas, renombra las sombra, recrea PK/UNIQUE con los índices ya
+               construidos y las FK como NOT VALID.
+  5. validate  VALIDATE CONSTRAINT de las FK (sin bloquear escrituras).
+
+Después, `flask db upgrade` registra la revisión: la migración de Alembic
+solo convierte las columnas que sigan en texto (camino offline).
+
+Las columnas a convertir salen de los modelos (tipo GUID). La API no cambia:
+GUID devuelve siempre el texto con guiones, y con psycopg2 los parámetros
+viajan como texto, así que la aplicación funciona en todas las fases.
+
+Cada fase desactiva statement_timeout e idle_in_transaction_session_timeout
+en sus conexiones: el perfil production los fija para el pool web (30 s) y un
+CREATE INDEX CONCURRENTLY cancelado deja un índice INVALID que habría que
+reconstruir. Los locks se acotan con lock_timeout (prepare y swap).
+
+El espacio de las columnas viejas en el heap se recupera a medida que se
+reescriben las filas (o con pg_repack / VACUUM FULL); los índices nuevos
+ocupan menos desde el swap.
+"""
+
+import logging
+import re
+import time
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+SHADOW_SUFFIX = '__uuid'
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+PG_IDENTIFIER_MAX = 63
+
+
+class UuidMigrationError(Exception):
+    pass
+
+
+def uuid_columns(metadata):
+    """{tabla: [columnas]} con las columnas de tipo GUID de los modelos"""
+    from app.models.types import GUID
+
+    plan = {}
+    for table in metadata.sorted_tables:
+        columns = [column.name for column in table.columns if isinstance(column.type, GUID)]
+        if columns:
+            plan[table.name] = columns
+    return plan
+
+
+def _shadow(column):
+    return column + SHADOW_SUFFIX
+
+
+def _identifier(*parts):
+    name = '_'.join(parts)
+    if len(name) <= PG_IDENTIFIER_MAX:
+        return name
+    return name[:PG_IDENTIFIER_MAX]
+
+
+def _not_null_check(table, column):
+    return _identifier(table, column, 'uuid_nn')
+
+
+def _sync_function(table):
+    return _identifier(table, 'uuid_sync')
+
+
+def _require_postgres(engine):
+    if engine.dialect.name != 'postgresql':
+        raise UuidMigrationError(
+            f'Solo aplica a PostgreSQL (motor actual: {engine.dialect.name}); en SQLite los ids siguen siendo texto'
+        )
+
+
+def _disable_timeouts(connection, local=True):
+    """Sin statement_timeout ni idle_in_transaction_session_timeout (SET LOCAL: solo la transacción actual)"""
+    scope = 'LOCAL ' if local else ''
+    connection.execute(text(f'SET {scope}statement_timeout = 0'))
+    connection.execute(text(f'SET {scope}idle_in_transaction_session_timeout = 0'))
+
+
+def _column_info(connection, table):
+    rows = connection.execute(text("""
+        SELECT column_name, data_type, is_nullable
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+    """), {'table': table}).fetchall()
+    return {row.column_name: row for row in rows}
+
+
+def pending_plan(engine, metadata):
+    """Columnas GUID que en la base siguen siendo texto: {tabla: [(columna, nullable)]}"""
+    _require_postgres(engine)
+    pending = {}
+    with engine.connect() as connection:
+        for table, columns in uuid_columns(metadata).items():
+            info = _column_info(connection, table)
+            todo = [
+                (column, info[column].is_nullable == 'YES')
+                for column in columns
+                if column in info and info[column].data_type != 'uuid'
+            ]
+            if todo:
+                pending[table] = todo
+    return pending
+
+
+def _primary_key(connection, table):
+    rows = connection.execute(text("""
+        SELECT a.attname
+        FROM pg_index x
+        JOIN LATERAL unnest(x.indkey) WITH ORDINALITY AS k(attnum, position) ON true
+        JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = k.attnum
+        WHERE x.indrelid = to_regclass(:table) AND x.indisprimary
+        ORDER BY k.position
+    """), {'table': table}).fetchall()
+    return [row.attname for row in rows]
+
+
+def _indexes(connection, table):
+    """Índices de la tabla con su definición y, si respaldan una PK/UNIQUE, la restricción"""
+    return connection.execute(text("""
+        SELECT i.relname AS name, pg_get_indexdef(i.oid) AS definition, x.indisvalid AS valid,
+               c.conname AS constraint_name, c.contype AS constraint_type
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        LEFT JOIN pg_constraint c ON c.conindid = i.oid AND c.contype IN ('p', 'u')
+        WHERE x.indrelid = to_regclass(:table)
+        ORDER BY i.relname
+    """), {'table': table}).fetchall()
+
+
+def _columns_pattern(columns):
+    return re.compile(r'\b(' + '|'.join(re.escape(column) for column in columns) + r')\b(?!' + SHADOW_SUFFIX + ')')
+
+
+def _shadow_indexes(connection, table, columns):
+    """[(índice original, fila, nombre sombra, DDL concurrente)] de los índices que usan columnas del plan"""
+    pattern = _columns_pattern(columns)
+    result = []
+    for index in _indexes(connection, table):
+        if index.name.endswith(SHADOW_SUFFIX):
+            continue
+        head, _, tail = index.definition.partition(' USING ')
+        if not pattern.search(tail):
+            continue
+        shadow_name = _identifier(index.name[:PG_IDENTIFIER_MAX - len(SHADOW_SUFFIX)] + SHADOW_SUFFIX)
+        head = head.replace(' INDEX ', ' INDEX CONCURRENTLY ', 1).replace(
+            f' {index.name} ON ', f' {shadow_name} ON ', 1
+        )
+        result.append((index.name, index, shadow_name, f'{head} USING {pattern.sub(lambda m: _shadow(m.group(1)), tail)}'))
+    return result
+
+
+def _foreign_keys(connection, tables):
+    """FK que salen de o apuntan a las tablas del plan"""
+    return connection.execute(text("""
+        SELECT c.conname AS name, c.conrelid::regclass::text AS table_name,
+               pg_get_constraintdef(c.oid) AS definition, c.convalidated AS validated
+        FROM pg_constraint c
+        WHERE c.contype = 'f'
+          AND (c.conrelid = ANY(CAST(:oids AS regclass[])) OR c.confrelid = ANY(CAST(:oids AS regclass[])))
+        ORDER BY c.conname
+    """), {'oids': list(tables)}).fetchall()
+
+
+def status(engine, metadata):
+    """Estado por columna: tipo actual, sombra creada y filas sin copiar"""
+    pending = pending_plan(engine, metadata)
+    report = {}
+    with engine.connect() as connection:
+        _disable_timeouts(connection)
+        for table, columns in pending.items():
+            info = _column_info(connection, table)
+            entries = []
+            for column, nullable in columns:
+                shadow = _shadow(column)
+                remaining = None
+                if shadow in info:
+                    remaining = connection.execute(text(
+                        f'SELECT count(*) FROM {table} WHERE {column} IS NOT NULL AND {shadow} IS NULL'
+                    )).scalar()
+                entries.append({
+                    'column': column,
+                    'nullable': nullable,
+                    'shadow': shadow in info,
+                    'remaining': remaining
+                })
+            shadow_indexes = _shadow_indexes(connection, table, [column for column, _ in columns])
+            existing = {index.name: index.valid for index in _indexes(connection, table)}
+            report[table] = {
+                'columns': entries,
+                'indexes': {
+                    original: ('valid' if existing.get(shadow) else 'invalid' if shadow in existing else 'missing')
+                    for original, _, shadow, _ in shadow_indexes
+                }
+            }
+    return report
+
+
+def prepare(engine, metadata, lock_timeout='5s'):
+    """Fase 1: columnas sombra, trigger de sincronización y CHECK NOT NULL (NOT VALID)"""
+    pending = pending_plan(engine, metadata)
+    if not pending:
+        return {}
+
+    with engine.connect() as connection:
+        _disable_timeouts(connection)
+        invalid = []
+        for table, columns in pending.items():
+            for column, _ in columns:
+                count = connection.execute(text(
+                    f"SELECT count(*) FROM {table} WHERE {column} IS NOT NULL AND {column} !~ :pattern"
+                ), {'pattern': UUID_PATTERN}).scalar()
+                if count:
+                    invalid.append(f'{table}.{column}: {count} valores')
+        if invalid:
+            raise UuidMigrationError('Valores que no son UUID: ' + '; '.join(invalid))
+
+    for table, columns in pending.items():
+        assignments = '\n'.join(
+            f'  NEW.{_shadow(column)} := NEW.{column}::uuid;' for column, _ in columns
+        )
+        function = _sync_function(table)
+        with engine.begin() as connection:
+            connection.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+            _disable_timeouts(connection)
+            for column, nullable in columns:
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {_shadow(column)} uuid'))
+            connection.execute(text(f"""
+                CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                {assignments}
+                  RETURN NEW;
+                END $$
+            """))
+            connection.execute(text(f'DROP TRIGGER IF EXISTS {function} ON {table}'))
+            connection.execute(text(
+                f'CREATE TRIGGER {function} BEFORE INSERT OR UPDATE ON {table} '
+                f'FOR EACH ROW EXECUTE FUNCTION {function}()'
+            ))
+            for column, nullable in columns:
+                if nullable:
+                    continue
+                check = _not_null_check(table, column)
+                exists = connection.execute(text(
+                    'SELECT 1 FROM pg_constraint WHERE conname = :name AND conrelid = to_regclass(:table)'
+                ), {'name': check, 'table': table}).first()
+                if not exists:
+                    connection.execute(text(
+                        f'ALTER TABLE {table} ADD CONSTRAINT {check} CHECK ({_shadow(column)} IS NOT NULL) NOT VALID'
+                    ))
+        logger.info(f'uuid prepare: {table} ({", ".join(column for column, _ in columns)})')
+    return pending
+
+
+def backfill(engine, metadata, batch_size=5000, pause=0.0, progress=None):
+    """
+    Fase 2: copiar las filas existentes a las columnas sombra.
+
+    Recorre cada tabla por PK en lotes de batch_size, un commit por lote.
+    Las filas nuevas o modificadas ya las copia el trigger.
+
+    Returns:
+        {tabla: filas actualizadas}
+    """
+    pending = pending_plan(engine, metadata)
+    updated = {}
+    for table, columns in pending.items():
+        with engine.connect() as connection:
+            info = _column_info(connection, table)
+            primary_key = _primary_key(connection, table)
+        missing = [column for column, _ in columns if _shadow(column) not in info]
+        if missing:
+            raise UuidMigrationError(f'{table}: falta correr prepare ({", ".join(missing)})')
+        if not primary_key:
+            raise UuidMigrationError(f'{table}: sin PK, no se puede recorrer por lotes')
+
+        key_list = ', '.join(primary_key)
+        set_clause = ', '.join(f'{_shadow(column)} = {column}::uuid' for column, _ in columns)
+        todo = ' OR '.join(f'({column} IS NOT NULL AND {_shadow(column)} IS NULL)' for column, _ in columns)
+        upper = ', '.join(f':u{i}' for i in range(len(primary_key)))
+        lower = ', '.join(f':l{i}' for i in range(len(primary_key)))
+
+        last = None
+        total = 0
+        while True:
+            with engine.begin() as connection:
+                _disable_timeouts(connection)
+                params = {'limit': batch_size}
+                where = ''
+                if last is not None:
+                    where = f'WHERE ({key_list}) > ({lower})'
+                    params.update({f'l{i}': value for i, value in enumerate(last)})
+                rows = connection.execute(text(
+                    f'SELECT {key_list} FROM {table} {where} ORDER BY {key_list} LIMIT :limit'
+                ), params).fetchall()
+                if not rows:
+                    break
+                params.update({f'u{i}': value for i, value in enumerate(rows[-1])})
+                bounds = f'({key_list}) <= ({upper})'
+                if last is not None:
+                    bounds += f' AND ({key_list}) > ({lower})'
+                result = connection.execute(text(
+                    f'UPDATE {table} SET {set_clause} WHERE {bounds} AND ({todo})'
+                ), params)
+                total += result.rowcount
+                last = tuple(rows[-1])
+            if progress:
+                progress(table, total)
+            if pause:
+                time.sleep(pause)
+        updated[table] = total
+        logger.info(f'uuid backfill: {table} {total} filas')
+    return updated
+
+
+def build_indexes(engine, metadata, progress=None):
+    """
+    Fase 3: índices sombra (CREATE INDEX CONCURRENTLY) y VALIDATE de los CHECK NOT NULL.
+
+    Un índice concurrente que falló queda INVALID: se borra y se vuelve a crear.
+    """
+    pending = pending_plan(engine, metadata)
+    created = []
+    with engine.connect() as connection:
+        _disable_timeouts(connection)
+        for table, columns in pending.items():
+            remaining = connection.execute(text(
+                f'SELECT count(*) FROM {table} WHERE '
+                + ' OR '.join(f'({column} IS NOT NULL AND {_shadow(column)} IS NULL)' for column, _ in columns)
+            )).scalar()
+            if remaining:
+                raise UuidMigrationError(f'{table}: {remaining} filas sin copiar, correr backfill')
+
+    autocommit = engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+    try:
+        # Sin transacción no hay SET LOCAL
+        _disable_timeouts(autocommit, local=False)
+        for table, columns in pending.items():
+            existing = {index.name: index.valid for index in _indexes(autocommit, table)}
+            for original, _, shadow, ddl in _shadow_indexes(autocommit, table, [column for column, _ in columns]):
+                if existing.get(shadow):
+                    continue
+                if shadow in existing:
+                    autocommit.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {shadow}'))
+                started = time.perf_counter()
+                autocommit.execute(text(ddl))
+                created.append(shadow)
+                if progress:
+                    progress(table, shadow, time.perf_counter() - started)
+
+            for column, nullable in columns:
+                if not nullable:
+                    # SHARE UPDATE EXCLUSIVE: no bloquea lecturas ni escrituras
+                    autocommit.execute(text(f'ALTER TABLE {table} VALIDATE CONSTRAINT {_not_null_check(table, column)}'))
+    finally:
+        # Los SET de sesión quedarían en la conexión: se descarta en lugar de volver al pool
+        autocommit.invalidate()
+        autocommit.close()
+    return created
+
+
+def swap(engine, metadata, lock_timeout='5s'):
+    """
+    Fase 4: reemplazar las columnas de texto por las sombra en una sola transacción.
+
+    Solo cambia metadatos (DROP/RENAME COLUMN, índices ya construidos, SET NOT
+    NULL apoyado en el CHECK validado, FK NOT VALID): los locks exclusivos
+    duran lo que tarda en obtenerlos. Si no los obtiene en lock_timeout
+    falla sin cambiar nada y se puede reintentar.
+    """
+    pending = pending_plan(engine, metadata)
+    if not pending:
+        return []
+
+    with engine.begin() as connection:
+        connection.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+        _disable_timeouts(connection)
+        tables = list(pending)
+        connection.execute(text(f'LOCK TABLE {", ".join(tables)} IN ACCESS EXCLUSIVE MODE'))
+
+        plan = {}
+        for table, columns in pending.items():
+            names = [column for column, _ in columns]
+            info = _column_info(connection, table)
+            if any(_shadow(column) not in info for column in names):
+                raise UuidMigrationError(f'{table}: falta correr prepare')
+            existing = {index.name: index.valid for index in _indexes(connection, table)}
+            shadow_indexes = _shadow_indexes(connection, table, names)
+            not_ready = [shadow for _, _, shadow, _ in shadow_indexes if not existing.get(shadow)]
+            if not_ready:
+                raise UuidMigrationError(f'{table}: índices sin construir ({", ".join(not_ready)}), correr index')
+            plan[table] = (columns, shadow_indexes)
+
+        foreign_keys = _foreign_keys(connection, tables)
+        for fk in foreign_keys:
+            connection.execute(text(f'ALTER TABLE {fk.table_name} DROP CONSTRAINT {fk.name}'))
+
+        for table, (columns, shadow_indexes) in plan.items():
+            function = _sync_function(table)
+            connection.execute(text(f'DROP TRIGGER IF EXISTS {function} ON {table}'))
+            connection.execute(text(f'DROP FUNCTION IF EXISTS {function}()'))
+            for column, nullable in columns:
+                # Borra también los índices y restricciones de la columna vieja
+                connection.execute(text(f'ALTER TABLE {table} DROP COLUMN {column}'))
+                connection.execute(text(f'ALTER TABLE {table} RENAME COLUMN {_shadow(column)} TO {column}'))
+                if not nullable:
+                    connection.execute(text(f'ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL'))
+                    connection.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT {_not_null_check(table, column)}'))
+            for original, index, shadow, _ in shadow_indexes:
+                if index.constraint_type == 'p':
+                    connection.execute(text(
+                        f'ALTER TABLE {table} ADD CONSTRAINT {index.constraint_name} PRIMARY KEY USING INDEX {shadow}'
+                    ))
+                elif index.constraint_type == 'u':
+                    connection.execute(text(
+                        f'ALTER TABLE {table} ADD CONSTRAINT {index.constraint_name} UNIQUE USING INDEX {shadow}'
+                    ))
+                else:
+                    connection.execute(text(f'ALTER INDEX {shadow} RENAME TO {original}'))
+
+        for fk in foreign_keys:
+            connection.execute(text(f'ALTER TABLE {fk.table_name} ADD CONSTRAINT {fk.name} {fk.definition} NOT VALID'))
+
+    logger.info(f'uuid swap: {", ".join(pending)}')
+    return list(pending)
+
+
+def validate_foreign_keys(engine, metadata):
+    """Fase 5: VALIDATE CONSTRAINT de las FK recreadas como NOT VALID (una transacción por FK)"""
+    _require_postgres(engine)
+    tables = list(uuid_columns(metadata))
+    with engine.connect() as connection:
+        foreign_keys = [fk for fk in _foreign_keys(connection, tables) if not fk.validated]
+    for fk in foreign_keys:
+        with engine.begin() as connection:
+            _disable_timeouts(connection)
+            connection.execute(text(f'ALTER TABLE {fk.table_name} VALIDATE CONSTRAINT {fk.name}'))
+    return [fk.name for fk in foreign_keys]
@@ -0,0 +1,16 @@
+# Jobs en segundo plano
+
+from app.jobs.scheduler import scheduler, JobScheduler
+from app.jobs.sprint_jobs import register_sprint_jobs, schedule_sprint_close
+from app.jobs.task_flow_jobs import register_task_flow_jobs
+from app.jobs.project_jobs import register_project_jobs, schedule_project_deletion
+
+__all__ = [
+    'scheduler',
+    'JobScheduler',
+    'register_sprint_jobs',
+    'schedule_sprint_close',
+    'register_task_flow_jobs',
+    'register_project_jobs',
+    'schedule_project_deletion'
+]
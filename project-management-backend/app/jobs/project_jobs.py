@@ -0,0 +1,47 @@
+"""
+Jobs de proyectos
+Eliminación de proyectos por lotes en segundo plano.
+"""
+
+import logging
+from flask import current_app
+from app import db
+from app.models import ProjectDeletion
+from app.services.project_deletion_service import ProjectDeletionService
+from app.jobs.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+# Pausa entre porciones de trabajo para dejar correr a otros jobs
+DELETION_PAUSE_SECONDS = 1
+
+
+def _deletion_key(job_id):
+    return f'project-delete:{job_id}'
+
+
+def run_project_deletion(job_id):
+    done = ProjectDeletionService.process(
+        job_id,
+        batch_size=current_app.config.get('PROJECT_DELETE_BATCH_SIZE', 1000),
+        time_budget_seconds=current_app.config.get('PROJECT_DELETE_SLICE_SECONDS', 2)
+    )
+    if done:
+        logger.info(f'Eliminación de proyecto {job_id} finalizada')
+    else:
+        schedule_project_deletion(job_id, DELETION_PAUSE_SECONDS)
+
+
+def schedule_project_deletion(job_id, delay=0):
+    scheduler.schedule_in(_deletion_key(job_id), delay, run_project_deletion, job_id)
+
+
+def resume_project_deletions():
+    """Reanudar jobs pendientes o en curso (p. ej. tras reiniciar o cambiar de líder)"""
+    rows = db.session.query(ProjectDeletion.id).filter(ProjectDeletion.status.in_(('pending', 'running'))).all()
+    for (job_id,) in rows:
+        schedule_project_deletion(job_id)
+
+
+def register_project_jobs(job_scheduler):
+    job_scheduler.on_start(resume_project_deletions)
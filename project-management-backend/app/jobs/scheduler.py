@@ -0,0 +1,233 @@
+"""
+Scheduler en proceso
+Ejecuta jobs programados desde un heap de timers en un hilo dedicado.
+Solo el proceso líder (advisory lock en PostgreSQL) ejecuta los jobs.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import text
+from app import db
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class AdvisoryLockLeader:
+    """
+    Elección de líder mediante pg_try_advisory_lock.
+
+    El lock es de sesión: se mantiene mientras viva la conexión dedicada.
+    En dialectos sin advisory locks (SQLite en desarrollo) el proceso
+    siempre es líder.
+    """
+
+    LOCK_KEY = 0x50524F47  # 'PROG'
+
+    def __init__(self):
+        self._conn = None
+
+    def is_leader(self):
+        engine = db.engine
+        if engine.dialect.name != 'postgresql':
+            return True
+
+        if self._conn is not None:
+            try:
+                self._conn.execute(text('SELECT 1'))
+                self._conn.commit()
+                return True
+            except Exception:
+                # Conexión perdida: el lock se liberó con ella
+                self.release()
+
+        conn = engine.connect()
+        try:
+            acquired = conn.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': self.LOCK_KEY}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        self._conn = conn
+        logger.info('Scheduler: este proceso es el líder')
+        return True
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+class JobScheduler:
+    """
+    Ejecutor de jobs basado en un heap de timers.
+
+    Cada job se identifica por una clave; programar de nuevo una clave
+    reemplaza la ejecución anterior. Los jobs corren dentro de un
+    app_context y solo en el proceso líder.
+    """
+
+    def __init__(self, tick_seconds=30, leader_retry_seconds=60):
+        self.tick_seconds = tick_seconds
+        self.leader_retry_seconds = leader_retry_seconds
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self._app = None
+        self._leader = AdvisoryLockLeader()
+        self._startup_hooks = []
+
+    def init_app(self, app):
+        self._app = app
+        self.tick_seconds = app.config.get('SCHEDULER_TICK_SECONDS', self.tick_seconds)
+        self.leader_retry_seconds = app.config.get('SCHEDULER_LEADER_RETRY_SECONDS', self.leader_retry_seconds)
+        app.extensions['scheduler'] = self
+
+    def on_start(self, fn):
+        """Registra una función que se ejecuta (como líder) al arrancar el scheduler"""
+        self._startup_hooks.append(fn)
+        return fn
+
+    def schedule_at(self, key, run_at, fn, *args, interval=None):
+        """
+        Programa `fn(*args)` para ejecutarse en `run_at` (datetime UTC naive o timestamp).
+
+        Si `interval` se indica (segundos), el job se reprograma tras cada ejecución.
+        """
+        if isinstance(run_at, datetime):
+            if run_at.tzinfo is None:
+                # Las fechas del modelo se guardan en UTC sin zona horaria
+                ts = (run_at - _EPOCH).total_seconds()
+            else:
+                ts = run_at.timestamp()
+        else:
+            ts = float(run_at)
+        with self._cond:
+            seq = next(self._seq)
+            self._jobs[key] = (ts, seq, fn, args, interval)
+            heapq.heappush(self._heap, (ts, seq, key))
+            self._cond.notify()
+
+    def schedule_in(self, key, seconds, fn, *args, interval=None):
+        self.schedule_at(key, time.time() + seconds, fn, *args, interval=interval)
+
+    def schedule_every(self, key, seconds, fn, *args, first_in=None):
+        delay = seconds if first_in is None else first_in
+        self.schedule_in(key, delay, fn, *args, interval=seconds)
+
+    def schedule_daily(self, key, offset_seconds, fn, *args):
+        """Programa `fn(*args)` una vez al día, `offset_seconds` después de medianoche UTC"""
+        now = time.time()
+        next_run = now - (now % DAY_SECONDS) + offset_seconds
+        if next_run <= now:
+            next_run += DAY_SECONDS
+        self.schedule_at(key, next_run, fn, *args, interval=DAY_SECONDS)
+
+    def cancel(self, key):
+        with self._cond:
+            self._jobs.pop(key, None)
+
+    def is_scheduled(self, key):
+        with self._cond:
+            return key in self._jobs
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='progest-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._leader.release()
+
+    def _next_due(self):
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait(self.tick_seconds)
+                    continue
+                ts, seq, key = self._heap[0]
+                job = self._jobs.get(key)
+                if job is None or job[1] != seq:
+                    # Entrada obsoleta (cancelada o reprogramada)
+                    heapq.heappop(self._heap)
+                    continue
+                delay = ts - time.time()
+                if delay > 0:
+                    self._cond.wait(min(delay, self.tick_seconds))
+                    continue
+                heapq.heappop(self._heap)
+                del self._jobs[key]
+                return key, job
+        return None, None
+
+    def _run(self):
+        started = False
+        while True:
+            key, job = self._next_due()
+            if key is None:
+                return
+            ts, seq, fn, args, interval = job
+
+            with self._app.app_context():
+                try:
+                    leader = self._leader.is_leader()
+                except Exception as e:
+                    logger.warning(f'Scheduler: no se pudo verificar el liderazgo: {e}')
+                    leader = False
+
+                if not leader:
+                    # Reintentar más tarde: otro proceso tiene el lock
+                    self.schedule_in(key, self.leader_retry_seconds, fn, *args, interval=interval)
+                    db.session.remove()
+                    continue
+
+                if not started:
+                    started = True
+                    self._run_startup_hooks()
+
+                try:
+                    fn(*args)
+                except Exception as e:
+                    logger.error(f'Scheduler: error ejecutando job {key}: {e}')
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+            if interval and not self.is_scheduled(key):
+                self.schedule_in(key, interval, fn, *args, interval=interval)
+
+    def _run_startup_hooks(self):
+        for hook in self._startup_hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f'Scheduler: error en hook de arranque {hook.__name__}: {e}')
+                db.session.rollback()
+
+
+scheduler = JobScheduler()
@@ -0,0 +1,64 @@
+"""
+Jobs de sprints
+Cierre automático de sprints al llegar a su end_date y foto diaria
+para las series de burndown.
+"""
+
+import logging
+from app import db
+from app.models import Sprint
+from app.services.sprint_service import SprintService
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.jobs.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+# Barrido de seguridad: cubre sprints programados en procesos no líderes
+SWEEP_INTERVAL_SECONDS = 60
+
+# Foto diaria de sprints activos, unos minutos después de medianoche UTC
+DAILY_SNAPSHOT_OFFSET_SECONDS = 5 * 60
+
+
+def _close_key(sprint_id):
+    return f'sprint-close:{sprint_id}'
+
+
+def close_sprint_job(sprint_id):
+    sprint = SprintService.close_sprint(sprint_id)
+    db.session.commit()
+    if sprint:
+        logger.info(f'Sprint {sprint_id} cerrado automáticamente')
+
+
+def sweep_expired_sprints():
+    closed = SprintService.close_expired_sprints()
+    db.session.commit()
+    if closed:
+        logger.info(f'Barrido de sprints: {len(closed)} sprint(s) cerrado(s)')
+
+
+def daily_sprint_snapshots():
+    count = SprintMetricsService.snapshot_active_sprints()
+    db.session.commit()
+    logger.info(f'Foto diaria de sprints: {count} sprint(s)')
+
+
+def schedule_sprint_close(sprint_id, end_date, status):
+    """Programar (o cancelar) el cierre de un sprint según su estado actual"""
+    if status == 'active' and end_date:
+        scheduler.schedule_at(_close_key(sprint_id), end_date, close_sprint_job, sprint_id)
+    else:
+        scheduler.cancel(_close_key(sprint_id))
+
+
+def schedule_active_sprints():
+    rows = db.session.query(Sprint.id, Sprint.end_date).filter(Sprint.status == 'active').all()
+    for sprint_id, end_date in rows:
+        schedule_sprint_close(sprint_id, end_date, 'active')
+
+
+def register_sprint_jobs(job_scheduler):
+    job_scheduler.on_start(schedule_active_sprints)
+    job_scheduler.schedule_every('sprint-close-sweep', SWEEP_INTERVAL_SECONDS, sweep_expired_sprints, first_in=5)
+    job_scheduler.schedule_daily('sprint-daily-snapshots', DAILY_SNAPSHOT_OFFSET_SECONDS, daily_sprint_snapshots)
@@ -0,0 +1,26 @@
+"""
+Jobs de métricas de flujo
+Consolidación diaria del flujo acumulado (CFD) de tareas.
+"""
+
+import logging
+from app import db
+from app.services.task_flow_service import TaskFlowService
+
+logger = logging.getLogger(__name__)
+
+# Después de la foto diaria de sprints
+DAILY_ROLLUP_OFFSET_SECONDS = 10 * 60
+
+
+def rollup_task_flow():
+    rows = TaskFlowService.rollup()
+    db.session.commit()
+    if rows:
+        logger.info(f'Rollup de flujo de tareas: {rows} fila(s)')
+
+
+def register_task_flow_jobs(job_scheduler):
+    # Al arrancar se recuperan los días que no se consolidaron mientras no había líder
+    job_scheduler.on_start(rollup_task_flow)
+    job_scheduler.schedule_daily('task-flow-rollup', DAILY_ROLLUP_OFFSET_SECONDS, rollup_task_flow)
@@ -10,6 +10,15 @@ from app.models.notification import Notification
 from app.models.comment import Comment
 from app.models.audit_log import AuditLog
 from app.models.team_message import TeamMessage
+from app.models.sprint_snapshot import SprintSnapshot
+from app.models.task_status_transition import TaskStatusTransition
+from app.models.task_flow_daily import TaskFlowDaily
+from app.models.project_deletion import ProjectDeletion
+from app.models.search_document import SearchDocument
+from app.models.tag import Tag
+from app.models.task_tag import TaskTag
+from app.models.team_message_mention import TeamMessageMention
+from app.models.project_version import ProjectVersion
 
 __all__ = [
     'User',
@@ -21,5 +30,14 @@ __all__ = [
     'Notification',
     'Comment',
     'AuditLog',
-    'TeamMessage'
+    'TeamMessage',
+    'SprintSnapshot',
+    'TaskStatusTransition',
+    'TaskFlowDaily',
+    'ProjectDeletion',
+    'SearchDocument',
+    'Tag',
+    'TaskTag',
+    'TeamMessageMention',
+    'ProjectVersion'
 ]
@@ -1,17 +1,17 @@
 from datetime import datetime
 from app import db
-import uuid
+from app.models.types import GUID, uuid7
 
 
 class Comment(db.Model):
     __tablename__ = 'comments'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=uuid7)
     
     # Foreign Keys
-    task_id = db.Column(db.String(36), db.ForeignKey('tasks.id'), nullable=False, index=True)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    task_id = db.Column(GUID, db.ForeignKey('tasks.id'), nullable=False, index=True)
+    user_id = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Comment content
     content = db.Column(db.Text, nullable=False)
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from app import db
+from app.models.types import GUID
 import uuid
 import secrets
 
@@ -8,11 +9,11 @@ class Invite(db.Model):
     __tablename__ = 'invites'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign Keys
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False, index=True)
-    invited_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id'), nullable=False, index=True)
+    invited_by = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Invite Info
     email = db.Column(db.String(255), nullable=False, index=True)
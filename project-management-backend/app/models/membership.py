@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.models.types import GUID
 import uuid
 
 
@@ -7,11 +8,11 @@ class Membership(db.Model):
     __tablename__ = 'memberships'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign Keys
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False, index=True)
+    user_id = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id'), nullable=False, index=True)
     
     # Role en el proyecto: OWNER, EMPLOYEE
     role = db.Column(db.Enum('OWNER', 'EMPLOYEE', name='membership_role'), nullable=False)
@@ -1,17 +1,17 @@
 from datetime import datetime
 from app import db
-import uuid
+from app.models.types import GUID, uuid7
 
 
 class Notification(db.Model):
     __tablename__ = 'notifications'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=uuid7)
     
     # Foreign Keys
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=True, index=True)
+    user_id = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id'), nullable=True, index=True)
     
     # Notification Info
     # Type: task_assigned, task_comment, task_status_changed, invite_accepted, etc.
@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.models.types import GUID
 import uuid
 
 
@@ -7,7 +8,7 @@ class Project(db.Model):
     __tablename__ = 'projects'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Basic Info
     name = db.Column(db.String(255), nullable=False)
@@ -23,10 +24,10 @@ class Project(db.Model):
     sprint_length_days = db.Column(db.Integer, nullable=False, default=14)
     
     # Owner (1 proyecto por owner - RF-007)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
+    owner_id = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, unique=True, index=True)
     
-    # Status: active, disabled
-    status = db.Column(db.Enum('active', 'disabled', name='project_status'), default='active', nullable=False)
+    # Status: active, disabled, deleting (eliminación en segundo plano en curso)
+    status = db.Column(db.Enum('active', 'disabled', 'deleting', name='project_status'), default='active', nullable=False)
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+import uuid
+
+
+class ProjectDeletion(db.Model):
+    """
+    Job de eliminación de un proyecto por lotes.
+
+    project_id no tiene FK: el job sobrevive al proyecto para poder
+    consultar el resultado.
+    """
+    __tablename__ = 'project_deletions'
+
+    # Primary Key
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    project_id = db.Column(GUID, nullable=False, index=True)
+    project_name = db.Column(db.String(255), nullable=True)
+    requested_by = db.Column(GUID, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+
+    # Status: pending, running, completed, failed
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)
+
+    # Progreso: tabla en curso, filas estimadas al iniciar y filas procesadas por tabla
+    current_step = db.Column(db.String(50), nullable=True)
+    total_rows = db.Column(db.Integer, nullable=False, default=0)
+    processed_rows = db.Column(db.Integer, nullable=False, default=0)
+    details = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ProjectDeletion {self.project_id} ({self.status})>'
+
+    def to_dict(self):
+        total = self.total_rows or 0
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'project_name': self.project_name,
+            'requested_by': self.requested_by,
+            'status': self.status,
+            'current_step': self.current_step,
+            'total_rows': total,
+            'processed_rows': self.processed_rows,
+            'progress': round(min(self.processed_rows / total, 1) * 100, 1) if total else (100.0 if self.status == 'completed' else 0.0),
+            'details': self.details or {},
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,36 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class ProjectVersion(db.Model):
+    """
+    Contadores de versión por proyecto y dominio.
+
+    Cada escritura incrementa el contador de su dominio en la misma transacción
+    (ver ProjectVersionService). Cachés de lectura, ETags y clientes comparan
+    contadores con una lectura por PK en lugar de repetir las consultas.
+    """
+    __tablename__ = 'project_versions'
+
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True)
+    tasks = db.Column(db.BigInteger, default=0, nullable=False)
+    members = db.Column(db.BigInteger, default=0, nullable=False)
+    sprints = db.Column(db.BigInteger, default=0, nullable=False)
+    chat = db.Column(db.BigInteger, default=0, nullable=False)
+    settings = db.Column(db.BigInteger, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ProjectVersion {self.project_id}>'
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'tasks': self.tasks,
+            'members': self.members,
+            'sprints': self.sprints,
+            'chat': self.chat,
+            'settings': self.settings,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
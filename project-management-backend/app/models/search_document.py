@@ -0,0 +1,43 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class SearchDocument(db.Model):
+    """
+    Documento del índice de búsqueda unificada de un proyecto.
+
+    Una fila por tarea, comentario, mensaje del chat o perfil de miembro.
+    El texto indexable vive en title (peso A) y body (peso B); el índice
+    invertido (GIN en PostgreSQL, FTS5 en SQLite) se crea fuera del ORM.
+
+    acl_user_id guarda el asignado de la tarea para documentos de tareas y
+    comentarios: un empleado solo encuentra los de sus propias tareas.
+    """
+    __tablename__ = 'search_documents'
+
+    # Primary Key (entero: rowid del índice FTS5 en SQLite)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Referencias
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    entity_type = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.String(36), nullable=False)
+    task_id = db.Column(GUID, nullable=True, index=True)
+    author_id = db.Column(GUID, nullable=True)
+    acl_user_id = db.Column(GUID, nullable=True)
+
+    # Texto indexado
+    title = db.Column(db.String(255), nullable=True)
+    body = db.Column(db.Text, nullable=True)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'entity_type', 'entity_id', name='uq_search_documents_entity'),
+    )
+
+    def __repr__(self):
+        return f'<SearchDocument {self.entity_type}:{self.entity_id}>'
@@ -1,13 +1,14 @@
 from datetime import datetime
 from app import db
+from app.models.types import GUID
 import uuid
 
 
 class Sprint(db.Model):
     __tablename__ = 'sprints'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False, index=True)
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = db.Column(GUID, db.ForeignKey('projects.id'), nullable=False, index=True)
 
     name = db.Column(db.String(120), nullable=False)
     color = db.Column(db.String(32), nullable=False, default='blue')
@@ -20,6 +21,7 @@ class Sprint(db.Model):
 
     project = db.relationship('Project', back_populates='sprints')
     tasks = db.relationship('Task', back_populates='sprint')
+    snapshots = db.relationship('SprintSnapshot', back_populates='sprint', cascade='all, delete-orphan')
 
     def to_dict(self):
         return {
@@ -0,0 +1,45 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class SprintSnapshot(db.Model):
+    """Foto diaria del avance de un sprint (serie para burndown y velocidad)"""
+    __tablename__ = 'sprint_snapshots'
+
+    # Primary Key (entero: la serie crece un registro por sprint y día)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Foreign Keys
+    sprint_id = db.Column(GUID, db.ForeignKey('sprints.id', ondelete='CASCADE'), nullable=False)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Día (UTC) de la foto
+    day = db.Column(db.Date, nullable=False)
+
+    # Conteos de tareas del sprint al final del día (o al último cambio)
+    total_tasks = db.Column(db.Integer, nullable=False, default=0)
+    completed_tasks = db.Column(db.Integer, nullable=False, default=0)
+    remaining_tasks = db.Column(db.Integer, nullable=False, default=0)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('sprint_id', 'day', name='uq_sprint_snapshots_sprint_day'),
+    )
+
+    # Relationships
+    sprint = db.relationship('Sprint', back_populates='snapshots')
+
+    def __repr__(self):
+        return f'<SprintSnapshot sprint={self.sprint_id} day={self.day}>'
+
+    def to_dict(self):
+        return {
+            'date': self.day.isoformat() if self.day else None,
+            'total': self.total_tasks,
+            'completed': self.completed_tasks,
+            'remaining': self.remaining_tasks
+        }
@@ -0,0 +1,38 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class Tag(db.Model):
+    """
+    Etiqueta normalizada de un proyecto.
+
+    name es la forma normalizada (minúsculas, sin espacios extremos) y es
+    única por proyecto; label conserva cómo se escribió la primera vez.
+    Task.tags (JSON) sigue siendo la fuente que ve el cliente.
+    """
+    __tablename__ = 'tags'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    label = db.Column(db.String(100), nullable=False)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'name', name='uq_tags_project_name'),
+    )
+
+    def __repr__(self):
+        return f'<Tag {self.name} in Project {self.project_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'label': self.label
+        }
@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.models.types import GUID
 import uuid
 
 
@@ -7,11 +8,11 @@ class Task(db.Model):
     __tablename__ = 'tasks'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign Keys
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False, index=True)
-    sprint_id = db.Column(db.String(36), db.ForeignKey('sprints.id'), nullable=True, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id'), nullable=False, index=True)
+    sprint_id = db.Column(GUID, db.ForeignKey('sprints.id'), nullable=True, index=True)
     
     # Basic Info
     title = db.Column(db.String(255), nullable=False)
@@ -32,8 +33,8 @@ class Task(db.Model):
     )
     
     # Assignment
-    assigned_to = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True, index=True)
-    created_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    assigned_to = db.Column(GUID, db.ForeignKey('users.id'), nullable=True, index=True)
+    created_by = db.Column(GUID, db.ForeignKey('users.id'), nullable=False, index=True)
     
     # Dates
     due_date = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,28 @@
+from app import db
+from app.models.types import GUID
+
+
+class TaskFlowDaily(db.Model):
+    """
+    Rollup diario del flujo acumulado (CFD) por proyecto.
+
+    Cada fila guarda cuántas tareas había en un estado al cierre de un día UTC.
+    Solo se escriben los días en que hubo transiciones en el proyecto. Los días
+    sin filas repiten el último valor conocido.
+    """
+    __tablename__ = 'task_flow_daily'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    day = db.Column(db.Date, nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'day', 'status', name='uq_task_flow_daily_project_day_status'),
+    )
+
+    def __repr__(self):
+        return f'<TaskFlowDaily {self.project_id} {self.day} {self.status}={self.task_count}>'
@@ -0,0 +1,53 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class TaskStatusTransition(db.Model):
+    """
+    Registro append-only de cambios de estado de tareas.
+
+    Cada fila es un cambio de estado. from_status es NULL cuando la tarea se
+    crea y to_status es NULL cuando se elimina. Por eso el historial sobrevive
+    al borrado de la tarea y task_id no tiene FK.
+    """
+    __tablename__ = 'task_status_transitions'
+
+    # Primary Key (entero: tabla de alto volumen y solo inserciones)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+
+    # Referencias
+    task_id = db.Column(GUID, nullable=False, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    changed_by = db.Column(GUID, nullable=True)
+
+    # Transición
+    from_status = db.Column(db.String(20), nullable=True)
+    to_status = db.Column(db.String(20), nullable=True)
+
+    # Tiempos calculados al pasar a 'done' (segundos)
+    lead_seconds = db.Column(db.Integer, nullable=True)
+    cycle_seconds = db.Column(db.Integer, nullable=True)
+
+    # Timestamp
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_task_status_transitions_project_created', 'project_id', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f'<TaskStatusTransition {self.task_id} {self.from_status}->{self.to_status}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'project_id': self.project_id,
+            'changed_by': self.changed_by,
+            'from_status': self.from_status,
+            'to_status': self.to_status,
+            'lead_seconds': self.lead_seconds,
+            'cycle_seconds': self.cycle_seconds,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
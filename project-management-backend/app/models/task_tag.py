@@ -0,0 +1,25 @@
+from app import db
+from app.models.types import GUID
+
+
+class TaskTag(db.Model):
+    """
+    Asociación tarea-etiqueta.
+
+    La PK (tag_id, task_id) resuelve "tareas con la etiqueta X" por índice;
+    ix_task_tags_task_id sirve para sincronizar y borrar por tarea, y
+    (project_id, tag_id) para la nube de etiquetas del proyecto.
+    """
+    __tablename__ = 'task_tags'
+
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+    task_id = db.Column(GUID, db.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_task_tags_task_id', 'task_id'),
+        db.Index('ix_task_tags_project_tag', 'project_id', 'tag_id'),
+    )
+
+    def __repr__(self):
+        return f'<TaskTag {self.task_id} #{self.tag_id}>'
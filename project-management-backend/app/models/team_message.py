@@ -1,18 +1,18 @@
 from datetime import datetime
 from app import db
-import uuid
+from app.models.types import GUID, uuid7
 
 class TeamMessage(db.Model):
     __tablename__ = 'team_messages'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=uuid7)
     
     # Foreign Keys
-    project_id = db.Column(db.String(36), db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
-    task_id = db.Column(db.String(36), db.ForeignKey('tasks.id', ondelete='SET NULL'), nullable=True, index=True)
-    mentioned_user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(GUID, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    task_id = db.Column(GUID, db.ForeignKey('tasks.id', ondelete='SET NULL'), nullable=True, index=True)
+    mentioned_user_id = db.Column(GUID, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
     
     # Content
     content = db.Column(db.Text, nullable=False)
@@ -26,6 +26,11 @@ class TeamMessage(db.Model):
     user = db.relationship('User', foreign_keys=[user_id], backref=db.backref('team_messages', cascade='all, delete-orphan', lazy=True))
     task = db.relationship('Task', backref=db.backref('team_messages', lazy=True))
     mentioned_user = db.relationship('User', foreign_keys=[mentioned_user_id])
+
+    __table_args__ = (
+        # Paginación por keyset del historial del chat: (created_at, id) dentro del proyecto
+        db.Index('ix_team_messages_project_created', 'project_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f'<TeamMessage {self.id} in Project {self.project_id}>'
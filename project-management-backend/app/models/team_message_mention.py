@@ -0,0 +1,30 @@
+from datetime import datetime
+from app import db
+from app.models.types import GUID
+
+
+class TeamMessageMention(db.Model):
+    """
+    Destinatario de una mención en el chat del equipo.
+
+    Una fila por usuario mencionado. kind indica cómo se resolvió: 'user'
+    (mención directa), 'all' (@all) o 'department' (@department). Si un usuario
+    entra por más de una vía se guarda la mención directa.
+    La PK (message_id, user_id) sirve para serializar los mensajes de una página
+    y ix_team_message_mentions_user para "mensajes donde me mencionaron".
+    """
+    __tablename__ = 'team_message_mentions'
+
+    message_id = db.Column(GUID, db.ForeignKey('team_messages.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(GUID, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    project_id = db.Column(GUID, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False, default='user')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_team_message_mentions_user', 'user_id', 'created_at'),
+        db.Index('ix_team_message_mentions_project', 'project_id'),
+    )
+
+    def __repr__(self):
+        return f'<TeamMessageMention {self.user_id} in {self.message_id} ({self.kind})>'
@@ -0,0 +1,98 @@
+"""
+Tipos de columna compartidos por los modelos
+"""
+
+import secrets
+import threading
+import time
+import uuid
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql.types import PGUuid
+from sqlalchemy.types import TypeDecorator
+
+# Nunca coincide con un id real: sustituye a los ids malformados en PostgreSQL
+NIL_GUID = '00000000-0000-0000-0000-000000000000'
+
+_uuid7_lock = threading.Lock()
+_uuid7_last_ms = 0
+_uuid7_counter = 0
+
+
+def uuid7():
+    """
+    UUID versión 7 (RFC 9562) como texto, para PK de tablas que solo crecen.
+
+    Los primeros 48 bits son el instante en milisegundos: los ids nuevos
+    quedan al final del índice de la PK (sin page splits en medio del
+    B-tree) y ordenar por id equivale a ordenar por momento de creación.
+    Dentro del mismo milisegundo un contador de 12 bits (rand_a) mantiene el
+    orden en el proceso; los 62 bits finales son aleatorios.
+    """
+    global _uuid7_last_ms, _uuid7_counter
+    with _uuid7_lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _uuid7_last_ms:
+            _uuid7_last_ms = now_ms
+            # Arranque aleatorio en la mitad baja: deja lugar para el mismo milisegundo
+            _uuid7_counter = secrets.randbits(11)
+        else:
+            # Mismo milisegundo o reloj hacia atrás: seguir después del último id
+            _uuid7_counter += 1
+            if _uuid7_counter > 0xFFF:
+                _uuid7_last_ms += 1
+                _uuid7_counter = secrets.randbits(11)
+        timestamp, counter = _uuid7_last_ms, _uuid7_counter
+
+    value = (
+        (timestamp & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+    return str(uuid.UUID(int=value))
+
+
+class _UntypedUuidParam(PGUuid):
+    # Sin ::UUID en los parámetros: el mismo SQL sirve mientras la columna
+    # todavía es VARCHAR(36) (durante la conversión) y cuando ya es uuid
+    render_bind_cast = False
+
+
+class GUID(TypeDecorator):
+    """
+    Identificador UUID: uuid nativo (16 bytes) en PostgreSQL, VARCHAR(36) en SQLite.
+
+    En Python y en la API siempre es el texto con guiones, así que schemas,
+    comparaciones y claves de caché no cambian. Los parámetros viajan como
+    texto sin cast: las consultas funcionan igual antes y después de convertir
+    las columnas (flask uuid ..., ver app/dbtools/uuid_columns.py).
+
+    En PostgreSQL un id malformado (p. ej. de la URL) se envía como NIL_GUID:
+    la consulta no encuentra nada (404), igual que con columnas de texto, en
+    lugar de fallar con "invalid input syntax for type uuid".
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(_UntypedUuidParam(as_uuid=False))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if dialect.name != 'postgresql':
+            return value
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return NIL_GUID
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return str(value)
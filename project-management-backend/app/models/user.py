@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from app.models.types import GUID
 import uuid
 
 
@@ -7,7 +8,7 @@ class User(db.Model):
     __tablename__ = 'users'
     
     # Primary Key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(GUID, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Basic Info
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
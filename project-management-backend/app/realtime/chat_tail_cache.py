@@ -0,0 +1,156 @@
+"""
+Caché en memoria de la cola (mensajes más recientes) del chat de cada proyecto
+
+Guarda, por proyecto, los últimos mensajes ya serializados (con nombre y avatar
+del autor) ordenados por (created_at, id). get_project_messages responde desde
+aquí la página más reciente y los polls con `after`/`before` que caen dentro
+del buffer. Los proyectos se desalojan por LRU.
+
+La caché es por proceso: antes de usarla, el servicio compara la cabeza del
+buffer con el último mensaje en la base (consulta solo de índice), así un
+mensaje escrito por otro worker invalida la copia local.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+
+
+class _ChatTail:
+    __slots__ = ('keys', 'items', 'user_ids', 'has_older')
+
+    def __init__(self, entries, has_older):
+        self.keys = [key for key, _ in entries]
+        self.items = [item for _, item in entries]
+        self.user_ids = {item.get('user_id') for item in self.items} | \
+            {item.get('mentioned_user_id') for item in self.items if item.get('mentioned_user_id')}
+        self.has_older = has_older
+
+    @property
+    def head(self):
+        return self.keys[-1] if self.keys else None
+
+
+class ChatTailCache:
+    def __init__(self, capacity=100, max_projects=256):
+        self.capacity = capacity
+        self.max_projects = max_projects
+        self._lock = threading.Lock()
+        self._tails = OrderedDict()
+        # Generación por proyecto: evita guardar una carga que se cruzó con una escritura
+        self._generations = {}
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.capacity = app.config.get('CHAT_TAIL_CACHE_SIZE', self.capacity)
+        self.max_projects = app.config.get('CHAT_TAIL_CACHE_PROJECTS', self.max_projects)
+        app.extensions['chat_tail_cache'] = self
+
+    def generation(self, project_id):
+        with self._lock:
+            return self._generations.get(project_id, 0)
+
+    def peek_head(self, project_id):
+        """(está en caché, key del mensaje más reciente o None)"""
+        with self._lock:
+            tail = self._tails.get(project_id)
+            return (True, tail.head) if tail else (False, None)
+
+    def store(self, project_id, entries, has_older, generation):
+        """
+        Guardar la cola cargada desde la base.
+
+        entries: lista cronológica de (key, mensaje serializado), key = (created_at, id)
+        Si hubo escrituras desde `generation`, la carga se descarta.
+        """
+        entries = entries[-self.capacity:] if self.capacity else []
+        with self._lock:
+            if self._generations.get(project_id, 0) != generation or not self.capacity:
+                return
+            self._tails[project_id] = _ChatTail(entries, has_older)
+            self._tails.move_to_end(project_id)
+            while len(self._tails) > self.max_projects:
+                self._tails.popitem(last=False)
+
+    def append(self, project_id, key, item):
+        """Agregar un mensaje recién confirmado a la cola del proyecto (si está en caché)"""
+        with self._lock:
+            self._generations[project_id] = self._generations.get(project_id, 0) + 1
+            tail = self._tails.get(project_id)
+            if tail is None:
+                return
+            if tail.keys and key <= tail.keys[0] and len(tail.keys) >= self.capacity:
+                # Más antiguo que todo el buffer lleno: no pertenece a la cola
+                return
+            # Los commits concurrentes pueden llegar fuera de orden
+            position = bisect.bisect_right(tail.keys, key)
+            tail.keys.insert(position, key)
+            tail.items.insert(position, item)
+            tail.user_ids.add(item.get('user_id'))
+            if item.get('mentioned_user_id'):
+                tail.user_ids.add(item['mentioned_user_id'])
+            if len(tail.keys) > self.capacity:
+                del tail.keys[0]
+                del tail.items[0]
+                tail.has_older = True
+
+    def page(self, project_id, limit, before=None, after=None):
+        """
+        Responder una página desde la caché.
+
+        Returns:
+            (entries, has_more) con entries = [(key, item)] cronológica,
+            o None si la página no cae completa dentro del buffer
+        """
+        with self._lock:
+            tail = self._tails.get(project_id)
+            if tail is None:
+                self.misses += 1
+                return None
+
+            keys = tail.keys
+            if after is not None:
+                if keys and after < keys[0] and tail.has_older:
+                    # El cursor es anterior al buffer: faltan mensajes intermedios
+                    self.misses += 1
+                    return None
+                start = bisect.bisect_right(keys, after)
+                end = min(start + limit, len(keys))
+                has_more = end < len(keys)
+            else:
+                end = bisect.bisect_left(keys, before) if before is not None else len(keys)
+                start = max(end - limit, 0)
+                if start == 0 and tail.has_older and end - start < limit:
+                    self.misses += 1
+                    return None
+                has_more = start > 0 or tail.has_older
+
+            self._tails.move_to_end(project_id)
+            self.hits += 1
+            return [(keys[i], dict(tail.items[i])) for i in range(start, end)], has_more
+
+    def invalidate(self, project_id):
+        with self._lock:
+            self._tails.pop(project_id, None)
+            self._generations[project_id] = self._generations.get(project_id, 0) + 1
+
+    def invalidate_user(self, user_id):
+        """Descartar las colas donde aparece el usuario (cambió su nombre o avatar)"""
+        with self._lock:
+            for project_id in [pid for pid, tail in self._tails.items() if user_id in tail.user_ids]:
+                del self._tails[project_id]
+                self._generations[project_id] = self._generations.get(project_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            for project_id in self._tails:
+                self._generations[project_id] = self._generations.get(project_id, 0) + 1
+            self._tails.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'projects': len(self._tails), 'hits': self.hits, 'misses': self.misses}
+
+
+chat_tail_cache = ChatTailCache()
@@ -33,5 +33,29 @@ class NotificationsHub:
             except Exception:
                 pass
 
+    def publish_many(self, user_ids, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._lock:
+            qs = [q for user_id in set(user_ids) for q in (self._subscribers.get(user_id) or [])]
+        for q in qs:
+            try:
+                q.put_nowait(data)
+            except Exception:
+                pass
+
+    def publish_batch(self, items) -> None:
+        """Publicar un payload distinto por usuario, [(user_id, payload)], tomando el lock una sola vez"""
+        messages = [(user_id, json.dumps(payload, ensure_ascii=False)) for user_id, payload in items]
+        with self._lock:
+            targets = [
+                (q, data) for user_id, data in messages
+                for q in (self._subscribers.get(user_id) or [])
+            ]
+        for q, data in targets:
+            try:
+                q.put_nowait(data)
+            except Exception:
+                pass
+
 
 notifications_hub = NotificationsHub()
@@ -10,5 +10,8 @@ from .notifications import notifications_bp
 from .comments import comments_bp
 from .admin import admin_bp
 from .team_chat import team_chat_bp
+from .search import search_bp
+from .batch import batch_bp
+from .dashboard import dashboard_bp
 
-__all__ = ['auth_bp', 'projects_bp', 'invites_bp', 'members_bp', 'tasks_bp', 'sprints_bp', 'notifications_bp', 'comments_bp', 'admin_bp', 'team_chat_bp']
+__all__ = ['auth_bp', 'projects_bp', 'invites_bp', 'members_bp', 'tasks_bp', 'sprints_bp', 'notifications_bp', 'comments_bp', 'admin_bp', 'team_chat_bp', 'search_bp', 'batch_bp', 'dashboard_bp']
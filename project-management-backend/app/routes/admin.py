@@ -3,9 +3,20 @@ Admin Routes
 Endpoints para el panel de administración (solo SUPERADMIN)
 """
 
-from flask import Blueprint, jsonify, request
+from dataclasses import asdict
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
+from app import db
+from app.models import Project, ProjectDeletion
 from app.services.admin_service import AdminService
+from app.services.project_deletion_service import ProjectDeletionService, ProjectDeletingError
+from app.utils import get_current_user_id, read_replica
+from app.utils.transaction import after_commit
+from app.jobs import schedule_project_deletion
+from app.cache import read_cache
+from app.realtime.chat_tail_cache import chat_tail_cache
+from app.utils.pool_metrics import pool_metrics
+from app.db_routing import replica_router, REPLICA_BIND_KEY
 from app.schemas import UserSchema, ProjectSchema, AuditLogSchema
 from app.utils.decorators import require_roles
 from marshmallow import ValidationError
@@ -23,6 +34,7 @@ audit_logs_schema = AuditLogSchema(many=True)
 
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
+@read_replica
 @require_roles('SUPERADMIN')
 def get_all_users():
     """
@@ -77,6 +89,7 @@ def get_all_users():
 
 @admin_bp.route('/projects', methods=['GET'])
 @jwt_required()
+@read_replica
 @require_roles('SUPERADMIN')
 def get_all_projects():
     """
@@ -131,6 +144,7 @@ def get_all_projects():
 
 @admin_bp.route('/audit-logs', methods=['GET'])
 @jwt_required()
+@read_replica
 @require_roles('SUPERADMIN')
 def get_audit_logs():
     """
@@ -268,6 +282,7 @@ def update_project_status(project_id):
         200: Proyecto actualizado
         400: Datos inválidos
         404: Proyecto no encontrado
+        409: El proyecto se está eliminando
     """
     try:
         data = request.get_json()
@@ -299,6 +314,15 @@ def update_project_status(project_id):
             'data': project_schema.dump(project),
             'message': f'Proyecto {"activado" if status == "active" else "desactivado"} exitosamente'
         }), 200
+
+    except ProjectDeletingError as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'PROJECT_DELETING',
+                'message': str(e)
+            }
+        }), 409
         
     except Exception as e:
         return jsonify({
@@ -310,8 +334,98 @@ def update_project_status(project_id):
         }), 500
 
 
+@admin_bp.route('/projects/<project_id>', methods=['DELETE'])
+@jwt_required()
+@require_roles('SUPERADMIN')
+def delete_project(project_id):
+    """
+    Eliminar un proyecto en segundo plano (solo SUPERADMIN)
+
+    El proyecto pasa a estado 'deleting' y sus datos se borran por lotes
+    desde un job. Si ya hay una eliminación en curso se devuelve ese job;
+    si falló, se reanuda.
+
+    Returns:
+        202: Eliminación aceptada (incluye el job para consultar el progreso)
+        404: Proyecto no encontrado
+    """
+    try:
+        project = Project.query.get(project_id)
+        if not project:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NOT_FOUND',
+                    'message': 'Proyecto no encontrado'
+                }
+            }), 404
+
+        job, created = ProjectDeletionService.request_deletion(
+            project,
+            get_current_user_id(),
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent')
+        )
+        after_commit(schedule_project_deletion, job.id)
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': {'deletion': job.to_dict()},
+            'message': 'Eliminación iniciada' if created else 'Eliminación en curso'
+        }), 202
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
+@admin_bp.route('/project-deletions/<deletion_id>', methods=['GET'])
+@jwt_required()
+@require_roles('SUPERADMIN')
+def get_project_deletion(deletion_id):
+    """
+    Consultar el progreso de una eliminación de proyecto (solo SUPERADMIN)
+
+    Returns:
+        200: Estado del job (status, current_step, progress, details)
+        404: Job no encontrado
+    """
+    try:
+        job = ProjectDeletion.query.get(deletion_id)
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NOT_FOUND',
+                    'message': 'Eliminación no encontrada'
+                }
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': {'deletion': job.to_dict()}
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
 @admin_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@read_replica
 @require_roles('SUPERADMIN')
 def get_global_stats():
     """
@@ -366,3 +480,72 @@ def health_check():
                 'message': str(e)
             }
         }), 500
+
+
+@admin_bp.route('/cache', methods=['GET'])
+@jwt_required()
+@require_roles('SUPERADMIN')
+def get_cache_stats():
+    """
+    Métricas de las cachés de lectura de este proceso (solo SUPERADMIN)
+    
+    Returns:
+        200: Aciertos, fallos e invalidaciones por caché
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'read_cache': read_cache.stats(),
+                'chat_tail_cache': chat_tail_cache.stats()
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
+@admin_bp.route('/db-pool', methods=['GET'])
+@jwt_required()
+@require_roles('SUPERADMIN')
+def get_db_pool_stats():
+    """
+    Estado y métricas del pool de conexiones de este proceso (solo SUPERADMIN)
+    
+    Returns:
+        200: Conexiones en uso, overflow, esperas de checkout, configuración del perfil
+             y enrutamiento a la réplica
+    """
+    try:
+        options = current_app.config.get('DB_ENGINE_OPTIONS')
+        replica = replica_router.stats()
+        replica_engine = db.engines.get(REPLICA_BIND_KEY)
+        if replica_engine is not None:
+            replica['pool'] = {
+                'size': replica_engine.pool.size(),
+                'checked_out': replica_engine.pool.checkedout()
+            } if hasattr(replica_engine.pool, 'checkedout') else None
+        return jsonify({
+            'success': True,
+            'data': {
+                'profile': current_app.config.get('DB_PROFILE'),
+                'options': asdict(options) if options else None,
+                'pool': pool_metrics.snapshot(db.engine.pool),
+                'replica': replica
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': str(e)
+            }
+        }), 500
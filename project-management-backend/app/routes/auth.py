@@ -11,8 +11,11 @@ from sqlalchemy.exc import SQLAlchemyError
 from app import db
 from app.models import User, Project, Membership, Invite, Notification, AuditLog
 from app.realtime.notifications_hub import notifications_hub
-from app.services import AuthService
-from app.utils import get_current_user_id
+from app.realtime.chat_tail_cache import chat_tail_cache
+from app.search import SearchIndex
+from app.services import AuthService, ProjectVersionService
+from app.utils import get_current_user_id, get_active_membership
+from app.utils.transaction import after_commit
 from app.schemas import (
     UserRegisterSchema,
     UserLoginSchema,
@@ -550,6 +553,8 @@ def accept_invite():
             status='active'
         )
         db.session.add(membership)
+        SearchIndex.index_member(invite.project_id, new_user)
+        ProjectVersionService.bump(invite.project_id, 'members')
         
         # Actualizar invitación
         invite.status = 'accepted'
@@ -635,7 +640,7 @@ def get_me():
         user_id = get_current_user_id()
         claims = get_jwt()
         if claims.get('role') == 'EMPLOYEE':
-            membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+            membership = get_active_membership(user_id)
             if not membership:
                 return jsonify({
                     'success': False,
@@ -734,6 +739,13 @@ def update_me():
         for key, value in validated_data.items():
             if hasattr(user, key):
                 setattr(user, key, value)
+        SearchIndex.index_user(user)
+        # El perfil aparece en la lista de miembros de sus proyectos
+        if user.owned_project:
+            ProjectVersionService.bump(user.owned_project.id, 'members')
+        for (project_id,) in db.session.query(Membership.project_id).filter_by(user_id=user.id, status='active').all():
+            ProjectVersionService.bump(project_id, 'members')
+        after_commit(chat_tail_cache.invalidate_user, user.id)
         
         db.session.commit()
         
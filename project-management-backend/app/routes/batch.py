@@ -0,0 +1,192 @@
+"""
+Batch Routes
+Varias lecturas GET en una sola petición HTTP (carga inicial del dashboard)
+"""
+
+import json
+from flask import Blueprint, request, jsonify, current_app, g, Response, stream_with_context
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import MethodNotAllowed
+from werkzeug.test import EnvironBuilder
+from app import db
+from app.models import User
+from app.utils import get_current_user_id, get_active_membership
+from app.utils.compression import flush_each_chunk
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api/batch')
+
+BATCH_MAX_REQUESTS = 20
+
+# Endpoints que responden en streaming o no tienen sentido dentro de un batch
+BATCH_EXCLUDED_ENDPOINTS = (
+    'batch.run_batch',
+    'notifications.stream_notifications',
+    'projects.export_project',
+)
+
+_NOT_BATCHABLE = json.dumps({
+    'success': False,
+    'error': {'code': 'NOT_BATCHABLE', 'message': 'Este endpoint no se puede usar en un batch'}
+}).encode('utf-8')
+
+# Headers de la petición original que se reenvían a cada subpetición
+FORWARDED_HEADERS = ('Authorization', 'Accept-Language', 'User-Agent')
+
+
+def _validation_error(message, details=None):
+    error = {'code': 'VALIDATION_ERROR', 'message': message}
+    if details:
+        error['details'] = details
+    return jsonify({'success': False, 'error': error}), 400
+
+
+def _parse_requests(payload):
+    """
+    Validar la lista de subpeticiones.
+
+    Returns:
+        (lista de (id, path, if_none_match), errores por posición)
+    """
+    items = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, {'requests': ['Debe ser una lista no vacía']}
+    if len(items) > BATCH_MAX_REQUESTS:
+        return None, {'requests': [f'Máximo {BATCH_MAX_REQUESTS} subpeticiones']}
+
+    parsed = []
+    errors = {}
+    seen = set()
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors[str(position)] = ['Debe ser un objeto']
+            continue
+        item_id = str(item.get('id') if item.get('id') is not None else position)
+        method = str(item.get('method') or 'GET').upper()
+        path = item.get('path')
+        if item_id in seen:
+            errors[str(position)] = [f'id duplicado: {item_id}']
+        elif method != 'GET':
+            errors[str(position)] = ['Solo se permiten lecturas (GET)']
+        elif not isinstance(path, str) or not path.startswith('/api/'):
+            errors[str(position)] = ['path debe empezar con /api/']
+        seen.add(item_id)
+        headers = item.get('headers') if isinstance(item.get('headers'), dict) else {}
+        parsed.append((item_id, path, headers.get('If-None-Match')))
+    return parsed, errors
+
+
+def _sub_environ(path, if_none_match):
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    if if_none_match:
+        headers['If-None-Match'] = if_none_match
+    builder = EnvironBuilder(path=path, method='GET', base_url=request.host_url, headers=headers)
+    try:
+        environ = builder.get_environ()
+    finally:
+        builder.close()
+    environ['REMOTE_ADDR'] = request.remote_addr
+    return environ
+
+
+def _dispatch(path, if_none_match):
+    """
+    Ejecutar una subpetición GET dentro del contexto de la app actual.
+
+    El contexto de request es nuevo (ruta, query string, headers) pero el de la
+    app se comparte: misma sesión de base de datos y mismo `g`, así que la
+    identidad y la membresía ya resueltas se reutilizan.
+
+    Si la subpetición falla (excepción o status >= 500) se hace rollback antes
+    de la siguiente: en PostgreSQL una sentencia fallida (p. ej. cancelada por
+    statement_timeout) deja la transacción abortada y todas las demás
+    fallarían. Los objetos ya cargados en `g` se recargan solos al expirar.
+
+    Returns:
+        (status, headers relevantes, cuerpo JSON en bytes)
+    """
+    app = current_app._get_current_object()
+    with app.request_context(_sub_environ(path, if_none_match)):
+        if request.routing_exception is not None:
+            # Ruta inexistente o sin GET: se responde sin despachar
+            if isinstance(request.routing_exception, MethodNotAllowed):
+                error = {'code': 'METHOD_NOT_ALLOWED', 'message': f'La ruta no acepta GET: {path}'}
+            else:
+                error = {'code': 'NOT_FOUND', 'message': f'Ruta no disponible para GET: {path}'}
+            status = getattr(request.routing_exception, 'code', None) or 404
+            return status, {}, json.dumps({'success': False, 'error': error}).encode('utf-8')
+        if request.url_rule.endpoint in BATCH_EXCLUDED_ENDPOINTS:
+            return 400, {}, _NOT_BATCHABLE
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            app.logger.error(f'Error en subpetición de batch {path}: {e}')
+            db.session.rollback()
+            body = {'success': False, 'error': {'code': 'SERVER_ERROR', 'message': str(e)}}
+            return 500, {}, json.dumps(body).encode('utf-8')
+
+        if response.status_code >= 500:
+            # El handler capturó el error y respondió 500 sin rollback
+            db.session.rollback()
+
+        headers = {name: response.headers[name] for name in ('ETag', 'Cache-Control') if name in response.headers}
+        if response.is_streamed:
+            response.close()
+            return 400, {}, _NOT_BATCHABLE
+        if response.status_code == 304:
+            return 304, headers, b'null'
+        if response.is_json:
+            return response.status_code, headers, response.get_data().strip()
+        return response.status_code, headers, json.dumps(response.get_data(as_text=True)).encode('utf-8')
+
+
+def _encode_item(item_id, status, headers, body):
+    """Una subrespuesta como JSON, insertando el cuerpo ya serializado sin volver a parsearlo"""
+    return b''.join((
+        b'{"body":', body,
+        b',"headers":', json.dumps(headers, sort_keys=True).encode('utf-8'),
+        b',"id":', json.dumps(item_id).encode('utf-8'),
+        b',"status":', str(status).encode('ascii'),
+        b'}'
+    ))
+
+
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def run_batch():
+    """
+    Ejecutar varias lecturas GET en una sola petición
+
+    Body:
+        requests: [{id, path, method='GET', headers: {If-None-Match}}] (máximo 20)
+        stream: true para recibir NDJSON, una línea por subrespuesta apenas está lista
+
+    Cada subpetición responde con su propio status; un error en una no afecta a
+    las demás. El JWT se verifica una vez para el batch y la membresía activa se
+    resuelve una vez y se comparte.
+
+    Returns:
+        200: {success, data: {responses: [{id, status, headers, body}]}}
+    """
+    payload = request.get_json(silent=True)
+    items, errors = _parse_requests(payload)
+    if items is None or errors:
+        return _validation_error('Subpeticiones inválidas', errors)
+
+    # Resolver identidad y membresía una vez. El identity map de la sesión guarda
+    # referencias débiles: g mantiene vivo al usuario mientras dure el batch
+    user_id = get_current_user_id()
+    g.batch_user = User.query.get(user_id)
+    get_active_membership(user_id)
+
+    if payload.get('stream'):
+        def generate():
+            for item_id, path, if_none_match in items:
+                yield _encode_item(item_id, *_dispatch(path, if_none_match)) + b'\n'
+
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                            headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-store'})
+        return flush_each_chunk(response)
+
+    encoded = [_encode_item(item_id, *_dispatch(path, if_none_match)) for item_id, path, if_none_match in items]
+    body = b'{"data":{"responses":[' + b','.join(encoded) + b']},"success":true}\n'
+    return Response(body, mimetype='application/json', headers={'Cache-Control': 'no-store'})
@@ -4,7 +4,7 @@ from marshmallow import ValidationError
 from app import db
 from app.models import User
 from app.services.comment_service import CommentService
-from app.utils import get_current_user_id
+from app.utils import get_current_user_id, read_replica, reject_writes_on_deleting_project
 from app.schemas.comment_schema import (
     CommentCreateSchema,
     CommentUpdateSchema,
@@ -13,6 +13,8 @@ from app.schemas.comment_schema import (
 )
 
 comments_bp = Blueprint('comments', __name__, url_prefix='/api/tasks')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+comments_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schemas
 comment_create_schema = CommentCreateSchema()
@@ -23,6 +25,7 @@ comment_with_user_schema = CommentWithUserSchema()
 
 @comments_bp.route('/<task_id>/comments', methods=['GET'])
 @jwt_required()
+@read_replica
 def list_comments(task_id):
     """
     Listar comentarios de una tarea
@@ -0,0 +1,51 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from app.services.dashboard_service import DashboardService
+from app.utils import get_current_user_id, read_replica
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+
+@dashboard_bp.route('', methods=['GET'])
+@jwt_required()
+@read_replica
+def get_dashboard():
+    """
+    Dashboard del usuario en una sola respuesta (Owner y Employee)
+
+    Incluye resumen del proyecto, estadísticas de mis tareas, tareas vencidas,
+    progreso del sprint activo, notificaciones no leídas y actividad reciente.
+    El Employee solo ve vencidas y actividad de sus tareas asignadas.
+    """
+    try:
+        user_id = get_current_user_id()
+        user_role = get_jwt().get('role')
+
+        if user_role not in ('OWNER', 'EMPLOYEE'):
+            return jsonify({
+                'success': False,
+                'error': {'code': 'FORBIDDEN', 'message': 'Rol no autorizado'}
+            }), 403
+
+        project_id = DashboardService.resolve_project(user_id, user_role)
+        if not project_id:
+            if user_role == 'EMPLOYEE':
+                return jsonify({
+                    'success': False,
+                    'error': {'code': 'MEMBERSHIP_INACTIVE', 'message': 'Tu acceso al proyecto fue desactivado por el Owner.'}
+                }), 403
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': DashboardService.get_dashboard(user_id, user_role, project_id)
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': str(e)}
+        }), 500
@@ -5,10 +5,12 @@ from datetime import datetime
 from app import db
 from app.models import Invite, User, Project, Notification, AuditLog
 from app.services import InviteService
-from app.utils import get_current_user_id
+from app.utils import get_current_user_id, reject_writes_on_deleting_project
 from app.schemas import InviteCreateSchema, InviteSchema
 
 invites_bp = Blueprint('invites', __name__, url_prefix='/api/invites')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+invites_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schemas
 invite_create_schema = InviteCreateSchema()
@@ -4,10 +4,19 @@ from datetime import datetime
 from app import db
 from app.models import Membership, User, Project, AuditLog, Notification
 from app.realtime.notifications_hub import notifications_hub
-from app.utils import get_current_user_id
+from app.realtime.chat_tail_cache import chat_tail_cache
+from app.search import SearchIndex
+from app.services.freshness_service import FreshnessService
+from app.services.project_version_service import ProjectVersionService
+from app.services.member_service import MemberService, MEMBER_FIELDS
+from app.utils import get_current_user_id, get_active_membership, conditional_get, reject_writes_on_deleting_project
+from app.utils.transaction import after_commit
 from app.schemas import MemberWithUserSchema
+from app.serialization import parse_fields, project_dicts
 
 members_bp = Blueprint('members', __name__, url_prefix='/api/members')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+members_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schema
 member_with_user_schema = MemberWithUserSchema(many=True)
@@ -15,10 +24,13 @@ member_with_user_schema = MemberWithUserSchema(many=True)
 
 @members_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(FreshnessService.members)
 def list_members():
     """
     Listar miembros del proyecto (Owner)
     RF-021: Gestión de equipo
+
+    Campos: ?fields=id,name,avatar,role (por defecto todos)
     """
     try:
         user_id = get_current_user_id()
@@ -51,10 +63,7 @@ def list_members():
             project = user.owned_project
         else:
             # Si es empleado, buscar su membresía activa
-            membership = Membership.query.filter_by(
-                user_id=user_id,
-                status='active'
-            ).first()
+            membership = get_active_membership(user_id)
             if not membership:
                 return jsonify({
                     'success': False,
@@ -66,67 +75,27 @@ def list_members():
             project_id = membership.project_id
             project = Project.query.get(project_id)
             
-        # Obtener membresías del proyecto
-        memberships = Membership.query.filter_by(project_id=project_id).all()
-              # Preparar lista de miembros
-        members_data = []
-        
-        # Agregar Owner verdadero del proyecto al resultado
-        if project:
-            true_owner = User.query.get(project.owner_id)
-            if true_owner:
-                owner_data = {
-                    'id': true_owner.id,
-                    'email': true_owner.email,
-                    'name': true_owner.name,
-                    'role': 'OWNER',
-                    'status': true_owner.status,
-                    'avatar': true_owner.avatar,
-                    'job_title': true_owner.job_title,
-                    'description': true_owner.description,
-                    'responsibilities': true_owner.responsibilities,
-                    'skills': true_owner.skills,
-                    'shift': true_owner.shift,
-                    'department': true_owner.department,
-                    'phone': true_owner.phone,
-                    'created_at': true_owner.created_at.isoformat() if true_owner.created_at else None,
-                    'joined_at': None,
-                    'is_owner': True,
-                    'membership_id': None,
-                    'chat_enabled': True
-                }
-                members_data.append(owner_data)
-        
-        # Agregar Employees
-        for membership in memberships:
-            member_user = User.query.get(membership.user_id)
-            # Asegurarse de no duplicar al owner si ya fue agregado
-            if member_user and member_user.id != project.owner_id:
-                member_data = {
-                    'id': member_user.id,
-                    'email': member_user.email,
-                    'name': member_user.name,
-                    'role': membership.role,
-                    'status': membership.status,
-                    'avatar': member_user.avatar,
-                    'job_title': member_user.job_title,
-                    'description': member_user.description,
-                    'responsibilities': member_user.responsibilities,
-                    'skills': member_user.skills,
-                    'shift': member_user.shift,
-                    'department': member_user.department,
-                    'phone': member_user.phone,
-                    'created_at': member_user.created_at.isoformat() if member_user.created_at else None,
-                    'joined_at': membership.joined_at.isoformat() if membership.joined_at else None,
-                    'is_owner': False,
-                    'membership_id': membership.id,
-                    'chat_enabled': getattr(membership, 'chat_enabled', True)
+        # Sparse fieldsets: ?fields=id,name,avatar
+        try:
+            fields = parse_fields(request.args.get('fields'), MEMBER_FIELDS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'Campos inválidos: {", ".join(e.args[0])}',
+                    'details': {'fields': [f'Valores permitidos: {", ".join(MEMBER_FIELDS)}']}
                 }
-                members_data.append(member_data)
+            }), 400
+        keys = fields or MEMBER_FIELDS
+
+        # Solo se consultan las columnas pedidas (status siempre, para los contadores)
+        members_data = MemberService.list_members(project_id, project.owner_id if project else None, keys)
         
         # Contar por status
         active_count = sum(1 for m in members_data if m['status'] == 'active')
         inactive_count = sum(1 for m in members_data if m['status'] == 'inactive')
+        members_data = project_dicts(members_data, fields)
         
         return jsonify({
             'success': True,
@@ -230,6 +199,9 @@ def deactivate_member(membership_id):
         # Desactivar membresía
         membership.status = 'disabled'
         membership.updated_at = datetime.utcnow()
+        SearchIndex.remove('member', membership.user_id, project_id)
+        ProjectVersionService.bump(project_id, 'members')
+        after_commit(chat_tail_cache.invalidate, project_id)
         
         notification = Notification(
             user_id=membership.user_id,
@@ -351,6 +323,10 @@ def activate_member(membership_id):
         
         membership.status = 'active'
         membership.updated_at = datetime.utcnow()
+        if member_user:
+            SearchIndex.index_member(project_id, member_user)
+        ProjectVersionService.bump(project_id, 'members')
+        after_commit(chat_tail_cache.invalidate, project_id)
         
         notification = Notification(
             user_id=membership.user_id,
@@ -503,6 +479,12 @@ def update_member_profile(user_id):
             membership.chat_enabled = validated_data['chat_enabled']
         
         target_user.updated_at = datetime.utcnow()
+        SearchIndex.index_user(target_user)
+        ProjectVersionService.bump(project_id, 'members')
+        # Nombre/avatar desnormalizados en la caché del chat y permiso de chat
+        after_commit(chat_tail_cache.invalidate_user, target_user.id)
+        if 'chat_enabled' in validated_data:
+            after_commit(chat_tail_cache.invalidate, project_id)
         
         db.session.commit()
         
@@ -3,12 +3,16 @@ from flask_jwt_extended import jwt_required, get_jwt, decode_token
 import time
 from app import db
 from app.services.notification_service import NotificationService
-from app.utils import get_current_user_id
+from app.services.freshness_service import FreshnessService
+from app.utils import get_current_user_id, get_active_membership, conditional_get, read_replica, reject_writes_on_deleting_project
 from app.models import Membership
 from app.schemas.notification_schema import NotificationSchema
 from app.realtime.notifications_hub import notifications_hub
+from app.serialization import notification_encoder, json_response, parse_fields
 
 notifications_bp = Blueprint('notifications', __name__, url_prefix='/api/notifications')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+notifications_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schema
 notification_schema = NotificationSchema()
@@ -68,10 +72,13 @@ def stream_notifications():
 
 @notifications_bp.route('', methods=['GET'])
 @jwt_required()
+@read_replica
 def list_notifications():
     """
     Listar notificaciones del usuario
     RF-027: Sistema de notificaciones
+
+    Campos: ?fields=id,message,read,created_at (por defecto todos)
     """
     try:
         user_id = get_current_user_id()
@@ -81,7 +88,7 @@ def list_notifications():
         limit = request.args.get('limit')
         offset = request.args.get('offset', 0)
         
-        membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+        membership = get_active_membership(user_id)
         project_id = membership.project_id if membership else None
         claims = get_jwt()
         role = claims.get('role')
@@ -91,6 +98,20 @@ def list_notifications():
                 'error': {'code': 'MEMBERSHIP_INACTIVE', 'message': 'Tu acceso al proyecto fue desactivado por el Owner.'}
             }), 403
         
+        # Sparse fieldsets: ?fields=id,message,read
+        try:
+            fields = parse_fields(request.args.get('fields'), notification_encoder.keys)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'Campos inválidos: {", ".join(e.args[0])}',
+                    'details': {'fields': [f'Valores permitidos: {", ".join(notification_encoder.keys)}']}
+                }
+            }), 400
+        encoder = notification_encoder.only(fields)
+
         # Obtener notificaciones
         total = NotificationService.count_user_notifications(
             user_id=user_id,
@@ -102,19 +123,20 @@ def list_notifications():
             project_id=project_id,
             unread_only=unread_only,
             limit=limit,
-            offset=offset
+            offset=offset,
+            columns=encoder.columns()
         )
         
-        # Serializar respuesta
-        notifications_data = notifications_schema.dump(notifications)
+        # Serializar respuesta (filas Core, misma salida que NotificationSchema)
+        notifications_data = encoder.encode_many(notifications)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': {
                 'notifications': notifications_data,
                 'total': total
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         return jsonify({
@@ -128,6 +150,7 @@ def list_notifications():
 
 @notifications_bp.route('/unread-count', methods=['GET'])
 @jwt_required()
+@conditional_get(FreshnessService.unread_count)
 def get_unread_count():
     """
     Obtener contador de notificaciones no leídas
@@ -137,7 +160,7 @@ def get_unread_count():
         user_id = get_current_user_id()
         
         # Obtener contador
-        membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+        membership = get_active_membership(user_id)
         project_id = membership.project_id if membership else None
         claims = get_jwt()
         role = claims.get('role')
@@ -1,13 +1,19 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from marshmallow import ValidationError
 from datetime import datetime
 from app import db
 from app.models import Project, User, AuditLog, Sprint, Task
-from app.utils import get_current_user_id
+from app.utils import get_current_user_id, conditional_get, read_replica, reject_writes_on_deleting_project
+from app.db_routing import replica_router
 from app.schemas import ProjectCreateSchema, ProjectUpdateSchema, ProjectSchema
+from app.services.freshness_service import FreshnessService
+from app.services.project_version_service import ProjectVersionService
+from app.services.project_service import ProjectService
 
 projects_bp = Blueprint('projects', __name__, url_prefix='/api/projects')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+projects_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schemas
 project_create_schema = ProjectCreateSchema()
@@ -149,6 +155,7 @@ def create_project():
 
 @projects_bp.route('/my-project', methods=['GET'])
 @jwt_required()
+@conditional_get(FreshnessService.my_project)
 def get_my_project():
     """
     Obtener proyecto del Owner actual
@@ -180,8 +187,8 @@ def get_my_project():
                 }
             }), 404
         
-        # Verificar que tenga proyecto
-        if not user.owned_project:
+        # Verificar que tenga proyecto (uno en eliminación ya no cuenta)
+        if not user.owned_project or user.owned_project.status == 'deleting':
             return jsonify({
                 'success': False,
                 'error': {
@@ -257,23 +264,23 @@ def get_project_settings():
         claims = get_jwt()
         user_role = claims.get('role')
 
-        project = None
+        project_id = None
         if user_role == 'OWNER':
-            user = User.query.get(user_id)
-            if user:
-                project = user.owned_project
+            owned = db.session.query(Project.id).filter(Project.owner_id == user_id).first()
+            project_id = owned.id if owned else None
         elif user_role == 'EMPLOYEE':
             from app.models import Membership
             membership = Membership.query.filter_by(user_id=user_id, status='active').first()
             if membership:
-                project = Project.query.get(membership.project_id)
+                project_id = membership.project_id
         else:
             return jsonify({
                 'success': False,
                 'error': {'code': 'FORBIDDEN', 'message': 'Rol no autorizado'}
             }), 403
 
-        if not project:
+        project_data = ProjectService.get_settings(project_id) if project_id else None
+        if not project_data:
             return jsonify({
                 'success': False,
                 'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
@@ -281,7 +288,48 @@ def get_project_settings():
 
         return jsonify({
             'success': True,
-            'data': {'project': project_schema.dump(project)}
+            'data': {'project': project_data}
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': str(e)}
+        }), 500
+
+
+@projects_bp.route('/versions', methods=['GET'])
+@jwt_required()
+def get_project_versions():
+    """
+    Contadores de versión del proyecto por dominio (tasks, members, sprints, chat, settings)
+
+    Permite al cliente saber qué cambió con una sola lectura y refrescar solo esas vistas.
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        project_id = None
+        if user_role == 'OWNER':
+            user = User.query.get(user_id)
+            if user and user.owned_project:
+                project_id = user.owned_project.id
+        elif user_role == 'EMPLOYEE':
+            from app.models import Membership
+            membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+            if membership:
+                project_id = membership.project_id
+
+        if not project_id:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'data': {'project_id': project_id, 'versions': ProjectVersionService.get(project_id)}
         }), 200
     except Exception as e:
         return jsonify({
@@ -330,8 +378,13 @@ def update_project_settings():
         project.updated_at = datetime.utcnow()
 
         if previous_sprint_enabled and validated.get('sprint_enabled') is False:
+            from app.services import SprintMetricsService
+            for active_sprint in Sprint.query.filter_by(project_id=project.id, status='active').all():
+                SprintMetricsService.snapshot_sprint(active_sprint.id, project.id)
             Sprint.query.filter_by(project_id=project.id, status='active').update({'status': 'closed'})
             Task.query.filter_by(project_id=project.id).filter(Task.sprint_id.isnot(None)).update({'sprint_id': None})
+            ProjectVersionService.bump(project.id, 'sprints', 'tasks')
+        ProjectVersionService.bump(project.id, 'settings')
 
         audit_log = AuditLog(
             user_id=user_id,
@@ -356,3 +409,70 @@ def update_project_settings():
             'success': False,
             'error': {'code': 'SERVER_ERROR', 'message': str(e)}
         }), 500
+
+
+@projects_bp.route('/<project_id>/export', methods=['GET'])
+@jwt_required()
+@read_replica
+def export_project(project_id):
+    """
+    Exportar el proyecto completo como NDJSON (Owner del proyecto o SUPERADMIN)
+
+    Query params:
+        compress: 'gzip' para recibir el archivo comprimido
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        project = Project.query.get(project_id)
+        if not project:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NOT_FOUND', 'message': 'Proyecto no encontrado'}
+            }), 404
+
+        if user_role != 'SUPERADMIN' and not (user_role == 'OWNER' and project.owner_id == user_id):
+            return jsonify({
+                'success': False,
+                'error': {'code': 'FORBIDDEN', 'message': 'No tienes permisos para exportar este proyecto'}
+            }), 403
+
+        from app.services import ProjectExportService
+
+        compress = request.args.get('compress') == 'gzip'
+        filename = f'project-{project.id}.ndjson' + ('.gz' if compress else '')
+
+        db.session.add(AuditLog(
+            user_id=user_id,
+            project_id=project.id,
+            action='project_exported',
+            entity_type='project',
+            entity_id=project.id,
+            details={'compress': 'gzip' if compress else None},
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent')
+        ))
+        db.session.commit()
+
+        # El generador corre después de la vista: la réplica se aplica ahí.
+        # La auditoría recién escrita no forma parte del export.
+        body = replica_router.stream(ProjectExportService.iter_ndjson(project_id))
+        if compress:
+            body = ProjectExportService.iter_gzip(body)
+
+        return Response(
+            stream_with_context(body),
+            mimetype='application/gzip' if compress else 'application/x-ndjson',
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': str(e)}
+        }), 500
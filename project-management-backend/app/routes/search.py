@@ -0,0 +1,119 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt
+from app.models import User, Project, Membership
+from app.search import SearchIndex, DOCUMENT_TYPES
+from app.utils import get_current_user_id, read_replica
+
+search_bp = Blueprint('search', __name__, url_prefix='/api/search')
+
+SEARCH_MIN_QUERY_LENGTH = 2
+SEARCH_DEFAULT_PER_PAGE = 20
+SEARCH_MAX_PER_PAGE = 50
+SEARCH_MAX_PAGE = 50
+
+
+@search_bp.route('', methods=['GET'])
+@jwt_required()
+@read_replica
+def search_project():
+    """
+    Búsqueda unificada en el proyecto: tareas, comentarios, chat y miembros
+
+    El Owner busca en todo el proyecto. Un empleado solo encuentra tareas y
+    comentarios de sus tareas asignadas, y mensajes del chat si lo tiene habilitado.
+
+    Query params:
+        q: texto a buscar (mínimo 2 caracteres)
+        type: tipos separados por coma (task, comment, message, member)
+        page: página (por defecto 1)
+        per_page: resultados por página (por defecto 20, máximo 50)
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        project = None
+        chat_enabled = True
+        if user_role == 'OWNER':
+            user = User.query.get(user_id)
+            project = user.owned_project if user else None
+        elif user_role == 'EMPLOYEE':
+            membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+            if membership:
+                project = Project.query.get(membership.project_id)
+                chat_enabled = getattr(membership, 'chat_enabled', True)
+
+        if not project or project.status == 'deleting':
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NO_PROJECT',
+                    'message': 'No tienes un proyecto'
+                }
+            }), 404
+
+        search_text = (request.args.get('q') or '').strip()
+        if len(search_text) < SEARCH_MIN_QUERY_LENGTH:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'El texto de búsqueda debe tener al menos {SEARCH_MIN_QUERY_LENGTH} caracteres'
+                }
+            }), 400
+
+        types = list(DOCUMENT_TYPES)
+        if request.args.get('type'):
+            types = [t.strip() for t in request.args['type'].split(',') if t.strip()]
+            invalid = [t for t in types if t not in DOCUMENT_TYPES]
+            if invalid:
+                return jsonify({
+                    'success': False,
+                    'error': {
+                        'code': 'VALIDATION_ERROR',
+                        'message': f'Tipos inválidos: {", ".join(invalid)}',
+                        'details': {'type': [f'Valores permitidos: {", ".join(DOCUMENT_TYPES)}']}
+                    }
+                }), 400
+        if not chat_enabled:
+            types = [t for t in types if t != 'message']
+
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', SEARCH_DEFAULT_PER_PAGE, type=int)
+        if page < 1 or page > SEARCH_MAX_PAGE or per_page < 1 or per_page > SEARCH_MAX_PER_PAGE:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'page debe estar entre 1 y {SEARCH_MAX_PAGE} y per_page entre 1 y {SEARCH_MAX_PER_PAGE}'
+                }
+            }), 400
+
+        result = SearchIndex.search(
+            project.id,
+            search_text,
+            user_id,
+            is_owner=user_role == 'OWNER',
+            types=types,
+            page=page,
+            per_page=per_page
+        )
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'query': search_text,
+                'results': result['items'],
+                'pagination': result['pagination']
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'SERVER_ERROR',
+                'message': str(e)
+            }
+        }), 500
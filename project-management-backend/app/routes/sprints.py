@@ -4,11 +4,16 @@ from marshmallow import ValidationError
 from datetime import datetime
 from app import db
 from app.models import User, Project, Membership, Sprint, Task, AuditLog
-from app.utils import get_current_user_id
+from app.utils import get_current_user_id, get_active_membership, conditional_get, read_replica, reject_writes_on_deleting_project
+from app.utils.transaction import after_commit
 from app.schemas import SprintCreateSchema, SprintUpdateSchema, SprintSchema
+from app.services import SprintService, SprintMetricsService, FreshnessService, ProjectVersionService
+from app.jobs import schedule_sprint_close
 
 
 sprints_bp = Blueprint('sprints', __name__, url_prefix='/api/sprints')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+sprints_bp.before_request(reject_writes_on_deleting_project)
 
 sprint_create_schema = SprintCreateSchema()
 sprint_update_schema = SprintUpdateSchema()
@@ -20,30 +25,15 @@ def _get_project_for_user(user_id: str, role: str):
         user = User.query.get(user_id)
         return user.owned_project if user else None
     if role == 'EMPLOYEE':
-        membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+        membership = get_active_membership(user_id)
         if membership:
             return Project.query.get(membership.project_id)
     return None
 
 
-def _auto_close_expired_sprints(project_id: str):
-    now = datetime.utcnow()
-    expired = Sprint.query.filter(
-        Sprint.project_id == project_id,
-        Sprint.status == 'active',
-        Sprint.end_date < now
-    ).all()
-    if not expired:
-        return
-    for s in expired:
-        s.status = 'closed'
-        s.updated_at = now
-        Task.query.filter_by(project_id=project_id, sprint_id=s.id).update({'sprint_id': None})
-    db.session.commit()
-
-
 @sprints_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(FreshnessService.sprints)
 def list_sprints():
     try:
         user_id = get_current_user_id()
@@ -57,17 +47,11 @@ def list_sprints():
                 'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
             }), 404
 
-        _auto_close_expired_sprints(project.id)
-
         status = request.args.get('status')
-        query = Sprint.query.filter_by(project_id=project.id)
-        if status:
-            query = query.filter_by(status=status)
-
-        sprints = query.order_by(Sprint.start_date.desc()).all()
+        sprints = SprintService.list_sprints(project.id, status or None)
         return jsonify({
             'success': True,
-            'data': {'sprints': sprint_schema.dump(sprints, many=True)}
+            'data': {'sprints': sprints}
         }), 200
     except Exception as e:
         return jsonify({
@@ -120,7 +104,7 @@ def create_sprint():
                 'error': {'code': 'DUPLICATE_SPRINT_NAME', 'message': 'Ya existe un sprint con ese nombre'}
             }), 409
 
-        _auto_close_expired_sprints(project.id)
+        SprintService.close_expired_sprints(project.id)
 
         if validated.get('status') == 'active':
             existing_active = Sprint.query.filter_by(project_id=project.id, status='active').first()
@@ -140,6 +124,7 @@ def create_sprint():
         )
 
         db.session.add(sprint)
+        db.session.flush()
 
         audit_log = AuditLog(
             user_id=user_id,
@@ -152,6 +137,8 @@ def create_sprint():
             user_agent=request.headers.get('User-Agent')
         )
         db.session.add(audit_log)
+        ProjectVersionService.bump(project.id, 'sprints')
+        after_commit(schedule_sprint_close, sprint.id, sprint.end_date, sprint.status)
         db.session.commit()
 
         return jsonify({
@@ -195,7 +182,7 @@ def update_sprint(sprint_id: str):
                 'error': {'code': 'NOT_FOUND', 'message': 'Sprint no encontrado'}
             }), 404
 
-        _auto_close_expired_sprints(project.id)
+        SprintService.close_expired_sprints(project.id)
 
         data = request.get_json()
         try:
@@ -214,13 +201,19 @@ def update_sprint(sprint_id: str):
                     'error': {'code': 'ACTIVE_SPRINT_EXISTS', 'message': 'Ya existe un sprint activo'}
                 }), 400
 
+        previous_status = sprint.status
         for key, value in validated.items():
             if hasattr(sprint, key):
                 setattr(sprint, key, value)
 
         sprint.updated_at = datetime.utcnow()
-        if validated.get('status') == 'closed':
+        # Solo en la transición a cerrado: repetir la foto con las tareas ya desvinculadas la dejaría en cero
+        if validated.get('status') == 'closed' and previous_status != 'closed':
+            # Foto final antes de desvincular las tareas del sprint
+            SprintMetricsService.snapshot_sprint(sprint.id, project.id)
             Task.query.filter_by(project_id=project.id, sprint_id=sprint.id).update({'sprint_id': None})
+            ProjectVersionService.bump(project.id, 'tasks')
+        ProjectVersionService.bump(project.id, 'sprints')
 
         audit_log = AuditLog(
             user_id=user_id,
@@ -233,6 +226,7 @@ def update_sprint(sprint_id: str):
             user_agent=request.headers.get('User-Agent')
         )
         db.session.add(audit_log)
+        after_commit(schedule_sprint_close, sprint.id, sprint.end_date, sprint.status)
         db.session.commit()
 
         return jsonify({
@@ -262,8 +256,6 @@ def get_sprint(sprint_id: str):
                 'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
             }), 404
 
-        _auto_close_expired_sprints(project.id)
-
         sprint = Sprint.query.get(sprint_id)
         if not sprint or sprint.project_id != project.id:
             return jsonify({
@@ -282,6 +274,74 @@ def get_sprint(sprint_id: str):
         }), 500
 
 
+@sprints_bp.route('/<sprint_id>/burndown', methods=['GET'])
+@jwt_required()
+@read_replica
+def get_sprint_burndown(sprint_id: str):
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        project = _get_project_for_user(user_id, user_role)
+        if not project:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
+            }), 404
+
+        sprint = Sprint.query.get(sprint_id)
+        if not sprint or sprint.project_id != project.id:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NOT_FOUND', 'message': 'Sprint no encontrado'}
+            }), 404
+
+        burndown = SprintMetricsService.get_burndown(sprint)
+        return jsonify({
+            'success': True,
+            'data': {
+                'sprint': sprint_schema.dump(sprint),
+                'series': burndown['series'],
+                'ideal': burndown['ideal']
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': str(e)}
+        }), 500
+
+
+@sprints_bp.route('/velocity', methods=['GET'])
+@jwt_required()
+@read_replica
+def get_project_velocity():
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        project = _get_project_for_user(user_id, user_role)
+        if not project:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'NO_PROJECT', 'message': 'No tienes un proyecto'}
+            }), 404
+
+        limit = min(max(request.args.get('limit', 6, type=int), 1), 26)
+        velocity = SprintMetricsService.get_velocity(project.id, limit)
+        return jsonify({
+            'success': True,
+            'data': {'velocity': velocity}
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {'code': 'SERVER_ERROR', 'message': str(e)}
+        }), 500
+
+
 @sprints_bp.route('/<sprint_id>', methods=['DELETE'])
 @jwt_required()
 def delete_sprint(sprint_id: str):
@@ -312,6 +372,7 @@ def delete_sprint(sprint_id: str):
             }), 404
 
         Task.query.filter_by(project_id=project.id, sprint_id=sprint.id).update({'sprint_id': None})
+        ProjectVersionService.bump(project.id, 'sprints', 'tasks')
 
         audit_log = AuditLog(
             user_id=user_id,
@@ -325,6 +386,7 @@ def delete_sprint(sprint_id: str):
         )
         db.session.add(audit_log)
         db.session.delete(sprint)
+        after_commit(schedule_sprint_close, sprint.id, None, 'deleted')
         db.session.commit()
 
         return jsonify({'success': True, 'data': {'deleted': True}}), 200
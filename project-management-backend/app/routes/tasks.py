@@ -1,25 +1,33 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from marshmallow import ValidationError
-from datetime import datetime
+from datetime import datetime, timedelta
 from app import db
 from app.models import Task, User, Project, Membership, Notification, AuditLog
-from app.services import TaskService
-from app.utils import get_current_user_id
+from app.services import TaskService, TaskFlowService, TaskBulkService, TaskImportService, TagService, FreshnessService
+from app.services.tag_service import TAG_FILTER_MODES
+from app.utils import get_current_user_id, conditional_get, read_replica, reject_writes_on_deleting_project
+from app.serialization import task_encoder, json_response, parse_fields
 from app.schemas import (
     TaskCreateSchema,
     TaskUpdateSchema,
     TaskSchema,
-    TaskWithDetailsSchema
+    TaskWithDetailsSchema,
+    TaskBulkSchema,
+    BULK_UPDATE_FIELDS
 )
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+tasks_bp.before_request(reject_writes_on_deleting_project)
 
 # Instanciar schemas
 task_create_schema = TaskCreateSchema()
 task_update_schema = TaskUpdateSchema()
 task_schema = TaskSchema()
 task_with_details_schema = TaskWithDetailsSchema()
+task_bulk_schema = TaskBulkSchema()
+task_bulk_update_schema = TaskUpdateSchema(only=BULK_UPDATE_FIELDS)
 
 
 @tasks_bp.route('', methods=['POST'])
@@ -144,13 +152,218 @@ def create_task():
         }), 500
 
 
+@tasks_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_tasks():
+    """
+    Operaciones masivas sobre tareas (Owner)
+    RF-010: CRUD de tareas
+
+    Body:
+        operations: lista de {op: create|update|delete, task_ids?, data?}
+        - create: data con los campos de creación de tarea
+        - update: task_ids y data con status, priority, assigned_to, sprint_id o tags
+        - delete: task_ids
+    Todo el lote se aplica en una sola transacción: si una operación falla, no se aplica ninguna.
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        if user_role != 'OWNER':
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'FORBIDDEN',
+                    'message': 'Solo los Owners pueden modificar tareas en lote'
+                }
+            }), 403
+
+        user = User.query.get(user_id)
+        if not user or not user.owned_project:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NO_PROJECT',
+                    'message': 'No tienes un proyecto'
+                }
+            }), 400
+
+        # Validar el lote y luego los datos de cada operación con los schemas de tarea
+        try:
+            operations = task_bulk_schema.load(request.get_json() or {})['operations']
+        except ValidationError as err:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Errores de validación',
+                    'details': err.messages
+                }
+            }), 400
+
+        errors = {}
+        for index, op in enumerate(operations):
+            if op['op'] == 'delete':
+                continue
+            schema = task_create_schema if op['op'] == 'create' else task_bulk_update_schema
+            try:
+                op['data'] = schema.load(op['data'])
+            except ValidationError as err:
+                errors[index] = {'data': err.messages}
+        if errors:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Errores de validación',
+                    'details': {'operations': errors}
+                }
+            }), 400
+
+        try:
+            result = TaskBulkService.apply(
+                user.owned_project,
+                operations,
+                user,
+                ip_address=request.remote_addr,
+                user_agent=request.headers.get('User-Agent')
+            )
+        except LookupError as e:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'error': {'code': 'TASK_NOT_FOUND', 'message': str(e)}
+            }), 404
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': str(e)}
+            }), 400
+
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'created': task_schema.dump(result['created'], many=True),
+                'updated': result['updated'],
+                'deleted': result['deleted'],
+                'notifications': result['notifications']
+            }
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'SERVER_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
+@tasks_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_tasks():
+    """
+    Importar tareas desde CSV o NDJSON (Owner)
+    RF-010: CRUD de tareas
+
+    Acepta el archivo como multipart (campo 'file') o como cuerpo crudo
+    (Content-Type text/csv o application/x-ndjson). El formato se puede
+    forzar con ?format=csv|ndjson.
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        if user_role != 'OWNER':
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'FORBIDDEN',
+                    'message': 'Solo los Owners pueden importar tareas'
+                }
+            }), 403
+
+        user = User.query.get(user_id)
+        if not user or not user.owned_project:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NO_PROJECT',
+                    'message': 'No tienes un proyecto'
+                }
+            }), 400
+
+        upload = request.files.get('file')
+        if upload:
+            stream = upload.stream
+            detected = TaskImportService.detect_format(upload.filename, upload.mimetype)
+        else:
+            stream = request.stream
+            detected = TaskImportService.detect_format(content_type=request.content_type)
+        fmt = request.args.get('format') or detected
+
+        if not fmt:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'No se pudo determinar el formato. Usa ?format=csv o ?format=ndjson'
+                }
+            }), 400
+
+        try:
+            summary = TaskImportService.import_tasks(
+                user.owned_project,
+                stream,
+                fmt,
+                user_id,
+                ip_address=request.remote_addr,
+                user_agent=request.headers.get('User-Agent')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': str(e)}
+            }), 400
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'import': summary
+            }
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'SERVER_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
 @tasks_bp.route('', methods=['GET'])
 @jwt_required()
+@read_replica
+@conditional_get(FreshnessService.tasks)
 def list_tasks():
     """
     Listar tareas
     RF-010: CRUD de tareas
     RF-015: Vista 'My Tasks'
+
+    Filtro por etiquetas: ?tag=a&tag=b&tag_mode=and|or (por defecto 'and')
+    Campos: ?fields=id,title,status,priority,assigned_to,due_date (por defecto todos)
     """
     try:
         user_id = get_current_user_id()
@@ -196,6 +409,30 @@ def list_tasks():
                 }
             }), 403
         
+        tag_mode = (request.args.get('tag_mode') or 'and').lower()
+        if tag_mode not in TAG_FILTER_MODES:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': "tag_mode debe ser 'and' u 'or'"
+                }
+            }), 400
+
+        # Sparse fieldsets: ?fields=id,title,status (SELECT y salida solo con esos campos)
+        try:
+            fields = parse_fields(request.args.get('fields'), task_encoder.keys)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'Campos inválidos: {", ".join(e.args[0])}',
+                    'details': {'fields': [f'Valores permitidos: {", ".join(task_encoder.keys)}']}
+                }
+            }), 400
+        encoder = task_encoder.only(fields)
+
         # Obtener filtros de query params
         filters = {
             'status': request.args.get('status'),
@@ -203,24 +440,26 @@ def list_tasks():
             'assigned_to': request.args.get('assigned_to'),
             'search': request.args.get('search'),
             'sprint_id': request.args.get('sprint_id'),
+            'tags': request.args.getlist('tag'),
+            'tag_mode': tag_mode,
             'include_old_done': (request.args.get('include_old_done') or '').lower() in ['1', 'true', 'yes'],
             'sort_by': request.args.get('sort_by', 'created_at'),
             'sort_order': request.args.get('sort_order', 'desc')
         }
         
         # Listar tareas con filtros
-        tasks = TaskService.list_tasks(project_id, filters, user_id, user_role)
+        tasks = TaskService.list_tasks(project_id, filters, user_id, user_role, columns=encoder.columns())
         
-        # Serializar respuesta
-        tasks_data = task_schema.dump(tasks, many=True)
+        # Serializar respuesta (filas Core, misma salida que TaskSchema)
+        tasks_data = encoder.encode_many(tasks)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': {
                 'tasks': tasks_data,
                 'total': len(tasks_data)
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         return jsonify({
@@ -472,10 +711,14 @@ def delete_task(task_id):
 
 @tasks_bp.route('/my-tasks', methods=['GET'])
 @jwt_required()
+@read_replica
+@conditional_get(FreshnessService.tasks)
 def get_my_tasks():
     """
     Obtener mis tareas (Employee)
     RF-015: Vista 'My Tasks'
+
+    Acepta los mismos filtros y ?fields= que GET /api/tasks
     """
     try:
         user_id = get_current_user_id()
@@ -509,6 +752,30 @@ def get_my_tasks():
         
         project_id = membership.project_id
         
+        tag_mode = (request.args.get('tag_mode') or 'and').lower()
+        if tag_mode not in TAG_FILTER_MODES:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': "tag_mode debe ser 'and' u 'or'"
+                }
+            }), 400
+
+        # Sparse fieldsets: ?fields=id,title,status (SELECT y salida solo con esos campos)
+        try:
+            fields = parse_fields(request.args.get('fields'), task_encoder.keys)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'Campos inválidos: {", ".join(e.args[0])}',
+                    'details': {'fields': [f'Valores permitidos: {", ".join(task_encoder.keys)}']}
+                }
+            }), 400
+        encoder = task_encoder.only(fields)
+
         # Filtros opcionales (mismo contrato que list_tasks)
         filters = {
             'status': request.args.get('status'),
@@ -516,23 +783,25 @@ def get_my_tasks():
             'assigned_to': None,
             'search': request.args.get('search'),
             'sprint_id': request.args.get('sprint_id'),
+            'tags': request.args.getlist('tag'),
+            'tag_mode': tag_mode,
             'include_old_done': (request.args.get('include_old_done') or '').lower() in ['1', 'true', 'yes'],
             'sort_by': request.args.get('sort_by', 'created_at'),
             'sort_order': request.args.get('sort_order', 'desc')
         }
         
-        tasks = TaskService.list_tasks(project_id, filters, user_id, user_role)
+        tasks = TaskService.list_tasks(project_id, filters, user_id, user_role, columns=encoder.columns())
         
-        # Serializar respuesta
-        tasks_data = task_schema.dump(tasks, many=True)
+        # Serializar respuesta (filas Core, misma salida que TaskSchema)
+        tasks_data = encoder.encode_many(tasks)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'data': {
                 'tasks': tasks_data,
                 'total': len(tasks_data)
             }
-        }), 200
+        }, 200)
         
     except Exception as e:
         return jsonify({
@@ -757,6 +1026,7 @@ def change_task_status(task_id):
 
 @tasks_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@read_replica
 def get_task_stats():
     """
     Obtener estadísticas de tareas
@@ -808,3 +1078,153 @@ def get_task_stats():
                 'message': str(e)
             }
         }), 500
+
+
+# Rango máximo (días) de los reportes de flujo
+FLOW_MAX_RANGE_DAYS = 366
+
+
+@tasks_bp.route('/flow', methods=['GET'])
+@jwt_required()
+@read_replica
+def get_task_flow():
+    """
+    Obtener flujo acumulado (CFD) y distribuciones de cycle/lead time
+    RF-028: Reportes (solo Owner)
+
+    Query params:
+        from: fecha inicial YYYY-MM-DD (por defecto, hace 30 días)
+        to: fecha final YYYY-MM-DD (por defecto, hoy)
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        if user_role != 'OWNER':
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'FORBIDDEN',
+                    'message': 'Solo los Owners pueden ver estadísticas'
+                }
+            }), 403
+
+        user = User.query.get(user_id)
+        if not user or not user.owned_project:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'NO_PROJECT',
+                    'message': 'No tienes un proyecto'
+                }
+            }), 400
+
+        today = datetime.utcnow().date()
+        try:
+            end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else today
+            start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else end - timedelta(days=29)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Las fechas deben tener formato YYYY-MM-DD'
+                }
+            }), 400
+
+        if start > end or (end - start).days >= FLOW_MAX_RANGE_DAYS:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'INVALID_RANGE',
+                    'message': f'El rango debe ser válido y de máximo {FLOW_MAX_RANGE_DAYS} días'
+                }
+            }), 400
+
+        project_id = user.owned_project.id
+        times = TaskFlowService.get_flow_times(project_id, start, end)
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'from': start.isoformat(),
+                'to': end.isoformat(),
+                'cumulative_flow': TaskFlowService.get_cumulative_flow(project_id, start, end),
+                'cycle_time': times['cycle_time'],
+                'lead_time': times['lead_time']
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'SERVER_ERROR',
+                'message': str(e)
+            }
+        }), 500
+
+
+@tasks_bp.route('/tags', methods=['GET'])
+@jwt_required()
+@read_replica
+def get_tag_cloud():
+    """
+    Nube de etiquetas del proyecto con la cantidad de tareas por etiqueta
+
+    El Owner ve todo el proyecto; un empleado, solo sus tareas asignadas.
+    """
+    try:
+        user_id = get_current_user_id()
+        claims = get_jwt()
+        user_role = claims.get('role')
+
+        assigned_to = None
+        if user_role == 'OWNER':
+            user = User.query.get(user_id)
+            if not user or not user.owned_project:
+                return jsonify({
+                    'success': False,
+                    'error': {
+                        'code': 'NO_PROJECT',
+                        'message': 'No tienes un proyecto'
+                    }
+                }), 400
+            project_id = user.owned_project.id
+        elif user_role == 'EMPLOYEE':
+            membership = Membership.query.filter_by(user_id=user_id, status='active').first()
+            if not membership:
+                return jsonify({
+                    'success': False,
+                    'error': {
+                        'code': 'MEMBERSHIP_INACTIVE',
+                        'message': 'Tu acceso al proyecto fue desactivado por el Owner.'
+                    }
+                }), 403
+            project_id = membership.project_id
+            assigned_to = user_id
+        else:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'FORBIDDEN',
+                    'message': 'Rol no autorizado'
+                }
+            }), 403
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'tags': TagService.get_tag_cloud(project_id, assigned_to=assigned_to)
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'SERVER_ERROR',
+                'message': str(e)
+            }
+        }), 500
@@ -2,12 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt
 from marshmallow import ValidationError
 from app import db
-from app.models.user import User
-from app.services.team_chat_service import TeamChatService
-from app.utils import get_current_user_id
+from app.services.team_chat_service import TeamChatService, MESSAGE_FIELDS
+from app.serialization import parse_fields, project_dicts
+from app.utils import get_current_user_id, reject_writes_on_deleting_project
 from app.schemas.team_message_schema import TeamMessageCreateSchema
 
 team_chat_bp = Blueprint('team_chat', __name__, url_prefix='/api/projects')
+# Sin escrituras mientras el proyecto se elimina en segundo plano
+team_chat_bp.before_request(reject_writes_on_deleting_project)
 
 message_create_schema = TeamMessageCreateSchema()
 
@@ -15,7 +17,13 @@ message_create_schema = TeamMessageCreateSchema()
 @jwt_required()
 def list_messages(project_id):
     """
-    Obtener mensajes del chat de un proyecto
+    Obtener mensajes del chat de un proyecto (orden cronológico)
+
+    Query params:
+        limit: mensajes por página (por defecto 50, máximo 100)
+        before: cursor; mensajes anteriores (scroll hacia atrás)
+        after: cursor; mensajes nuevos desde el último recibido
+        fields: campos de cada mensaje, p. ej. id,user_id,content,created_at (por defecto todos)
     """
     try:
         user_id = get_current_user_id()
@@ -23,8 +31,41 @@ def list_messages(project_id):
         user_role = claims.get('role')
         
         limit = request.args.get('limit', 50, type=int)
+        before = request.args.get('before')
+        after = request.args.get('after')
+        if before and after:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Usa before o after, no ambos'
+                }
+            }), 400
+
+        try:
+            fields = parse_fields(request.args.get('fields'), MESSAGE_FIELDS)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'Campos inválidos: {", ".join(e.args[0])}',
+                    'details': {'fields': [f'Valores permitidos: {", ".join(MESSAGE_FIELDS)}']}
+                }
+            }), 400
         
-        messages, error = TeamChatService.get_project_messages(project_id, user_id, user_role, limit)
+        try:
+            page, error = TeamChatService.get_project_messages(
+                project_id, user_id, user_role, limit, before=before, after=after
+            )
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': {
+                    'code': 'INVALID_CURSOR',
+                    'message': 'Cursor de paginación inválido'
+                }
+            }), 400
         
         if error:
             error_messages = {
@@ -42,7 +83,9 @@ def list_messages(project_id):
             
         return jsonify({
             'success': True,
-            'data': messages
+            # La página sale de la cola en caché (ya serializada): se recorta la salida
+            'data': project_dicts(page['messages'], fields),
+            'pagination': page['pagination']
         }), 200
         
     except Exception as e:
@@ -85,7 +128,8 @@ def create_message(project_id):
             user_role,
             validated_data['content'],
             validated_data.get('task_id'),
-            validated_data.get('mentioned_user_id')
+            validated_data.get('mentioned_user_id'),
+            validated_data.get('mentioned_user_ids')
         )
         
         if error:
@@ -104,13 +148,7 @@ def create_message(project_id):
             
         db.session.commit()
         
-        user = User.query.get(user_id)
-        msg_dict = message.to_dict()
-        msg_dict['user_name'] = user.name if user else 'Desconocido'
-        msg_dict['user_email'] = user.email if user else ''
-        msg_dict['user_avatar'] = user.avatar if user else None
-        msg_dict['task_title'] = message.task.title if message.task else None
-        msg_dict['mentioned_user_name'] = message.mentioned_user.name if message.mentioned_user else None
+        msg_dict = TeamChatService.serialize_messages([message])[0]
         
         return jsonify({
             'success': True,
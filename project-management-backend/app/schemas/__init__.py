@@ -25,7 +25,9 @@ from .task_schema import (
     TaskCreateSchema,
     TaskUpdateSchema,
     TaskSchema,
-    TaskWithDetailsSchema
+    TaskWithDetailsSchema,
+    TaskBulkSchema,
+    BULK_UPDATE_FIELDS
 )
 from .sprint_schema import (
     SprintCreateSchema,
@@ -77,6 +79,8 @@ __all__ = [
     'TaskUpdateSchema',
     'TaskSchema',
     'TaskWithDetailsSchema',
+    'TaskBulkSchema',
+    'BULK_UPDATE_FIELDS',
     # Sprint schemas
     'SprintCreateSchema',
     'SprintUpdateSchema',
@@ -130,3 +130,54 @@ class TaskWithDetailsSchema(TaskSchema):
     creator_name = fields.Str(dump_only=True)
     assignee_name = fields.Str(dump_only=True, allow_none=True)
     comments_count = fields.Int(dump_only=True)
+
+
+# Límite de operaciones y de tareas por lote en POST /api/tasks/bulk
+BULK_MAX_OPERATIONS = 200
+BULK_MAX_TASK_IDS = 500
+
+# Campos que una operación 'update' del lote puede modificar
+BULK_UPDATE_FIELDS = ('status', 'priority', 'assigned_to', 'sprint_id', 'tags')
+
+
+class TaskBulkOperationSchema(Schema):
+    """Schema para una operación de POST /api/tasks/bulk"""
+    op = fields.Str(required=True, validate=validate.OneOf(['create', 'update', 'delete']))
+    task_ids = fields.List(
+        fields.Str(validate=validate.Length(equal=36)),
+        required=False,
+        validate=validate.Length(min=1, max=BULK_MAX_TASK_IDS)
+    )
+    data = fields.Dict(required=False)
+
+    @validates_schema
+    def validate_operation(self, data, **kwargs):
+        op = data.get('op')
+        if op == 'create':
+            if not data.get('data'):
+                raise ValidationError({'data': ['Requerido para create']})
+            if data.get('task_ids'):
+                raise ValidationError({'task_ids': ['No aplica para create']})
+        elif op == 'update':
+            if not data.get('task_ids'):
+                raise ValidationError({'task_ids': ['Requerido para update']})
+            if not data.get('data'):
+                raise ValidationError({'data': ['Requerido para update']})
+        elif op == 'delete':
+            if not data.get('task_ids'):
+                raise ValidationError({'task_ids': ['Requerido para delete']})
+
+
+class TaskBulkSchema(Schema):
+    """Schema para POST /api/tasks/bulk"""
+    operations = fields.List(
+        fields.Nested(TaskBulkOperationSchema),
+        required=True,
+        validate=validate.Length(min=1, max=BULK_MAX_OPERATIONS)
+    )
+
+    @validates_schema
+    def validate_total_tasks(self, data, **kwargs):
+        total = sum(len(op.get('task_ids') or []) for op in data.get('operations') or [])
+        if total > BULK_MAX_TASK_IDS:
+            raise ValidationError({'operations': [f'Máximo {BULK_MAX_TASK_IDS} tareas por lote']})
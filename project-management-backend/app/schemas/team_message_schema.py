@@ -16,8 +16,11 @@ class TeamMessageWithUserSchema(TeamMessageSchema):
     user_avatar = fields.Str(dump_only=True)
     task_title = fields.Str(dump_only=True)
     mentioned_user_name = fields.Str(dump_only=True)
+    mentioned_user_ids = fields.List(fields.Str(), dump_only=True)
+    mention_groups = fields.List(fields.Str(), dump_only=True)
 
 class TeamMessageCreateSchema(Schema):
     content = fields.Str(required=True, validate=validate.Length(min=1, error="El contenido no puede estar vacío"))
     task_id = fields.Str(required=False, allow_none=True)
     mentioned_user_id = fields.Str(required=False, allow_none=True)
+    mentioned_user_ids = fields.List(fields.Str(), required=False, allow_none=True)
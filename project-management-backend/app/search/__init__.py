@@ -0,0 +1,7 @@
+# Búsqueda de texto completo
+
+from app.search.schema import ensure_search_schema
+from app.search.task_search import TaskSearch
+from app.search.project_index import SearchIndex, DOCUMENT_TYPES
+
+__all__ = ['ensure_search_schema', 'TaskSearch', 'SearchIndex', 'DOCUMENT_TYPES']
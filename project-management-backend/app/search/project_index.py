@@ -0,0 +1,430 @@
+"""
+Índice de búsqueda unificada por proyecto
+
+Tareas, comentarios, mensajes del chat y perfiles de miembros se guardan
+como filas de search_documents. Los servicios mantienen el índice al crear,
+editar o borrar cada entidad (en la misma transacción); la búsqueda ordena,
+pagina y resalta dentro de la base de datos.
+"""
+
+import html
+import re
+import threading
+from datetime import datetime
+from sqlalchemy import text, bindparam, or_
+from app import db
+from app.models import SearchDocument, Task, Comment, TeamMessage, User, Membership
+from app.search.query import parse_terms, to_tsquery, to_fts5_query
+from app.search.schema import PG_TEXT_SEARCH_CONFIG, document_index_exists, create_document_index
+
+DOCUMENT_TYPES = ('task', 'comment', 'message', 'member')
+
+# Tipos visibles para cualquier miembro; tareas y comentarios dependen del asignado
+PUBLIC_TYPES = ('message', 'member')
+
+# Marcadores de resaltado: la base de datos los inserta y se convierten
+# en <mark> después de escapar el HTML del contenido
+_OPEN = '\x02'
+_CLOSE = '\x03'
+
+SNIPPET_WORDS = 24
+FALLBACK_SNIPPET_CHARS = 160
+
+# ts_headline solo se calcula para las filas de la página (consulta externa)
+_PG_SEARCH = f"""
+SELECT d.id, d.entity_type, d.entity_id, d.task_id, d.author_id, d.title, d.updated_at, d.rank,
+       ts_headline('{PG_TEXT_SEARCH_CONFIG}', coalesce(d.title, ''), d.query,
+                   'HighlightAll=true, StartSel=' || :open || ', StopSel=' || :close) AS title_highlight,
+       ts_headline('{PG_TEXT_SEARCH_CONFIG}', coalesce(d.body, ''), d.query,
+                   'MaxWords={SNIPPET_WORDS}, MinWords=8, MaxFragments=2, FragmentDelimiter=" … ", '
+                   'StartSel=' || :open || ', StopSel=' || :close) AS body_highlight
+FROM (
+    SELECT d.id, d.entity_type, d.entity_id, d.task_id, d.author_id, d.title, d.body, d.updated_at,
+           q.query, ts_rank_cd(d.search_vector, q.query) AS rank
+    FROM search_documents d, to_tsquery('{PG_TEXT_SEARCH_CONFIG}'::regconfig, :query) AS q(query)
+    WHERE d.project_id = :project_id AND d.search_vector @@ q.query {{filters}}
+    ORDER BY rank DESC, d.updated_at DESC, d.id DESC
+    LIMIT :limit OFFSET :offset
+) d
+ORDER BY d.rank DESC, d.updated_at DESC, d.id DESC
+"""
+
+# bm25 con peso 10 para el título; menor es más relevante
+_SQLITE_SEARCH = f"""
+SELECT d.id, d.entity_type, d.entity_id, d.task_id, d.author_id, d.title, d.updated_at,
+       bm25(search_documents_fts, 10.0, 1.0) AS rank,
+       highlight(search_documents_fts, 0, :open, :close) AS title_highlight,
+       snippet(search_documents_fts, 1, :open, :close, '…', {SNIPPET_WORDS}) AS body_highlight
+FROM search_documents_fts
+JOIN search_documents d ON d.id = search_documents_fts.rowid
+WHERE search_documents_fts MATCH :query AND d.project_id = :project_id {{filters}}
+ORDER BY rank, d.updated_at DESC, d.id DESC
+LIMIT :limit OFFSET :offset
+"""
+
+
+def _join_text(*parts):
+    return '\n'.join(str(part) for part in parts if part) or None
+
+
+def _render_highlight(value):
+    """Escapar el texto y convertir los marcadores de la base de datos en <mark>"""
+    if not value:
+        return None
+    escaped = html.escape(value, quote=False)
+    return escaped.replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def _mark_terms(value, terms, max_chars=None):
+    """Resaltado en Python para el modo sin índice (ILIKE)"""
+    if not value:
+        return None
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    if max_chars and len(value) > max_chars:
+        match = pattern.search(value)
+        start = max((match.start() if match else 0) - max_chars // 4, 0)
+        value = ('…' if start else '') + value[start:start + max_chars] + '…'
+    return _render_highlight(pattern.sub(lambda m: f'{_OPEN}{m.group(0)}{_CLOSE}', value))
+
+
+class SearchIndex:
+    """Mantenimiento y consulta del índice de búsqueda unificada"""
+
+    _lock = threading.Lock()
+    _available = {}
+
+    @classmethod
+    def is_available(cls):
+        engine = db.engine
+        key = engine.url.render_as_string(hide_password=True)
+        available = cls._available.get(key)
+        if available is None:
+            with cls._lock:
+                available = cls._available.get(key)
+                if available is None:
+                    with engine.begin() as connection:
+                        available = document_index_exists(connection)
+                        if not available and connection.dialect.name == 'sqlite':
+                            # En desarrollo/pruebas la tabla puede crearse después del arranque
+                            available = create_document_index(connection)
+                    cls._available[key] = available
+        return available
+
+    # ------------------------------------------------------------------
+    # Documentos
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def task_document(task):
+        """Valores del documento de una tarea (objeto Task o fila dict de importación)"""
+        get = task.get if isinstance(task, dict) else lambda key: getattr(task, key)
+        tags = get('tags') or []
+        return {
+            'project_id': get('project_id'),
+            'entity_type': 'task',
+            'entity_id': get('id'),
+            'task_id': get('id'),
+            'author_id': get('created_by'),
+            'acl_user_id': get('assigned_to'),
+            'title': get('title'),
+            'body': _join_text(get('description'), ' '.join(str(tag) for tag in tags)),
+        }
+
+    @staticmethod
+    def _upsert(values, now=None):
+        now = now or datetime.utcnow()
+        updated = SearchDocument.query.filter_by(
+            project_id=values['project_id'],
+            entity_type=values['entity_type'],
+            entity_id=values['entity_id']
+        ).update({**values, 'updated_at': now}, synchronize_session=False)
+        if not updated:
+            db.session.add(SearchDocument(**values, created_at=now, updated_at=now))
+
+    @staticmethod
+    def insert_documents(rows):
+        """Insertar documentos nuevos en bloque (importaciones). No hace commit."""
+        if not rows:
+            return
+        now = datetime.utcnow()
+        db.session.execute(
+            SearchDocument.__table__.insert(),
+            [{'created_at': now, 'updated_at': now, **row} for row in rows]
+        )
+
+    @staticmethod
+    def index_task(task):
+        """Indexar (o reindexar) una tarea y propagar su asignado a sus comentarios. No hace commit."""
+        SearchIndex.index_tasks([task])
+
+    @staticmethod
+    def index_tasks(tasks):
+        """Reindexar varias tareas; los comentarios se actualizan con un UPDATE por asignado. No hace commit."""
+        if not tasks:
+            return
+        now = datetime.utcnow()
+        by_assignee = {}
+        for task in tasks:
+            SearchIndex._upsert(SearchIndex.task_document(task), now)
+            by_assignee.setdefault(task.assigned_to, []).append(task.id)
+        for assignee, task_ids in by_assignee.items():
+            SearchDocument.query.filter(
+                SearchDocument.entity_type == 'comment',
+                SearchDocument.task_id.in_(task_ids)
+            ).update({'acl_user_id': assignee}, synchronize_session=False)
+
+    @staticmethod
+    def index_comment(comment, task=None):
+        """Indexar (o reindexar) un comentario. No hace commit."""
+        task = task or Task.query.get(comment.task_id)
+        SearchIndex._upsert({
+            'project_id': task.project_id,
+            'entity_type': 'comment',
+            'entity_id': comment.id,
+            'task_id': task.id,
+            'author_id': comment.user_id,
+            'acl_user_id': task.assigned_to,
+            'title': None,
+            'body': comment.content,
+        })
+
+    @staticmethod
+    def index_message(message):
+        """Indexar un mensaje del chat del equipo (requiere id asignado). No hace commit."""
+        SearchIndex._upsert({
+            'project_id': message.project_id,
+            'entity_type': 'message',
+            'entity_id': message.id,
+            'task_id': message.task_id,
+            'author_id': message.user_id,
+            'acl_user_id': None,
+            'title': None,
+            'body': message.content,
+        })
+
+    @staticmethod
+    def member_document(project_id, user):
+        return {
+            'project_id': project_id,
+            'entity_type': 'member',
+            'entity_id': user.id,
+            'task_id': None,
+            'author_id': user.id,
+            'acl_user_id': None,
+            'title': user.name,
+            'body': _join_text(user.email, user.job_title, user.department, user.skills,
+                               user.responsibilities, user.description),
+        }
+
+    @staticmethod
+    def index_member(project_id, user):
+        """Indexar el perfil de un miembro en un proyecto. No hace commit."""
+        SearchIndex._upsert(SearchIndex.member_document(project_id, user))
+
+    @staticmethod
+    def index_user(user):
+        """Reindexar el perfil de un usuario en todos los proyectos donde es miembro activo. No hace commit."""
+        rows = db.session.query(Membership.project_id).filter_by(user_id=user.id, status='active').all()
+        for (project_id,) in rows:
+            SearchIndex.index_member(project_id, user)
+
+    @staticmethod
+    def remove(entity_type, entity_id, project_id=None):
+        """Quitar un documento del índice. No hace commit."""
+        query = SearchDocument.query.filter_by(entity_type=entity_type, entity_id=entity_id)
+        if project_id:
+            query = query.filter_by(project_id=project_id)
+        query.delete(synchronize_session=False)
+
+    @staticmethod
+    def remove_tasks(task_ids):
+        """Quitar tareas y sus comentarios del índice; los mensajes pierden el vínculo. No hace commit."""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        SearchDocument.query.filter(
+            SearchDocument.entity_type.in_(('task', 'comment')),
+            SearchDocument.task_id.in_(task_ids)
+        ).delete(synchronize_session=False)
+        SearchDocument.query.filter(
+            SearchDocument.entity_type == 'message',
+            SearchDocument.task_id.in_(task_ids)
+        ).update({'task_id': None}, synchronize_session=False)
+
+    @staticmethod
+    def rebuild_project(project_id):
+        """
+        Reconstruir todos los documentos de un proyecto desde las tablas de origen.
+        No hace commit.
+
+        Returns:
+            Cantidad de documentos indexados
+        """
+        SearchDocument.query.filter_by(project_id=project_id).delete(synchronize_session=False)
+        rows = []
+
+        tasks = {}
+        for task in Task.query.filter_by(project_id=project_id).yield_per(1000):
+            tasks[task.id] = task.assigned_to
+            rows.append(SearchIndex.task_document(task))
+
+        comments = db.session.query(Comment).join(Task, Task.id == Comment.task_id)\
+            .filter(Task.project_id == project_id).yield_per(1000)
+        for comment in comments:
+            rows.append({
+                'project_id': project_id,
+                'entity_type': 'comment',
+                'entity_id': comment.id,
+                'task_id': comment.task_id,
+                'author_id': comment.user_id,
+                'acl_user_id': tasks.get(comment.task_id),
+                'title': None,
+                'body': comment.content,
+            })
+
+        for message in TeamMessage.query.filter_by(project_id=project_id).yield_per(1000):
+            rows.append({
+                'project_id': project_id,
+                'entity_type': 'message',
+                'entity_id': message.id,
+                'task_id': message.task_id,
+                'author_id': message.user_id,
+                'acl_user_id': None,
+                'title': None,
+                'body': message.content,
+            })
+
+        members = db.session.query(User).join(Membership, Membership.user_id == User.id)\
+            .filter(Membership.project_id == project_id, Membership.status == 'active').all()
+        rows.extend(SearchIndex.member_document(project_id, user) for user in members)
+
+        SearchIndex.insert_documents(rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def search(project_id, search_text, user_id, is_owner, types=None, page=1, per_page=20):
+        """
+        Buscar en el índice del proyecto.
+
+        El orden por relevancia, la paginación (LIMIT/OFFSET) y el resaltado
+        se resuelven en la base de datos; se pide una fila extra para saber
+        si hay más resultados.
+
+        Returns:
+            dict con 'items' y 'pagination'
+        """
+        terms = parse_terms(search_text)
+        types = [t for t in (types or DOCUMENT_TYPES) if t in DOCUMENT_TYPES]
+        pagination = {'page': page, 'per_page': per_page, 'has_more': False}
+        if not terms or not types:
+            return {'items': [], 'pagination': pagination}
+
+        offset = (page - 1) * per_page
+        if SearchIndex.is_available():
+            rows = SearchIndex._search_index(project_id, terms, user_id, is_owner, types, per_page + 1, offset)
+        else:
+            rows = SearchIndex._search_fallback(project_id, terms, user_id, is_owner, types, per_page + 1, offset)
+
+        pagination['has_more'] = len(rows) > per_page
+        return {'items': SearchIndex._build_items(rows[:per_page]), 'pagination': pagination}
+
+    @staticmethod
+    def _search_index(project_id, terms, user_id, is_owner, types, limit, offset):
+        filters = ['AND d.entity_type IN :types']
+        params = {
+            'project_id': project_id,
+            'types': types,
+            'limit': limit,
+            'offset': offset,
+            'open': _OPEN,
+            'close': _CLOSE,
+        }
+        if not is_owner:
+            filters.append('AND (d.entity_type IN :public_types OR d.acl_user_id = :user_id)')
+            params['public_types'] = list(PUBLIC_TYPES)
+            params['user_id'] = user_id
+
+        if db.engine.dialect.name == 'postgresql':
+            sql = _PG_SEARCH
+            params['query'] = to_tsquery(terms)
+        else:
+            sql = _SQLITE_SEARCH
+            params['query'] = to_fts5_query(terms)
+
+        statement = text(sql.format(filters=' '.join(filters))).bindparams(
+            bindparam('types', expanding=True),
+            *([bindparam('public_types', expanding=True)] if not is_owner else [])
+        )
+        rows = db.session.execute(statement, params).mappings().all()
+        return [{
+            **row,
+            'title_highlight': _render_highlight(row['title_highlight']) if row['title'] else None,
+            'body_highlight': _render_highlight(row['body_highlight']),
+            'rank': abs(float(row['rank'] or 0)),
+        } for row in rows]
+
+    @staticmethod
+    def _search_fallback(project_id, terms, user_id, is_owner, types, limit, offset):
+        """Búsqueda ILIKE (todos los términos) para motores sin índice de texto completo"""
+        query = SearchDocument.query.filter(
+            SearchDocument.project_id == project_id,
+            SearchDocument.entity_type.in_(types)
+        )
+        for term in terms:
+            pattern = f'%{term}%'
+            query = query.filter(or_(SearchDocument.title.ilike(pattern), SearchDocument.body.ilike(pattern)))
+        if not is_owner:
+            query = query.filter(or_(
+                SearchDocument.entity_type.in_(PUBLIC_TYPES),
+                SearchDocument.acl_user_id == user_id
+            ))
+        documents = query.order_by(SearchDocument.updated_at.desc(), SearchDocument.id.desc())\
+            .limit(limit).offset(offset).all()
+        return [{
+            'id': doc.id,
+            'entity_type': doc.entity_type,
+            'entity_id': doc.entity_id,
+            'task_id': doc.task_id,
+            'author_id': doc.author_id,
+            'title': doc.title,
+            'updated_at': doc.updated_at,
+            'rank': None,
+            'title_highlight': _mark_terms(doc.title, terms),
+            'body_highlight': _mark_terms(doc.body, terms, FALLBACK_SNIPPET_CHARS),
+        } for doc in documents]
+
+    @staticmethod
+    def _build_items(rows):
+        """Armar los resultados tipados; títulos de tareas y autores en dos consultas"""
+        task_ids = {row['task_id'] for row in rows if row['task_id']}
+        author_ids = {row['author_id'] for row in rows if row['author_id']}
+        task_titles = dict(db.session.query(Task.id, Task.title).filter(Task.id.in_(task_ids)).all()) if task_ids else {}
+        authors = {
+            row.id: row for row in db.session.query(User.id, User.name, User.avatar).filter(User.id.in_(author_ids)).all()
+        } if author_ids else {}
+
+        items = []
+        for row in rows:
+            author = authors.get(row['author_id'])
+            updated_at = row['updated_at']
+            if isinstance(updated_at, str):
+                updated_at = datetime.fromisoformat(updated_at)
+            items.append({
+                'type': row['entity_type'],
+                'id': row['entity_id'],
+                'task_id': row['task_id'],
+                'task_title': task_titles.get(row['task_id']),
+                'title': row['title'],
+                'highlight': {
+                    'title': row['title_highlight'],
+                    'snippet': row['body_highlight'],
+                },
+                'author': {'id': author.id, 'name': author.name, 'avatar': author.avatar} if author else None,
+                'rank': row['rank'],
+                'updated_at': updated_at.isoformat() if updated_at else None,
+            })
+        return items
@@ -0,0 +1,28 @@
+"""
+Traducción del texto de búsqueda a consultas de índice
+(tsquery en PostgreSQL y MATCH de FTS5 en SQLite)
+"""
+
+import re
+
+# Máximo de términos que se envían al índice
+MAX_TERMS = 8
+
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_terms(text):
+    """Separar el texto en términos alfanuméricos (descarta operadores y signos)"""
+    if not text:
+        return []
+    return _TERM.findall(text.lower())[:MAX_TERMS]
+
+
+def to_tsquery(terms):
+    """'diseño web' -> 'diseño:* & web:*' (todos los términos, con prefijo)"""
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def to_fts5_query(terms):
+    """'diseño web' -> '"diseño"* "web"*' (todos los términos, con prefijo)"""
+    return ' '.join(f'"{term}"*' for term in terms)
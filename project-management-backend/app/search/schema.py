@@ -0,0 +1,200 @@
+"""
+DDL de los índices de búsqueda
+
+- Tareas: columna generada tasks.search_vector (filtro de /api/tasks?search=).
+- Documentos: search_documents.search_vector, índice de la búsqueda unificada
+  por proyecto (/api/search).
+
+PostgreSQL: configuración de texto 'es_unaccent' (español sin acentos),
+columnas tsvector generadas e índices GIN.
+SQLite: tablas virtuales FTS5 con contenido externo sincronizadas por triggers.
+"""
+
+import logging
+from sqlalchemy import text, inspect
+
+logger = logging.getLogger(__name__)
+
+PG_TEXT_SEARCH_CONFIG = 'es_unaccent'
+
+PG_STATEMENTS = [
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    f"""
+    DO $$
+    BEGIN
+      IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{PG_TEXT_SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {PG_TEXT_SEARCH_CONFIG} (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION {PG_TEXT_SEARCH_CONFIG}
+          ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+      END IF;
+    END $$;
+    """,
+    f"""
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+      GENERATED ALWAYS AS (
+        setweight(to_tsvector('{PG_TEXT_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{PG_TEXT_SEARCH_CONFIG}'::regconfig, coalesce(description, '')), 'B')
+      ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)',
+]
+
+SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+      title, description,
+      content='tasks', content_rowid='rowid',
+      tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+      INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+      INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+      INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+      INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+]
+
+
+# El índice GIN compuesto (project_id, search_vector) requiere btree_gin:
+# cada búsqueda recorre solo las entradas del proyecto
+DOCUMENT_PG_STATEMENTS = [
+    'CREATE EXTENSION IF NOT EXISTS btree_gin',
+    f"""
+    ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+      GENERATED ALWAYS AS (
+        setweight(to_tsvector('{PG_TEXT_SEARCH_CONFIG}'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{PG_TEXT_SEARCH_CONFIG}'::regconfig, coalesce(body, '')), 'B')
+      ) STORED
+    """,
+    'CREATE INDEX IF NOT EXISTS ix_search_documents_vector ON search_documents USING GIN (project_id, search_vector)',
+]
+
+DOCUMENT_SQLITE_STATEMENTS = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(
+      title, body,
+      content='search_documents', content_rowid='id',
+      tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_ai AFTER INSERT ON search_documents BEGIN
+      INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_ad AFTER DELETE ON search_documents BEGIN
+      INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_documents_fts_au AFTER UPDATE OF title, body ON search_documents BEGIN
+      INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+      INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+
+def task_index_exists(connection):
+    """¿Existe el índice de búsqueda de tareas para este motor?"""
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+    if dialect == 'postgresql':
+        return 'search_vector' in {c['name'] for c in inspector.get_columns('tasks')}
+    if dialect == 'sqlite':
+        return 'tasks_fts' in inspector.get_table_names()
+    return False
+
+
+def create_task_index(connection):
+    """
+    Crear el índice de búsqueda de tareas si no existe (idempotente).
+
+    Returns:
+        True si el índice quedó disponible
+    """
+    dialect = connection.dialect.name
+    if not inspect(connection).has_table('tasks'):
+        return False
+
+    if dialect == 'postgresql':
+        for statement in PG_STATEMENTS:
+            connection.execute(text(statement))
+        return True
+
+    if dialect == 'sqlite':
+        created = 'tasks_fts' not in inspect(connection).get_table_names()
+        for statement in SQLITE_STATEMENTS:
+            connection.execute(text(statement))
+        if created:
+            # Indexar las tareas existentes
+            connection.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+        return True
+
+    return False
+
+
+def document_index_exists(connection):
+    """¿Existe el índice de la búsqueda unificada para este motor?"""
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+    if not inspector.has_table('search_documents'):
+        return False
+    if dialect == 'postgresql':
+        return 'search_vector' in {c['name'] for c in inspector.get_columns('search_documents')}
+    if dialect == 'sqlite':
+        return 'search_documents_fts' in inspector.get_table_names()
+    return False
+
+
+def create_document_index(connection):
+    """
+    Crear el índice de la búsqueda unificada si no existe (idempotente).
+    En PostgreSQL requiere la configuración creada por create_task_index.
+
+    Returns:
+        True si el índice quedó disponible
+    """
+    dialect = connection.dialect.name
+    if not inspect(connection).has_table('search_documents'):
+        return False
+
+    if dialect == 'postgresql':
+        for statement in DOCUMENT_PG_STATEMENTS:
+            connection.execute(text(statement))
+        return True
+
+    if dialect == 'sqlite':
+        created = 'search_documents_fts' not in inspect(connection).get_table_names()
+        for statement in DOCUMENT_SQLITE_STATEMENTS:
+            connection.execute(text(statement))
+        if created:
+            connection.execute(text("INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')"))
+        return True
+
+    return False
+
+
+def ensure_search_schema(engine):
+    """Crear los índices al arrancar; si el motor no los soporta se usa la búsqueda ILIKE"""
+    available = True
+    for create_index in (create_task_index, create_document_index):
+        try:
+            with engine.begin() as connection:
+                available = create_index(connection) and available
+        except Exception as e:
+            logger.warning(f'Índice de búsqueda no disponible ({create_index.__name__}), se usará ILIKE: {e}')
+            available = False
+    return available
@@ -0,0 +1,71 @@
+"""
+Búsqueda de tareas sobre el índice de texto completo
+"""
+
+import threading
+from sqlalchemy import func, literal_column, or_, select, text, bindparam
+from app import db
+from app.models import Task
+from app.search.query import parse_terms, to_tsquery, to_fts5_query
+from app.search.schema import PG_TEXT_SEARCH_CONFIG, task_index_exists, create_task_index
+
+
+class TaskSearch:
+    """
+    Filtro y ranking de tareas por texto.
+
+    Usa tasks.search_vector (GIN) en PostgreSQL y tasks_fts (FTS5) en SQLite.
+    Si el índice no existe, cae en ILIKE sobre título y descripción.
+    """
+
+    _lock = threading.Lock()
+    _available = {}
+
+    @classmethod
+    def is_available(cls):
+        engine = db.engine
+        key = engine.url.render_as_string(hide_password=True)
+        available = cls._available.get(key)
+        if available is None:
+            with cls._lock:
+                available = cls._available.get(key)
+                if available is None:
+                    with engine.begin() as connection:
+                        available = task_index_exists(connection)
+                        if not available and connection.dialect.name == 'sqlite':
+                            # En desarrollo/pruebas la tabla puede crearse después del arranque
+                            available = create_task_index(connection)
+                    cls._available[key] = available
+        return available
+
+    @staticmethod
+    def apply(query, search_text):
+        """
+        Filtrar `query` (sobre Task) por el texto de búsqueda.
+
+        Returns:
+            (query filtrada, expresión de orden por relevancia o None)
+        """
+        terms = parse_terms(search_text)
+        if not terms:
+            return query, None
+
+        if not TaskSearch.is_available():
+            pattern = f'%{search_text}%'
+            return query.filter(or_(Task.title.ilike(pattern), Task.description.ilike(pattern))), None
+
+        if db.engine.dialect.name == 'postgresql':
+            tsquery = func.to_tsquery(literal_column(f"'{PG_TEXT_SEARCH_CONFIG}'::regconfig"), to_tsquery(terms))
+            vector = literal_column('tasks.search_vector')
+            query = query.filter(vector.op('@@')(tsquery))
+            return query, func.ts_rank_cd(vector, tsquery).desc()
+
+        matches = select(
+            literal_column('rowid').label('rowid'),
+            literal_column('rank').label('rank')
+        ).select_from(text('tasks_fts')).where(
+            text('tasks_fts MATCH :fts_query').bindparams(bindparam('fts_query', to_fts5_query(terms)))
+        ).subquery('tasks_fts_matches')
+        query = query.join(matches, matches.c.rowid == literal_column('tasks.rowid'))
+        # rank de FTS5 es bm25: menor es más relevante
+        return query, matches.c.rank.asc()
@@ -0,0 +1,14 @@
+# Serialización rápida de listados
+
+from app.serialization.encoders import RowEncoder, task_encoder, notification_encoder
+from app.serialization.json import json_response
+from app.serialization.fields import parse_fields, project_dicts
+
+__all__ = [
+    'RowEncoder',
+    'task_encoder',
+    'notification_encoder',
+    'json_response',
+    'parse_fields',
+    'project_dicts'
+]
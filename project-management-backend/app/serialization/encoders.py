@@ -0,0 +1,169 @@
+"""
+Encoders de filas precompilados
+
+Cada RowEncoder genera (una sola vez, con exec) una función especializada que
+arma el dict de salida leyendo atributos: sirve igual para objetos ORM que para
+filas de SQLAlchemy Core (db.session.query(*columnas)), así los listados pueden
+serializarse sin hidratar modelos.
+
+La salida replica exactamente la del schema marshmallow equivalente
+(TaskSchema, NotificationSchema): mismos tipos, mismos None y el mismo formato
+isoformat() de las fechas.
+"""
+
+from marshmallow import fields as ma_fields
+
+_TRUTHY = ma_fields.Boolean.truthy
+_FALSY = ma_fields.Boolean.falsy
+
+
+def _to_bool(value):
+    """Mismo criterio que marshmallow.fields.Boolean"""
+    if value is None or value.__class__ is bool:
+        return value
+    try:
+        if value in _TRUTHY:
+            return True
+        if value in _FALSY:
+            return False
+    except TypeError:
+        pass
+    return bool(value)
+
+
+def _to_str_list(value):
+    if value is None:
+        return None
+    return [item if item is None or item.__class__ is str else str(item) for item in value]
+
+
+def _checklist_item(item):
+    # Nested(ChecklistItemSchema): solo id, text y completed; las claves ausentes se omiten
+    if item is None:
+        return None
+    if not isinstance(item, dict):
+        return {}
+    result = {}
+    if 'id' in item:
+        value = item['id']
+        result['id'] = value if value is None or value.__class__ is str else str(value)
+    if 'text' in item:
+        value = item['text']
+        result['text'] = value if value is None or value.__class__ is str else str(value)
+    if 'completed' in item:
+        result['completed'] = _to_bool(item['completed'])
+    return result
+
+
+def _to_checklist(value):
+    if value is None:
+        return None
+    return [_checklist_item(item) for item in value]
+
+
+# Tipo de campo -> plantilla de la expresión generada ({v} = lectura del atributo)
+_TEMPLATES = {
+    'raw': '{v}',
+    'str': '(_v if (_v := {v}) is None or _v.__class__ is str else str(_v))',
+    'datetime': '(None if (_v := {v}) is None else _v.isoformat())',
+    'bool': '_to_bool({v})',
+    'str_list': '_to_str_list({v})',
+    'checklist': '_to_checklist({v})',
+}
+
+# Subconjuntos (fields=) cacheados por encoder
+_MAX_SUBSETS = 64
+
+_HELPERS = {
+    '_to_bool': _to_bool,
+    '_to_str_list': _to_str_list,
+    '_to_checklist': _to_checklist,
+}
+
+
+class RowEncoder:
+    """
+    Serializador precompilado de un modelo.
+
+    fields: lista ordenada de (clave, tipo) con tipo en raw, str, datetime,
+    bool, str_list o checklist. La clave es a la vez el atributo leído.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+        self.keys = tuple(key for key, _ in self.fields)
+        self.encode = self._compile()
+        self._subsets = {}
+
+    def _compile(self):
+        lines = ['def encode(row):', '    return {']
+        for key, kind in self.fields:
+            if not key.isidentifier():
+                raise ValueError(f'Campo inválido: {key}')
+            lines.append(f'        {key!r}: {_TEMPLATES[kind].format(v="row." + key)},')
+        lines.append('    }')
+        namespace = dict(_HELPERS)
+        exec(compile('\n'.join(lines), f'<encoder {self.model.__name__}>', 'exec'), namespace)
+        return namespace['encode']
+
+    def columns(self):
+        """Columnas de la tabla para consultar filas Core con exactamente estos campos"""
+        table = self.model.__table__
+        return [table.c[key] for key in self.keys]
+
+    def only(self, keys):
+        """Encoder con un subconjunto de los campos (en el orden original)"""
+        if keys is None:
+            return self
+        keys = frozenset(keys)
+        encoder = self._subsets.get(keys)
+        if encoder is None:
+            encoder = RowEncoder(self.model, [field for field in self.fields if field[0] in keys])
+            if len(self._subsets) >= _MAX_SUBSETS:
+                self._subsets.clear()
+            self._subsets[keys] = encoder
+        return encoder
+
+    def encode_many(self, rows):
+        encode = self.encode
+        return [encode(row) for row in rows]
+
+
+def _build_encoders():
+    from app.models import Task, Notification
+
+    task = RowEncoder(Task, [
+        ('id', 'str'),
+        ('project_id', 'str'),
+        ('sprint_id', 'str'),
+        ('title', 'str'),
+        ('description', 'str'),
+        ('status', 'str'),
+        ('priority', 'str'),
+        ('created_by', 'str'),
+        ('assigned_to', 'str'),
+        ('due_date', 'datetime'),
+        ('start_date', 'datetime'),
+        ('completed_at', 'datetime'),
+        ('tags', 'str_list'),
+        ('checklist', 'checklist'),
+        ('created_at', 'datetime'),
+        ('updated_at', 'datetime'),
+    ])
+    notification = RowEncoder(Notification, [
+        ('id', 'str'),
+        ('user_id', 'str'),
+        ('project_id', 'str'),
+        ('type', 'str'),
+        ('message', 'str'),
+        ('read', 'bool'),
+        ('entity_type', 'str'),
+        ('entity_id', 'str'),
+        ('created_at', 'datetime'),
+        ('read_at', 'datetime'),
+    ])
+    return task, notification
+
+
+task_encoder, notification_encoder = _build_encoders()
@@ -0,0 +1,31 @@
+"""
+Sparse fieldsets: parámetro ?fields=id,title,status de los listados
+"""
+
+
+def parse_fields(value, allowed, required=('id',)):
+    """
+    Interpretar ?fields=.
+
+    Returns:
+        tupla de campos en el orden de `allowed` (incluye siempre `required`),
+        o None si no se pidió proyección
+
+    Raises:
+        ValueError: con la lista de campos desconocidos
+    """
+    if value is None or not value.strip():
+        return None
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    invalid = sorted(requested - set(allowed))
+    if invalid:
+        raise ValueError(invalid)
+    requested.update(required)
+    return tuple(name for name in allowed if name in requested)
+
+
+def project_dicts(items, keys):
+    """Recortar dicts ya serializados a `keys` (None = sin cambios)"""
+    if keys is None:
+        return items
+    return [{key: item[key] for key in keys if key in item} for item in items]
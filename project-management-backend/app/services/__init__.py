@@ -6,5 +6,18 @@ from app.services.task_service import TaskService
 from app.services.notification_service import NotificationService
 from app.services.comment_service import CommentService
 from app.services.admin_service import AdminService
+from app.services.sprint_service import SprintService
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.services.task_flow_service import TaskFlowService
+from app.services.task_bulk_service import TaskBulkService
+from app.services.task_import_service import TaskImportService
+from app.services.project_export_service import ProjectExportService
+from app.services.project_deletion_service import ProjectDeletionService, ProjectDeletingError
+from app.services.tag_service import TagService
+from app.services.project_version_service import ProjectVersionService
+from app.services.freshness_service import FreshnessService
+from app.services.project_service import ProjectService
+from app.services.member_service import MemberService
+from app.services.dashboard_service import DashboardService
 
-__all__ = ['AuthService', 'InviteService', 'TaskService', 'NotificationService', 'CommentService', 'AdminService']
+__all__ = ['AuthService', 'InviteService', 'TaskService', 'NotificationService', 'CommentService', 'AdminService', 'SprintService', 'SprintMetricsService', 'TaskFlowService', 'TaskBulkService', 'TaskImportService', 'ProjectExportService', 'ProjectDeletionService', 'ProjectDeletingError', 'TagService', 'ProjectVersionService', 'FreshnessService', 'ProjectService', 'MemberService', 'DashboardService']
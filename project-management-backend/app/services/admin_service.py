@@ -5,6 +5,8 @@ Lógica de negocio para el panel de administración (SUPERADMIN)
 
 from app import db
 from app.models import User, Project, Task, Membership, AuditLog
+from app.services.project_version_service import ProjectVersionService
+from app.services.project_deletion_service import ProjectDeletingError
 from sqlalchemy import func, desc
 from datetime import datetime, timedelta
 
@@ -165,6 +167,11 @@ class AdminService:
         
         user.status = new_status
         user.updated_at = datetime.utcnow()
+        # El estado del usuario aparece en la lista de miembros de sus proyectos
+        if user.owned_project:
+            ProjectVersionService.bump(user.owned_project.id, 'members')
+        for (project_id,) in db.session.query(Membership.project_id).filter_by(user_id=user.id).all():
+            ProjectVersionService.bump(project_id, 'members')
         
         db.session.commit()
         
@@ -181,11 +188,18 @@ class AdminService:
         
         Returns:
             Project: Proyecto actualizado
+
+        Raises:
+            ProjectDeletingError: el proyecto se está eliminando (el job seguiría
+                borrando sus datos aunque vuelva a 'active')
         """
         project = Project.query.get_or_404(project_id)
+        if project.status == 'deleting':
+            raise ProjectDeletingError()
         
         project.status = new_status
         project.updated_at = datetime.utcnow()
+        ProjectVersionService.bump(project.id, 'settings')
         
         db.session.commit()
         
@@ -2,6 +2,7 @@ from datetime import datetime
 from app import db
 from app.models import Comment, Task, User, Notification, Membership, Project
 from app.realtime.notifications_hub import notifications_hub
+from app.search import SearchIndex
 
 
 class CommentService:
@@ -79,6 +80,7 @@ class CommentService:
         
         db.session.add(new_comment)
         db.session.flush()
+        SearchIndex.index_comment(new_comment, task)
         
         # Crear notificación para el asignado (si no es él quien comenta)
         if task.assigned_to and task.assigned_to != user_id:
@@ -128,6 +130,7 @@ class CommentService:
         
         comment.content = content
         comment.updated_at = datetime.utcnow()
+        SearchIndex.index_comment(comment)
         
         return comment, None
     
@@ -156,6 +159,7 @@ class CommentService:
             if comment.user_id != user_id:
                 return False, 'FORBIDDEN'
         
+        SearchIndex.remove('comment', comment.id, task.project_id)
         db.session.delete(comment)
         return True, None
     
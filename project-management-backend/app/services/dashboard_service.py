@@ -0,0 +1,249 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, case, cast, String
+from app import db
+from app.cache import read_cache, project_tag
+from app.models import Project, Membership, Task, Sprint, AuditLog, User
+from app.serialization import task_encoder
+from app.services.notification_service import NotificationService
+from app.utils import get_active_membership
+
+DASHBOARD_OVERDUE_LIMIT = 10
+DASHBOARD_ACTIVITY_LIMIT = 10
+DASHBOARD_OVERDUE_FIELDS = ('id', 'title', 'status', 'priority', 'assigned_to', 'sprint_id', 'due_date')
+
+# Acciones de auditoría que se muestran como actividad del proyecto
+DASHBOARD_ACTIVITY_ACTIONS = (
+    'task_created', 'task_updated', 'task_status_changed', 'task_assigned', 'task_deleted',
+    'tasks_bulk_created', 'tasks_bulk_updated', 'tasks_bulk_deleted', 'tasks_imported',
+    'sprint_created', 'sprint_updated', 'sprint_deleted', 'sprint_auto_closed',
+    'member_deactivated', 'member_reactivated', 'member_profile_updated', 'invite_accepted',
+    'project_settings_updated',
+)
+
+# Dominios de project_versions de los que dependen las secciones cacheadas
+DASHBOARD_DOMAINS = ('tasks', 'sprints', 'members', 'settings')
+
+TASK_STATUSES = ('pending', 'in_progress', 'in_review', 'blocked', 'done')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+        return _executor
+
+
+def _in_app_context(app, fn, args):
+    # Contexto propio: sesión propia y, por lo tanto, conexión propia del pool.
+    # Al salir, Flask-SQLAlchemy cierra la sesión y devuelve la conexión.
+    with app.app_context():
+        return fn(*args)
+
+
+class DashboardService:
+    """
+    Servicio del dashboard (GET /api/dashboard)
+
+    Las secciones son consultas independientes: ante un fallo de caché se
+    ejecutan en paralelo en un pool de threads, cada una con su conexión.
+    El resultado se cachea por usuario y proyecto y se invalida con los
+    contadores de project_versions (tasks, sprints, members, settings).
+    El contador de no leídas no se cachea: es una sola consulta indexada.
+    """
+
+    @staticmethod
+    def resolve_project(user_id, user_role):
+        """ID del proyecto del Owner o del empleado (membresía activa), o None"""
+        if user_role == 'OWNER':
+            row = db.session.query(Project.id).filter(
+                Project.owner_id == user_id,
+                Project.status != 'deleting'
+            ).first()
+            return row.id if row else None
+        if user_role == 'EMPLOYEE':
+            membership = get_active_membership(user_id)
+            return membership.project_id if membership else None
+        return None
+
+    @staticmethod
+    def get_dashboard(user_id, user_role, project_id):
+        membership = get_active_membership(user_id)
+        unread_count = NotificationService.get_unread_count(
+            user_id, project_id=membership.project_id if membership else None
+        )
+
+        is_owner = user_role == 'OWNER'
+        data = read_cache.get_or_load(
+            'dashboard',
+            f'{user_id}|{user_role}|{project_id}',
+            [project_tag(project_id, domain) for domain in DASHBOARD_DOMAINS],
+            lambda: DashboardService._load_sections(project_id, user_id, is_owner)
+        )
+        return dict(data, unread_count=unread_count)
+
+    @staticmethod
+    def _load_sections(project_id, user_id, is_owner):
+        scope_user = None if is_owner else user_id
+        jobs = {
+            'project': (DashboardService.project_summary, (project_id, is_owner)),
+            'my_tasks': (DashboardService.my_task_stats, (project_id, user_id)),
+            'overdue': (DashboardService.overdue_tasks, (project_id, scope_user)),
+            'active_sprint': (DashboardService.active_sprint, (project_id, user_id)),
+            'recent_activity': (DashboardService.recent_activity, (project_id, scope_user)),
+        }
+
+        workers = current_app.config.get('DASHBOARD_WORKERS', 4)
+        if workers <= 1:
+            return {name: fn(*args) for name, (fn, args) in jobs.items()}
+
+        app = current_app._get_current_object()
+        executor = _get_executor(workers)
+        futures = {name: executor.submit(_in_app_context, app, fn, args) for name, (fn, args) in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def project_summary(project_id, is_owner):
+        """Datos básicos del proyecto; el Owner recibe además los totales de tareas"""
+        project = db.session.query(
+            Project.id, Project.name, Project.status, Project.sprint_enabled, Project.timezone
+        ).filter(Project.id == project_id).first()
+        if project is None:
+            return None
+
+        summary = {
+            'id': project.id,
+            'name': project.name,
+            'status': project.status,
+            'sprint_enabled': bool(project.sprint_enabled),
+            'timezone': project.timezone,
+            'active_members': db.session.query(func.count(Membership.id)).filter(
+                Membership.project_id == project_id,
+                Membership.status == 'active'
+            ).scalar() or 0
+        }
+        if is_owner:
+            now = datetime.utcnow()
+            rows = db.session.query(
+                Task.status,
+                func.count(Task.id),
+                func.sum(case((Task.assigned_to.is_(None), 1), else_=0)),
+                func.sum(case(((Task.due_date < now) & (Task.status != 'done'), 1), else_=0))
+            ).filter(Task.project_id == project_id).group_by(Task.status).all()
+            by_status = {status: 0 for status in TASK_STATUSES}
+            for status, total, _, _ in rows:
+                by_status[status] = total
+            summary['tasks'] = {
+                'total': sum(row[1] for row in rows),
+                'by_status': by_status,
+                'unassigned': sum(int(row[2] or 0) for row in rows),
+                'overdue': sum(int(row[3] or 0) for row in rows)
+            }
+        return summary
+
+    @staticmethod
+    def my_task_stats(project_id, user_id):
+        """Tareas asignadas al usuario en el proyecto, por estado (una consulta agrupada)"""
+        now = datetime.utcnow()
+        week_from_now = now + timedelta(days=7)
+        pending = Task.status != 'done'
+        rows = db.session.query(
+            Task.status,
+            func.count(Task.id),
+            func.sum(case(((Task.due_date < now) & pending, 1), else_=0)),
+            func.sum(case(((Task.due_date >= now) & (Task.due_date <= week_from_now) & pending, 1), else_=0))
+        ).filter(Task.project_id == project_id, Task.assigned_to == user_id).group_by(Task.status).all()
+
+        by_status = {status: 0 for status in TASK_STATUSES}
+        for status, total, _, _ in rows:
+            by_status[status] = total
+        return {
+            'total': sum(row[1] for row in rows),
+            'by_status': by_status,
+            'overdue': sum(int(row[2] or 0) for row in rows),
+            'due_this_week': sum(int(row[3] or 0) for row in rows)
+        }
+
+    @staticmethod
+    def overdue_tasks(project_id, assigned_to=None, limit=DASHBOARD_OVERDUE_LIMIT):
+        """Tareas vencidas sin terminar, las más atrasadas primero (del usuario si assigned_to)"""
+        encoder = task_encoder.only(DASHBOARD_OVERDUE_FIELDS)
+        query = db.session.query(*encoder.columns()).filter(
+            Task.project_id == project_id,
+            Task.due_date < datetime.utcnow(),
+            Task.status != 'done'
+        )
+        if assigned_to:
+            query = query.filter(Task.assigned_to == assigned_to)
+        return encoder.encode_many(query.order_by(Task.due_date.asc(), Task.id.asc()).limit(limit).all())
+
+    @staticmethod
+    def active_sprint(project_id, user_id):
+        """Progreso del sprint activo (total y propio del usuario), o None"""
+        sprint = db.session.query(Sprint.id, Sprint.name, Sprint.start_date, Sprint.end_date).filter(
+            Sprint.project_id == project_id,
+            Sprint.status == 'active'
+        ).order_by(Sprint.start_date.desc()).first()
+        if sprint is None:
+            return None
+
+        done = case((Task.status == 'done', 1), else_=0)
+        mine = case((Task.assigned_to == user_id, 1), else_=0)
+        total, completed, my_total, my_completed = db.session.query(
+            func.count(Task.id),
+            func.coalesce(func.sum(done), 0),
+            func.coalesce(func.sum(mine), 0),
+            func.coalesce(func.sum(case(((Task.assigned_to == user_id) & (Task.status == 'done'), 1), else_=0)), 0)
+        ).filter(Task.sprint_id == sprint.id).one()
+
+        now = datetime.utcnow()
+        return {
+            'id': sprint.id,
+            'name': sprint.name,
+            'start_date': sprint.start_date.isoformat() if sprint.start_date else None,
+            'end_date': sprint.end_date.isoformat() if sprint.end_date else None,
+            'days_left': max((sprint.end_date - now).days, 0) if sprint.end_date else None,
+            'total_tasks': int(total or 0),
+            'completed_tasks': int(completed or 0),
+            'progress': round(100 * int(completed or 0) / total, 1) if total else 0.0,
+            'my_total_tasks': int(my_total or 0),
+            'my_completed_tasks': int(my_completed or 0)
+        }
+
+    @staticmethod
+    def recent_activity(project_id, assigned_to=None, limit=DASHBOARD_ACTIVITY_LIMIT):
+        """
+        Últimas acciones del proyecto desde audit_logs.
+        Con assigned_to solo las de tareas asignadas a ese usuario (vista de empleado).
+        """
+        query = db.session.query(
+            AuditLog.id, AuditLog.action, AuditLog.entity_type, AuditLog.entity_id,
+            AuditLog.user_id, User.name, AuditLog.created_at
+        ).outerjoin(User, User.id == AuditLog.user_id).filter(
+            AuditLog.project_id == project_id,
+            AuditLog.action.in_(DASHBOARD_ACTIVITY_ACTIONS)
+        )
+        if assigned_to:
+            # audit_logs.entity_id es texto (polimórfico); tasks.id es uuid en PostgreSQL
+            my_tasks = db.session.query(cast(Task.id, String)).filter(
+                Task.project_id == project_id,
+                Task.assigned_to == assigned_to
+            )
+            query = query.filter(AuditLog.entity_type == 'task', AuditLog.entity_id.in_(my_tasks))
+
+        rows = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit).all()
+        return [{
+            'id': row.id,
+            'action': row.action,
+            'entity_type': row.entity_type,
+            'entity_id': row.entity_id,
+            'user_id': row.user_id,
+            'user_name': row.name,
+            'created_at': row.created_at.isoformat() if row.created_at else None
+        } for row in rows]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app import db
+from app.models import Project, Membership, Task, Notification
+from app.services.project_version_service import ProjectVersionService
+
+
+class FreshnessService:
+    """
+    Huellas baratas para los ETag de los endpoints de polling.
+
+    Cada método recibe al usuario del token y devuelve una tupla que cambia
+    cuando cambia la respuesta del endpoint (contadores de project_versions,
+    una lectura por PK), o None si no aplica y la vista debe responder sola.
+    """
+
+    @staticmethod
+    def _project(user_id, user_role):
+        """Proyecto visible para el usuario (mismo criterio que las vistas)"""
+        if user_role == 'OWNER':
+            return db.session.query(Project.id, Project.status, Project.updated_at, Project.tasks_retention_days)\
+                .filter(Project.owner_id == user_id).first()
+        if user_role == 'EMPLOYEE':
+            return db.session.query(Project.id, Project.status, Project.updated_at, Project.tasks_retention_days)\
+                .join(Membership, Membership.project_id == Project.id)\
+                .filter(Membership.user_id == user_id, Membership.status == 'active')\
+                .first()
+        return None
+
+    @staticmethod
+    def _expired_done(project, assigned_to=None):
+        """Tareas 'done' que ya salieron de la retención (la lista cambia con el tiempo, sin escrituras)"""
+        if not project.tasks_retention_days or project.tasks_retention_days <= 0:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=project.tasks_retention_days)
+        query = db.session.query(func.count(Task.id)).filter(
+            Task.project_id == project.id,
+            Task.status == 'done',
+            Task.completed_at < cutoff
+        )
+        if assigned_to:
+            query = query.filter(Task.assigned_to == assigned_to)
+        return query.scalar()
+
+    @staticmethod
+    def tasks(user_id, user_role):
+        """GET /api/tasks y /my-tasks (el filtro y los fields van en la query string)"""
+        project = FreshnessService._project(user_id, user_role)
+        if not project:
+            return None
+        assigned_to = user_id if user_role == 'EMPLOYEE' else None
+        versions = ProjectVersionService.get(project.id)
+        return (user_id, user_role, project.id, versions['tasks'], versions['settings'],
+                FreshnessService._expired_done(project, assigned_to))
+
+    @staticmethod
+    def my_project(user_id, user_role):
+        """GET /api/projects/my-project: datos del proyecto, miembros activos y estados de tareas"""
+        if user_role != 'OWNER':
+            return None
+        project = FreshnessService._project(user_id, user_role)
+        if not project or project.status == 'deleting':
+            return None
+        versions = ProjectVersionService.get(project.id)
+        return (user_id, project.id, project.updated_at, versions['tasks'], versions['members'], versions['settings'])
+
+    @staticmethod
+    def members(user_id, user_role):
+        """GET /api/members: membresías y perfiles de los usuarios del proyecto"""
+        project = FreshnessService._project(user_id, user_role)
+        if not project:
+            return None
+        return (user_id, project.id, ProjectVersionService.get(project.id)['members'])
+
+    @staticmethod
+    def sprints(user_id, user_role):
+        """GET /api/sprints"""
+        project = FreshnessService._project(user_id, user_role)
+        if not project:
+            return None
+        return (user_id, project.id, ProjectVersionService.get(project.id)['sprints'])
+
+    @staticmethod
+    def unread_count(user_id, user_role):
+        """GET /api/notifications/unread-count"""
+        membership = db.session.query(Membership.project_id)\
+            .filter(Membership.user_id == user_id, Membership.status == 'active').first()
+        project_id = membership.project_id if membership else None
+        if user_role == 'EMPLOYEE' and not project_id:
+            return None
+        query = db.session.query(func.count(Notification.id))\
+            .filter(Notification.user_id == user_id, Notification.read.is_(False))
+        if project_id:
+            query = query.filter(Notification.project_id == project_id)
+        return (user_id, project_id, query.scalar())
@@ -0,0 +1,84 @@
+from app import db
+from app.models import User, Membership
+from app.cache import read_cache, project_tag
+
+MEMBER_FIELDS = (
+    'id', 'email', 'name', 'role', 'status', 'avatar', 'job_title', 'description',
+    'responsibilities', 'skills', 'shift', 'department', 'phone', 'created_at',
+    'joined_at', 'is_owner', 'membership_id', 'chat_enabled'
+)
+MEMBER_USER_COLUMNS = (
+    'id', 'email', 'name', 'avatar', 'job_title', 'description', 'responsibilities',
+    'skills', 'shift', 'department', 'phone', 'created_at'
+)
+# Campo de salida -> columna de Membership
+MEMBER_MEMBERSHIP_COLUMNS = {
+    'role': 'role',
+    'status': 'status',
+    'joined_at': 'joined_at',
+    'membership_id': 'id',
+    'chat_enabled': 'chat_enabled'
+}
+
+
+class MemberService:
+    """Servicio de lectura del equipo del proyecto"""
+
+    @staticmethod
+    def _serialize(row, keys, fixed):
+        """Dict de un miembro con los campos pedidos; `fixed` trae los valores que no salen de la fila"""
+        data = {}
+        for key in keys:
+            if key in fixed:
+                data[key] = fixed[key]
+            elif key in ('created_at', 'joined_at'):
+                value = getattr(row, key)
+                data[key] = value.isoformat() if value else None
+            else:
+                data[key] = getattr(row, key)
+        # status se usa para los contadores aunque no se haya pedido
+        data.setdefault('status', row.status)
+        return data
+
+    @staticmethod
+    @read_cache.cached('members', tags=lambda project_id, owner_id, keys: [project_tag(project_id, 'members')])
+    def list_members(project_id, owner_id, keys):
+        """
+        Owner y miembros del proyecto con los campos `keys` (más status).
+
+        Solo se consultan las columnas pedidas: el owner en una consulta y los
+        empleados en otra con JOIN. Cacheado por proyecto y campos; se invalida
+        con el dominio 'members' de project_versions.
+        """
+        user_columns = [
+            getattr(User, key).label(key) for key in keys
+            if key in MEMBER_USER_COLUMNS and key not in ('id', 'status')
+        ]
+        members_data = []
+
+        # Owner verdadero del proyecto
+        if owner_id:
+            true_owner = db.session.query(User.id.label('id'), User.status.label('status'), *user_columns)\
+                .filter(User.id == owner_id).first()
+            if true_owner:
+                members_data.append(MemberService._serialize(true_owner, keys, {
+                    'role': 'OWNER',
+                    'joined_at': None,
+                    'is_owner': True,
+                    'membership_id': None,
+                    'chat_enabled': True
+                }))
+
+        # Empleados (sin el owner)
+        membership_columns = [
+            getattr(Membership, column).label(key) for key, column in MEMBER_MEMBERSHIP_COLUMNS.items()
+            if key in keys and key != 'status'
+        ]
+        rows = db.session.query(User.id.label('id'), Membership.status.label('status'), *user_columns, *membership_columns)\
+            .select_from(Membership)\
+            .join(User, User.id == Membership.user_id)\
+            .filter(Membership.project_id == project_id, User.id != owner_id)\
+            .all()
+        for row in rows:
+            members_data.append(MemberService._serialize(row, keys, {'is_owner': False}))
+        return members_data
@@ -7,8 +7,12 @@ class NotificationService:
     """Servicio para gestión de notificaciones"""
     
     @staticmethod
-    def get_user_notifications(user_id, project_id=None, unread_only=False, limit=None, offset=0):
-        """Obtener notificaciones del usuario"""
+    def get_user_notifications(user_id, project_id=None, unread_only=False, limit=None, offset=0, columns=None):
+        """
+        Obtener notificaciones del usuario
+
+        Con columns devuelve filas Core con esas columnas en lugar de objetos Notification.
+        """
         query = Notification.query.filter_by(user_id=user_id)
         
         if project_id:
@@ -23,6 +27,9 @@ class NotificationService:
             query = query.offset(int(offset))
         if limit:
             query = query.limit(int(limit))
+
+        if columns is not None:
+            query = query.with_entities(*columns)
         
         return query.all()
 
@@ -0,0 +1,305 @@
+import time
+from datetime import datetime
+from itertools import chain
+from sqlalchemy import event, select, func, literal, tuple_, and_, or_, exists
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.realtime.chat_tail_cache import chat_tail_cache
+from app.utils.transaction import after_commit
+from app.services.project_version_service import ProjectVersionService
+from app.models import (
+    Project, Membership, Task, Sprint, Invite, Notification, Comment, AuditLog,
+    TeamMessage, SprintSnapshot, TaskStatusTransition, TaskFlowDaily, ProjectDeletion,
+    SearchDocument, Tag, TaskTag, TeamMessageMention, ProjectVersion
+)
+
+
+_WRITABLE_KEY = 'writable_projects'
+
+
+class ProjectDeletingError(Exception):
+    """Escritura sobre un proyecto con la eliminación en curso"""
+
+    def __init__(self, message='El proyecto se está eliminando'):
+        super().__init__(message)
+
+
+class ProjectDeletionService:
+    """
+    Servicio para eliminar proyectos por lotes en segundo plano.
+
+    En lugar de la cascada del ORM (que carga cada hijo en la sesión), cada
+    tabla hija se vacía con DELETEs acotados por lotes y un commit por lote.
+
+    Mientras el proyecto está en 'deleting' no admite escrituras: una fila
+    creada después de que su paso ya corrió (p. ej. un comentario después de
+    'comments') haría fallar un paso posterior por FK. ensure_writable() es el
+    chequeo compartido: lo usan las rutas de escritura (409 PROJECT_DELETING),
+    los jobs del scheduler y, como red de seguridad, un before_flush que
+    rechaza cualquier fila del proyecto que la sesión vaya a escribir.
+    """
+
+    @staticmethod
+    def deleting_projects():
+        """Subconsulta de ids de proyectos en eliminación (para filtrar jobs y consultas)"""
+        return select(Project.id).where(Project.status == 'deleting')
+
+    @staticmethod
+    def ensure_writable(*project_ids):
+        """Lanzar ProjectDeletingError si alguno de los proyectos se está eliminando"""
+        ids = {project_id for project_id in project_ids if project_id}
+        if not ids:
+            return
+        deleting = db.session.query(Project.id).filter(Project.id.in_(ids), Project.status == 'deleting').first()
+        if deleting:
+            raise ProjectDeletingError()
+
+    @staticmethod
+    def user_project_deleting(user_id):
+        """
+        El proyecto del usuario se está eliminando.
+
+        Owner: su proyecto. Employee: la eliminación desactiva sus membresías,
+        así que cuenta si no tiene otra activa y alguna es de un proyecto en
+        eliminación (todavía puede tener tareas asignadas ahí).
+        """
+        member_of = select(Membership.project_id).where(Membership.user_id == user_id)
+        active_elsewhere = exists().where(Membership.user_id == user_id, Membership.status == 'active')
+        return db.session.query(Project.id).filter(
+            Project.status == 'deleting',
+            or_(
+                Project.owner_id == user_id,
+                and_(Project.id.in_(member_of), ~active_elsewhere)
+            )
+        ).first() is not None
+
+    @staticmethod
+    def _first_pending_step(steps):
+        """Índice del primer paso que todavía tiene filas (len(steps) si no queda ninguno)"""
+        for index, (_, table, condition, _) in enumerate(steps):
+            if db.session.execute(select(literal(1)).select_from(table).where(condition).limit(1)).first():
+                return index
+        return len(steps)
+
+    @staticmethod
+    def _steps(project_id):
+        """
+        Pasos en orden de dependencias: (nombre, tabla, condición, acción).
+
+        'detach' desvincula en lugar de borrar (los audit logs se conservan).
+        """
+        project_tasks = select(Task.id).where(Task.project_id == project_id)
+        return [
+            ('search_documents', SearchDocument.__table__, SearchDocument.__table__.c.project_id == project_id, 'delete'),
+            ('comments', Comment.__table__, Comment.__table__.c.task_id.in_(project_tasks), 'delete'),
+            ('team_message_mentions', TeamMessageMention.__table__, TeamMessageMention.__table__.c.project_id == project_id, 'delete'),
+            ('team_messages', TeamMessage.__table__, TeamMessage.__table__.c.project_id == project_id, 'delete'),
+            ('notifications', Notification.__table__, Notification.__table__.c.project_id == project_id, 'delete'),
+            ('task_status_transitions', TaskStatusTransition.__table__, TaskStatusTransition.__table__.c.project_id == project_id, 'delete'),
+            ('task_flow_daily', TaskFlowDaily.__table__, TaskFlowDaily.__table__.c.project_id == project_id, 'delete'),
+            ('sprint_snapshots', SprintSnapshot.__table__, SprintSnapshot.__table__.c.project_id == project_id, 'delete'),
+            ('task_tags', TaskTag.__table__, TaskTag.__table__.c.project_id == project_id, 'delete'),
+            ('tasks', Task.__table__, Task.__table__.c.project_id == project_id, 'delete'),
+            ('sprints', Sprint.__table__, Sprint.__table__.c.project_id == project_id, 'delete'),
+            ('tags', Tag.__table__, Tag.__table__.c.project_id == project_id, 'delete'),
+            ('invites', Invite.__table__, Invite.__table__.c.project_id == project_id, 'delete'),
+            ('memberships', Membership.__table__, Membership.__table__.c.project_id == project_id, 'delete'),
+            ('project_versions', ProjectVersion.__table__, ProjectVersion.__table__.c.project_id == project_id, 'delete'),
+            ('audit_logs', AuditLog.__table__, AuditLog.__table__.c.project_id == project_id, 'detach'),
+        ]
+
+    @staticmethod
+    def get_active_job(project_id):
+        return ProjectDeletion.query.filter(
+            ProjectDeletion.project_id == project_id,
+            ProjectDeletion.status.in_(('pending', 'running', 'failed'))
+        ).order_by(ProjectDeletion.created_at.desc()).first()
+
+    @staticmethod
+    def request_deletion(project, user_id, ip_address=None, user_agent=None):
+        """
+        Marcar el proyecto como 'deleting' y crear (o reanudar) su job de eliminación.
+
+        Las membresías se desactivan de inmediato para cortar el acceso de los
+        empleados mientras se borran los datos. No hace commit.
+
+        Returns:
+            (job, created)
+        """
+        job = ProjectDeletionService.get_active_job(project.id)
+        if job:
+            if job.status == 'failed':
+                # Reintento desde el primer paso con filas, no desde current_step: el
+                # fallo puede venir de filas que quedaron en un paso anterior
+                steps = ProjectDeletionService._steps(project.id)
+                index = ProjectDeletionService._first_pending_step(steps)
+                job.current_step = steps[index][0] if index < len(steps) else 'project'
+                job.status = 'pending'
+                job.error = None
+            return job, False
+
+        after_commit(chat_tail_cache.invalidate, project.id)
+        db.session.add(AuditLog(
+            user_id=user_id,
+            project_id=project.id,
+            action='project_deletion_requested',
+            entity_type='project',
+            entity_id=project.id,
+            details={'name': project.name},
+            ip_address=ip_address,
+            user_agent=user_agent
+        ))
+
+        details = {}
+        total = 0
+        for name, table, condition, _ in ProjectDeletionService._steps(project.id):
+            count = db.session.execute(select(func.count()).select_from(table).where(condition)).scalar() or 0
+            details[name] = {'total': count, 'processed': 0}
+            total += count
+
+        job = ProjectDeletion(
+            project_id=project.id,
+            project_name=project.name,
+            requested_by=user_id,
+            status='pending',
+            current_step=None,
+            total_rows=total,
+            processed_rows=0,
+            details=details
+        )
+        db.session.add(job)
+
+        project.status = 'deleting'
+        project.updated_at = datetime.utcnow()
+        Membership.query.filter_by(project_id=project.id).update({'status': 'disabled'}, synchronize_session=False)
+        ProjectVersionService.bump(project.id, 'settings', 'members')
+
+        db.session.flush()
+        return job, True
+
+    @staticmethod
+    def process(job_id, batch_size=1000, time_budget_seconds=2.0):
+        """
+        Avanzar la eliminación durante `time_budget_seconds` como máximo.
+
+        Cada lote es un DELETE (o UPDATE para 'detach') limitado a
+        `batch_size` filas, seguido de commit, así que ninguna transacción
+        crece con el tamaño del proyecto. Hace commit.
+
+        Returns:
+            True si el job terminó (completado o fallido), False si queda trabajo
+        """
+        job = ProjectDeletion.query.get(job_id)
+        if not job or job.status in ('completed', 'failed'):
+            return True
+
+        now = datetime.utcnow()
+        if job.status == 'pending':
+            job.status = 'running'
+            job.started_at = job.started_at or now
+            db.session.commit()
+
+        steps = ProjectDeletionService._steps(job.project_id)
+        names = [step[0] for step in steps]
+        index = names.index(job.current_step) if job.current_step in names else 0
+        deadline = time.monotonic() + time_budget_seconds
+
+        try:
+            while True:
+                while index < len(steps):
+                    name, table, condition, action = steps[index]
+                    # Lote por clave primaria (compuesta en tablas de asociación)
+                    key_columns = list(table.primary_key.columns)
+                    batch_keys = select(*key_columns).where(condition).limit(batch_size)
+                    key = key_columns[0] if len(key_columns) == 1 else tuple_(*key_columns)
+                    if action == 'detach':
+                        statement = table.update().where(key.in_(batch_keys)).values(project_id=None)
+                    else:
+                        statement = table.delete().where(key.in_(batch_keys))
+                    try:
+                        count = db.session.execute(statement).rowcount or 0
+                    except IntegrityError:
+                        # FK de filas rezagadas en un paso anterior (p. ej. un comentario de una
+                        # tarea): volver a ese paso en lugar de fallar
+                        db.session.rollback()
+                        earlier = ProjectDeletionService._first_pending_step(steps)
+                        if earlier >= index:
+                            raise
+                        index = earlier
+                        continue
+
+                    details = dict(job.details or {})
+                    step_details = dict(details.get(name) or {'total': 0, 'processed': 0})
+                    step_details['processed'] = step_details.get('processed', 0) + count
+                    details[name] = step_details
+                    job.details = details
+                    job.processed_rows = (job.processed_rows or 0) + count
+
+                    if count < batch_size:
+                        index += 1
+                    job.current_step = names[index] if index < len(steps) else 'project'
+                    db.session.commit()
+
+                    if time.monotonic() >= deadline and index < len(steps):
+                        return False
+
+                # Una escritura que pasó el chequeo justo antes del cambio a 'deleting'
+                # pudo dejar filas en un paso ya hecho: volver a ese paso antes del DELETE final
+                index = ProjectDeletionService._first_pending_step(steps)
+                if index == len(steps):
+                    break
+                job.current_step = names[index]
+
+            db.session.execute(Project.__table__.delete().where(Project.__table__.c.id == job.project_id))
+            job.status = 'completed'
+            job.current_step = None
+            job.finished_at = datetime.utcnow()
+            db.session.add(AuditLog(
+                user_id=job.requested_by,
+                project_id=None,
+                action='project_deleted',
+                entity_type='project',
+                entity_id=job.project_id,
+                details={'name': job.project_name, 'processed_rows': job.processed_rows}
+            ))
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            job = ProjectDeletion.query.get(job_id)
+            job.status = 'failed'
+            job.error = str(e)
+            db.session.commit()
+            raise
+
+
+@event.listens_for(db.session, 'before_flush')
+def _reject_writes_on_deleting_projects(session, flush_context, instances):
+    """Red de seguridad de ensure_writable para cualquier escritura ORM (rutas, servicios, jobs)"""
+    project_ids = set()
+    task_ids = set()
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    for obj in chain(session.new, modified, session.deleted):
+        # El propio job y el cambio de estado del proyecto no cuentan como escrituras de datos
+        if isinstance(obj, (Project, ProjectDeletion)):
+            continue
+        project_id = getattr(obj, 'project_id', None)
+        if project_id:
+            project_ids.add(project_id)
+        elif isinstance(obj, Comment) and obj.task_id:
+            task_ids.add(obj.task_id)
+
+    if task_ids:
+        project_ids.update(
+            row[0] for row in session.query(Task.project_id).filter(Task.id.in_(task_ids)).all()
+        )
+
+    # Un chequeo por transacción y proyecto
+    transaction = session.get_transaction()
+    cached = session.info.get(_WRITABLE_KEY)
+    checked = cached[1] if cached and cached[0] is transaction else set()
+    pending = project_ids - checked
+    if not pending:
+        return
+    ProjectDeletionService.ensure_writable(*pending)
+    session.info[_WRITABLE_KEY] = (transaction, checked | pending)
@@ -0,0 +1,72 @@
+import json
+import zlib
+from sqlalchemy import or_
+from app import db
+from app.models import Project, User, Membership, Sprint, Task, Comment, TeamMessage, Notification
+
+
+# Filas por lote del cursor del servidor
+EXPORT_YIELD_PER = 1000
+
+# Tamaño mínimo de cada bloque comprimido que se envía al cliente
+GZIP_FLUSH_BYTES = 64 * 1024
+
+
+class ProjectExportService:
+    """Servicio para exportar un proyecto completo como NDJSON en streaming"""
+
+    @staticmethod
+    def _entity_queries(project):
+        """(tipo, query) en el orden de exportación; las referencias van antes que quien las usa"""
+        member_ids = db.session.query(Membership.user_id).filter(Membership.project_id == project.id)
+        return [
+            ('user', User.query.filter(or_(User.id == project.owner_id, User.id.in_(member_ids))).order_by(User.id)),
+            ('membership', Membership.query.filter_by(project_id=project.id).order_by(Membership.id)),
+            ('sprint', Sprint.query.filter_by(project_id=project.id).order_by(Sprint.start_date, Sprint.id)),
+            ('task', Task.query.filter_by(project_id=project.id).order_by(Task.created_at, Task.id)),
+            ('comment', Comment.query.join(Task, Task.id == Comment.task_id)
+                .filter(Task.project_id == project.id).order_by(Comment.created_at, Comment.id)),
+            ('team_message', TeamMessage.query.filter_by(project_id=project.id).order_by(TeamMessage.created_at, TeamMessage.id)),
+            ('notification', Notification.query.filter_by(project_id=project.id).order_by(Notification.created_at, Notification.id)),
+        ]
+
+    @staticmethod
+    def iter_ndjson(project_id):
+        """
+        Generar el proyecto como líneas NDJSON ({"type": ..., "data": ...}).
+
+        Cada tabla se lee con un cursor del servidor (yield_per), así que la
+        memoria no crece con el tamaño del proyecto.
+        """
+        project = Project.query.get(project_id)
+        if not project:
+            return
+
+        yield ProjectExportService._line('project', project.to_dict())
+
+        # El mapa de identidad de la sesión es débil: las filas ya serializadas se liberan solas
+        for entity_type, query in ProjectExportService._entity_queries(project):
+            for row in query.yield_per(EXPORT_YIELD_PER):
+                yield ProjectExportService._line(entity_type, row.to_dict())
+
+    @staticmethod
+    def iter_gzip(chunks):
+        """Comprimir un iterable de líneas de texto como un único stream gzip"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        pending = []
+        pending_size = 0
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                pending.append(data)
+                pending_size += len(data)
+            if pending_size >= GZIP_FLUSH_BYTES:
+                yield b''.join(pending)
+                pending = []
+                pending_size = 0
+        pending.append(compressor.flush())
+        yield b''.join(pending)
+
+    @staticmethod
+    def _line(entity_type, data):
+        return json.dumps({'type': entity_type, 'data': data}, ensure_ascii=False, default=str) + '\n'
@@ -0,0 +1,17 @@
+from app.models import Project
+from app.schemas import ProjectSchema
+from app.cache import read_cache, project_tag
+
+
+class ProjectService:
+    """Servicio de lectura de proyectos"""
+
+    @staticmethod
+    @read_cache.cached('project_settings', tags=lambda project_id: [project_tag(project_id, 'settings')])
+    def get_settings(project_id):
+        """
+        Proyecto serializado para GET /api/projects/settings, o None si no existe.
+        Cacheado; se invalida con el dominio 'settings' de project_versions.
+        """
+        project = Project.query.get(project_id)
+        return ProjectSchema().dump(project) if project else None
@@ -0,0 +1,91 @@
+from datetime import datetime
+from sqlalchemy import event, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.cache import read_cache, project_tag
+from app.models import ProjectVersion
+from app.utils.transaction import after_commit
+
+VERSION_DOMAINS = ('tasks', 'members', 'sprints', 'chat', 'settings')
+
+_PENDING_KEY = 'project_version_bumps'
+
+
+class ProjectVersionService:
+    """
+    Contadores de versión por proyecto (project_versions).
+
+    bump() solo anota el dominio en la sesión; el UPDATE se ejecuta una vez por
+    proyecto justo antes del commit, dentro de la misma transacción. Así varias
+    escrituras de una petición suman un solo incremento y el lock de la fila se
+    mantiene lo mínimo. Si la transacción hace rollback, no se incrementa nada.
+
+    Los mismos dominios son las etiquetas de la caché de lecturas: al confirmar
+    la transacción se invalidan las entradas project:<id>:<dominio>.
+    """
+
+    @staticmethod
+    def bump(project_id, *domains):
+        """Marcar dominios del proyecto como modificados. No hace commit."""
+        if not project_id:
+            return
+        for domain in domains:
+            if domain not in VERSION_DOMAINS:
+                raise ValueError(f'Dominio de versión inválido: {domain}')
+        pending = db.session().info.setdefault(_PENDING_KEY, {})
+        pending.setdefault(project_id, set()).update(domains)
+
+    @staticmethod
+    def _increment(session, project_id, domains):
+        table = ProjectVersion.__table__
+        now = datetime.utcnow()
+        values = {domain: table.c[domain] + 1 for domain in domains}
+        values['updated_at'] = now
+        result = session.execute(update(table).where(table.c.project_id == project_id).values(values))
+        if result.rowcount:
+            return
+
+        # Primera escritura del proyecto: crear la fila
+        row = {domain: 0 for domain in VERSION_DOMAINS}
+        row.update({domain: 1 for domain in domains})
+        try:
+            with session.begin_nested():
+                session.execute(table.insert().values(project_id=project_id, updated_at=now, **row))
+        except IntegrityError:
+            # Otra transacción la creó en paralelo
+            session.execute(update(table).where(table.c.project_id == project_id).values(values))
+
+    @staticmethod
+    def get(project_id):
+        """Versiones actuales del proyecto (ceros si nunca se escribió)"""
+        table = ProjectVersion.__table__
+        row = db.session.query(*[table.c[domain] for domain in VERSION_DOMAINS])\
+            .filter(table.c.project_id == project_id).first() if project_id else None
+        if row is None:
+            return {domain: 0 for domain in VERSION_DOMAINS}
+        return dict(zip(VERSION_DOMAINS, row))
+
+
+@event.listens_for(db.session, 'before_commit')
+def _apply_pending_bumps(session):
+    # before_commit también se emite al liberar un savepoint: los bumps esperan al commit externo
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    # Orden fijo entre proyectos para no cruzar locks
+    tags = []
+    for project_id in sorted(pending):
+        domains = sorted(pending[project_id])
+        ProjectVersionService._increment(session, project_id, domains)
+        tags.extend(project_tag(project_id, domain) for domain in domains)
+    after_commit(read_cache.invalidate_tags, *tags)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_pending_bumps(session, previous_transaction):
+    # Igual que after_commit: un savepoint deshecho no descarta los bumps de la transacción externa
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
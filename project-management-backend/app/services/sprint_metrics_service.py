@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, case
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Sprint, Task, SprintSnapshot
+from app.services.project_deletion_service import ProjectDeletionService
+
+
+class SprintMetricsService:
+    """Servicio para series precalculadas de burndown y velocidad de sprints"""
+
+    @staticmethod
+    def _count_sprint_tasks(sprint_id):
+        total, completed = db.session.query(
+            func.count(Task.id),
+            func.coalesce(func.sum(case((Task.status == 'done', 1), else_=0)), 0)
+        ).filter(Task.sprint_id == sprint_id).one()
+        return int(total or 0), int(completed or 0)
+
+    @staticmethod
+    def snapshot_sprint(sprint_id, project_id, day=None):
+        """
+        Registrar (o actualizar) la foto del día para un sprint.
+        Una sola consulta agregada sobre tasks.sprint_id (indexado). No hace commit.
+        """
+        day = day or datetime.utcnow().date()
+        total, completed = SprintMetricsService._count_sprint_tasks(sprint_id)
+        values = {
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'remaining_tasks': total - completed
+        }
+
+        updated = SprintSnapshot.query.filter_by(sprint_id=sprint_id, day=day).update(
+            values, synchronize_session=False
+        )
+        if updated:
+            return
+
+        try:
+            with db.session.begin_nested():
+                db.session.add(SprintSnapshot(sprint_id=sprint_id, project_id=project_id, day=day, **values))
+        except IntegrityError:
+            # Otra petición insertó la foto del día en paralelo
+            SprintSnapshot.query.filter_by(sprint_id=sprint_id, day=day).update(
+                values, synchronize_session=False
+            )
+
+    @staticmethod
+    def refresh_sprints(sprint_ids):
+        """
+        Actualizar la foto de hoy de los sprints afectados por un cambio de tareas.
+        Ignora sprints cerrados (su serie queda congelada al cierre). No hace commit.
+        """
+        ids = {sprint_id for sprint_id in sprint_ids if sprint_id}
+        if not ids:
+            return
+        rows = db.session.query(Sprint.id, Sprint.project_id).filter(
+            Sprint.id.in_(ids),
+            Sprint.status != 'closed'
+        ).all()
+        for sprint_id, project_id in rows:
+            SprintMetricsService.snapshot_sprint(sprint_id, project_id)
+
+    @staticmethod
+    def snapshot_active_sprints(day=None):
+        """Foto diaria de todos los sprints activos (salvo proyectos en eliminación). No hace commit."""
+        rows = db.session.query(Sprint.id, Sprint.project_id).filter(
+            Sprint.status == 'active',
+            Sprint.project_id.not_in(ProjectDeletionService.deleting_projects())
+        ).all()
+        for sprint_id, project_id in rows:
+            SprintMetricsService.snapshot_sprint(sprint_id, project_id, day)
+        return len(rows)
+
+    @staticmethod
+    def get_burndown(sprint):
+        """
+        Serie diaria de burndown de un sprint a partir de las fotos guardadas.
+
+        Los días sin foto repiten el último valor conocido. El costo depende de la
+        duración del sprint, no de la antigüedad del proyecto.
+        """
+        snapshots = SprintSnapshot.query.filter_by(sprint_id=sprint.id).order_by(SprintSnapshot.day.asc()).all()
+        by_day = {s.day: s for s in snapshots}
+
+        start = sprint.start_date.date()
+        end = sprint.end_date.date()
+        last_day = min(end, datetime.utcnow().date())
+        if snapshots:
+            last_day = max(last_day, snapshots[-1].day)
+
+        series = []
+        last = None
+        day = start
+        while day <= last_day:
+            snapshot = by_day.get(day, last)
+            if snapshot is not None:
+                last = snapshot
+                series.append({
+                    'date': day.isoformat(),
+                    'total': snapshot.total_tasks,
+                    'completed': snapshot.completed_tasks,
+                    'remaining': snapshot.remaining_tasks
+                })
+            day += timedelta(days=1)
+
+        # Línea ideal: del total inicial a cero en la fecha de fin
+        initial_total = series[0]['total'] if series else 0
+        span = max((end - start).days, 1)
+        ideal = []
+        day = start
+        while day <= end:
+            elapsed = (day - start).days
+            ideal.append({
+                'date': day.isoformat(),
+                'remaining': round(initial_total * (1 - elapsed / span), 2)
+            })
+            day += timedelta(days=1)
+
+        return {'series': series, 'ideal': ideal}
+
+    @staticmethod
+    def get_velocity(project_id, limit=6):
+        """
+        Velocidad de los últimos `limit` sprints cerrados del proyecto,
+        usando la última foto (la de cierre) de cada sprint.
+        """
+        sprints = Sprint.query.filter_by(project_id=project_id, status='closed')\
+            .order_by(Sprint.end_date.desc())\
+            .limit(limit).all()
+        if not sprints:
+            return {'sprints': [], 'average_completed': 0}
+
+        sprint_ids = [s.id for s in sprints]
+        last_days = db.session.query(
+            SprintSnapshot.sprint_id,
+            func.max(SprintSnapshot.day).label('day')
+        ).filter(SprintSnapshot.sprint_id.in_(sprint_ids))\
+            .group_by(SprintSnapshot.sprint_id)\
+            .subquery()
+
+        finals = db.session.query(SprintSnapshot).join(
+            last_days,
+            (SprintSnapshot.sprint_id == last_days.c.sprint_id) & (SprintSnapshot.day == last_days.c.day)
+        ).all()
+        final_by_sprint = {s.sprint_id: s for s in finals}
+
+        items = []
+        for sprint in reversed(sprints):
+            final = final_by_sprint.get(sprint.id)
+            items.append({
+                'sprint_id': sprint.id,
+                'name': sprint.name,
+                'start_date': sprint.start_date.isoformat() if sprint.start_date else None,
+                'end_date': sprint.end_date.isoformat() if sprint.end_date else None,
+                'total': final.total_tasks if final else 0,
+                'completed': final.completed_tasks if final else 0
+            })
+
+        average = round(sum(i['completed'] for i in items) / len(items), 2)
+        return {'sprints': items, 'average_completed': average}
@@ -0,0 +1,115 @@
+from datetime import datetime
+from app import db
+from app.models import Sprint, Task, Project, Membership, AuditLog
+from app.schemas import SprintSchema
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.services.project_version_service import ProjectVersionService
+from app.services.project_deletion_service import ProjectDeletionService
+from app.realtime.notifications_hub import notifications_hub
+from app.utils.transaction import after_commit
+from app.cache import read_cache, project_tag
+
+
+class SprintService:
+    """Servicio para gestión del ciclo de vida de sprints"""
+
+    @staticmethod
+    def close_sprint(sprint_id, now=None):
+        """
+        Cerrar un sprint activo cuya fecha de fin ya pasó.
+
+        El UPDATE es condicional (status='active' y end_date vencida), por lo que
+        aunque varios procesos o jobs lo intenten, solo uno cierra el sprint
+        y publica el evento. No hace commit.
+
+        Returns:
+            Sprint cerrado, o None si no había nada que cerrar
+        """
+        now = now or datetime.utcnow()
+        closed = Sprint.query.filter(
+            Sprint.id == sprint_id,
+            Sprint.status == 'active',
+            Sprint.end_date <= now,
+            # Un proyecto en eliminación no admite escrituras (ni foto final ni audit log)
+            Sprint.project_id.not_in(ProjectDeletionService.deleting_projects())
+        ).update({'status': 'closed', 'updated_at': now}, synchronize_session=False)
+
+        if closed != 1:
+            return None
+
+        sprint = Sprint.query.get(sprint_id)
+        db.session.refresh(sprint)
+        # Foto final antes de desvincular las tareas del sprint
+        SprintMetricsService.snapshot_sprint(sprint.id, sprint.project_id)
+        Task.query.filter_by(project_id=sprint.project_id, sprint_id=sprint.id).update(
+            {'sprint_id': None}, synchronize_session=False
+        )
+
+        db.session.add(AuditLog(
+            user_id=None,
+            project_id=sprint.project_id,
+            action='sprint_auto_closed',
+            entity_type='sprint',
+            entity_id=sprint.id,
+            details={'name': sprint.name, 'end_date': sprint.end_date.isoformat()}
+        ))
+
+        ProjectVersionService.bump(sprint.project_id, 'sprints', 'tasks')
+        SprintService.publish_sprint_event(sprint.project_id, 'sprint_closed', sprint.to_dict())
+        return sprint
+
+    @staticmethod
+    def close_expired_sprints(project_id=None, now=None):
+        """
+        Cerrar todos los sprints activos vencidos (de un proyecto o de todos).
+        No hace commit.
+
+        Returns:
+            Lista de sprints cerrados
+        """
+        now = now or datetime.utcnow()
+        query = db.session.query(Sprint.id).filter(
+            Sprint.status == 'active',
+            Sprint.end_date <= now,
+            Sprint.project_id.not_in(ProjectDeletionService.deleting_projects())
+        )
+        if project_id:
+            query = query.filter(Sprint.project_id == project_id)
+
+        closed = []
+        for (sprint_id,) in query.all():
+            sprint = SprintService.close_sprint(sprint_id, now)
+            if sprint:
+                closed.append(sprint)
+        return closed
+
+    @staticmethod
+    @read_cache.cached('sprints', tags=lambda project_id, status=None: [project_tag(project_id, 'sprints')])
+    def list_sprints(project_id, status=None):
+        """Sprints del proyecto serializados (más recientes primero). Cacheado; se invalida con 'sprints'."""
+        query = Sprint.query.filter_by(project_id=project_id)
+        if status:
+            query = query.filter_by(status=status)
+        return SprintSchema(many=True).dump(query.order_by(Sprint.start_date.desc()).all())
+
+    @staticmethod
+    def get_project_audience(project_id):
+        """IDs de usuarios que reciben eventos del proyecto (Owner + miembros activos)"""
+        project = Project.query.get(project_id)
+        rows = db.session.query(Membership.user_id).filter_by(project_id=project_id, status='active').all()
+        user_ids = {row[0] for row in rows}
+        if project:
+            user_ids.add(project.owner_id)
+        return user_ids
+
+    @staticmethod
+    def publish_sprint_event(project_id, event_type, sprint_data):
+        """Publicar (tras el commit) un evento de sprint a todos los miembros del proyecto"""
+        user_ids = SprintService.get_project_audience(project_id)
+        after_commit(notifications_hub.publish_many, user_ids, {
+            'event': {
+                'type': event_type,
+                'project_id': project_id,
+                'sprint': sprint_data
+            }
+        })
@@ -0,0 +1,172 @@
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Tag, TaskTag, Task
+
+TAG_MAX_LENGTH = 100
+TAG_FILTER_MODES = ('and', 'or')
+TAG_CLOUD_LIMIT = 100
+
+
+class TagService:
+    """Servicio para el índice normalizado de etiquetas (tags + task_tags)"""
+
+    @staticmethod
+    def normalize(value):
+        """'  Front-End ' -> 'front-end'. Devuelve None si queda vacía."""
+        if value is None:
+            return None
+        name = str(value).strip().lower()[:TAG_MAX_LENGTH]
+        return name or None
+
+    @staticmethod
+    def normalize_list(values):
+        """Etiquetas normalizadas sin duplicados: {name: label} en el orden original"""
+        result = {}
+        for value in values or []:
+            name = TagService.normalize(value)
+            if name and name not in result:
+                result[name] = str(value).strip()[:TAG_MAX_LENGTH]
+        return result
+
+    @staticmethod
+    def ensure_tags(project_id, labels_by_name):
+        """
+        Obtener (o crear) las etiquetas del proyecto. No hace commit.
+
+        Returns:
+            dict {name: tag_id}
+        """
+        if not labels_by_name:
+            return {}
+        names = list(labels_by_name)
+        ids = dict(db.session.query(Tag.name, Tag.id).filter(
+            Tag.project_id == project_id,
+            Tag.name.in_(names)
+        ).all())
+
+        for name in names:
+            if name in ids:
+                continue
+            try:
+                with db.session.begin_nested():
+                    tag = Tag(project_id=project_id, name=name, label=labels_by_name[name])
+                    db.session.add(tag)
+                ids[name] = tag.id
+            except IntegrityError:
+                # Otra petición creó la etiqueta en paralelo
+                ids[name] = db.session.query(Tag.id).filter_by(project_id=project_id, name=name).scalar()
+        return ids
+
+    @staticmethod
+    def sync_task_tags(task):
+        """Alinear task_tags con Task.tags de una tarea. No hace commit."""
+        TagService.sync_tasks([task])
+
+    @staticmethod
+    def sync_tasks(tasks):
+        """
+        Alinear task_tags con Task.tags de varias tareas del mismo proyecto.
+        Solo se insertan y borran las asociaciones que cambiaron. No hace commit.
+        """
+        if not tasks:
+            return
+        project_id = tasks[0].project_id
+        wanted_by_task = {task.id: TagService.normalize_list(task.tags) for task in tasks}
+
+        labels = {}
+        for wanted in wanted_by_task.values():
+            for name, label in wanted.items():
+                labels.setdefault(name, label)
+        tag_ids = TagService.ensure_tags(project_id, labels)
+
+        current = {}
+        rows = db.session.query(TaskTag.task_id, TaskTag.tag_id).filter(TaskTag.task_id.in_(list(wanted_by_task))).all()
+        for task_id, tag_id in rows:
+            current.setdefault(task_id, set()).add(tag_id)
+
+        to_insert = []
+        for task_id, wanted in wanted_by_task.items():
+            wanted_ids = {tag_ids[name] for name in wanted}
+            existing = current.get(task_id, set())
+            removed = existing - wanted_ids
+            if removed:
+                TaskTag.query.filter(
+                    TaskTag.task_id == task_id,
+                    TaskTag.tag_id.in_(removed)
+                ).delete(synchronize_session=False)
+            to_insert.extend(
+                {'tag_id': tag_id, 'task_id': task_id, 'project_id': project_id}
+                for tag_id in wanted_ids - existing
+            )
+
+        if to_insert:
+            db.session.execute(TaskTag.__table__.insert(), to_insert)
+
+    @staticmethod
+    def insert_for_rows(project_id, rows):
+        """Crear las asociaciones de tareas recién insertadas (filas dict de importación). No hace commit."""
+        wanted_by_task = {row['id']: TagService.normalize_list(row.get('tags')) for row in rows}
+        labels = {}
+        for wanted in wanted_by_task.values():
+            for name, label in wanted.items():
+                labels.setdefault(name, label)
+        if not labels:
+            return
+        tag_ids = TagService.ensure_tags(project_id, labels)
+        db.session.execute(TaskTag.__table__.insert(), [
+            {'tag_id': tag_ids[name], 'task_id': task_id, 'project_id': project_id}
+            for task_id, wanted in wanted_by_task.items()
+            for name in wanted
+        ])
+
+    @staticmethod
+    def remove_tasks(task_ids):
+        """Quitar las asociaciones de tareas que se van a borrar. No hace commit."""
+        task_ids = list(task_ids)
+        if task_ids:
+            TaskTag.query.filter(TaskTag.task_id.in_(task_ids)).delete(synchronize_session=False)
+
+    @staticmethod
+    def apply_filter(query, project_id, tags, mode='and'):
+        """
+        Filtrar `query` (sobre Task) por etiquetas.
+
+        'and': la tarea debe tener todas las etiquetas; 'or': al menos una.
+        Se resuelve con la PK (tag_id, task_id) sin leer Task.tags.
+        """
+        names = list(TagService.normalize_list(tags))
+        if not names:
+            return query
+
+        tag_ids = [row[0] for row in db.session.query(Tag.id).filter(
+            Tag.project_id == project_id,
+            Tag.name.in_(names)
+        ).all()]
+
+        if not tag_ids or (mode == 'and' and len(tag_ids) < len(names)):
+            # Alguna etiqueta no existe: no hay tareas que cumplan el filtro
+            return query.filter(db.false())
+
+        matching = select(TaskTag.task_id).where(TaskTag.tag_id.in_(tag_ids))
+        if mode == 'and' and len(tag_ids) > 1:
+            matching = matching.group_by(TaskTag.task_id).having(func.count() == len(tag_ids))
+        return query.filter(Task.id.in_(matching))
+
+    @staticmethod
+    def get_tag_cloud(project_id, assigned_to=None, limit=TAG_CLOUD_LIMIT):
+        """
+        Etiquetas del proyecto con la cantidad de tareas de cada una.
+
+        Con assigned_to se cuentan solo las tareas de ese usuario (vista de empleado).
+        """
+        count = func.count(TaskTag.task_id).label('count')
+        query = db.session.query(Tag.name, Tag.label, count)\
+            .join(TaskTag, TaskTag.tag_id == Tag.id)\
+            .filter(TaskTag.project_id == project_id)
+        if assigned_to:
+            query = query.join(Task, Task.id == TaskTag.task_id).filter(Task.assigned_to == assigned_to)
+        rows = query.group_by(Tag.id, Tag.name, Tag.label)\
+            .order_by(count.desc(), Tag.name.asc())\
+            .limit(limit).all()
+        return [{'name': name, 'label': label, 'count': total} for name, label, total in rows]
@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from datetime import datetime
+from app import db
+from app.models import Task, Sprint, Membership, Notification, AuditLog, Comment
+from app.realtime.notifications_hub import notifications_hub
+from app.search import SearchIndex
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.services.task_flow_service import TaskFlowService
+from app.services.tag_service import TagService
+from app.services.project_version_service import ProjectVersionService
+from app.utils.transaction import after_commit
+
+
+class TaskBulkService:
+    """Servicio para operaciones masivas sobre tareas (POST /api/tasks/bulk)"""
+
+    @staticmethod
+    def _validate_references(project, operations):
+        """Validar asignados y sprints de todo el lote con una consulta por tipo"""
+        payloads = [op['data'] for op in operations if op['op'] in ('create', 'update')]
+
+        assignees = {data['assigned_to'] for data in payloads if data.get('assigned_to')}
+        if assignees:
+            rows = db.session.query(Membership.user_id).filter(
+                Membership.project_id == project.id,
+                Membership.status == 'active',
+                Membership.user_id.in_(assignees)
+            ).all()
+            invalid = assignees - {row[0] for row in rows}
+            if invalid:
+                raise ValueError(f'Usuarios que no son miembros del proyecto: {", ".join(sorted(invalid))}')
+
+        sprint_ids = {data['sprint_id'] for data in payloads if data.get('sprint_id')}
+        if sprint_ids:
+            if not project.sprint_enabled:
+                raise ValueError('Sprints no habilitados para este proyecto')
+            sprints = Sprint.query.filter(Sprint.id.in_(sprint_ids), Sprint.project_id == project.id).all()
+            if len(sprints) != len(sprint_ids):
+                raise ValueError('Sprint inválido para este proyecto')
+            if any(s.status == 'closed' for s in sprints):
+                raise ValueError('No se pueden asignar tareas a un sprint cerrado')
+
+    @staticmethod
+    def apply(project, operations, user, ip_address=None, user_agent=None):
+        """
+        Ejecutar un lote de operaciones (create, update, delete) en una sola transacción.
+
+        Los permisos y referencias se validan una vez para todo el lote. Cada
+        update se aplica con un UPDATE por conjunto de tareas. Las notificaciones
+        se agrupan en una por destinatario. No hace commit.
+
+        Raises:
+            LookupError: si alguna tarea no existe en el proyecto
+            ValueError: si alguna operación es inválida
+
+        Returns:
+            dict con las tareas creadas y los conteos de actualizadas y eliminadas
+        """
+        now = datetime.utcnow()
+
+        task_ids = {task_id for op in operations for task_id in op.get('task_ids') or []}
+        tasks = {}
+        if task_ids:
+            tasks = {
+                t.id: t for t in Task.query.filter(Task.id.in_(task_ids), Task.project_id == project.id).all()
+            }
+        missing = task_ids - tasks.keys()
+        if missing:
+            raise LookupError(f'Tareas no encontradas: {", ".join(sorted(missing))}')
+
+        TaskBulkService._validate_references(project, operations)
+
+        created = []
+        updated_ids = set()
+        deleted_ids = set()
+        touched_sprints = set()
+        # destinatario -> [(tipo, tarea)], en orden de llegada
+        events = OrderedDict()
+
+        def notify(recipient, notification_type, task):
+            if recipient and recipient != user.id:
+                events.setdefault(recipient, []).append((notification_type, task))
+
+        for op in operations:
+            ids = list(dict.fromkeys(op.get('task_ids') or []))
+            if deleted_ids.intersection(ids):
+                raise ValueError('Una operación hace referencia a una tarea eliminada en el mismo lote')
+
+            if op['op'] == 'create':
+                task = Task(project_id=project.id, created_by=user.id, **op['data'])
+                if task.status == 'done':
+                    task.completed_at = now
+                db.session.add(task)
+                created.append(task)
+                continue
+
+            if op['op'] == 'delete':
+                for task_id in ids:
+                    task = tasks[task_id]
+                    TaskFlowService.record_transition(task, task.status, None, user.id, now)
+                    touched_sprints.add(task.sprint_id)
+                SearchIndex.remove_tasks(ids)
+                TagService.remove_tasks(ids)
+                Comment.query.filter(Comment.task_id.in_(ids)).delete(synchronize_session=False)
+                Task.query.filter(Task.id.in_(ids)).delete()
+                deleted_ids.update(ids)
+                updated_ids.difference_update(ids)
+                db.session.add(AuditLog(
+                    user_id=user.id,
+                    project_id=project.id,
+                    action='tasks_bulk_deleted',
+                    entity_type='task',
+                    details={'task_ids': ids},
+                    ip_address=ip_address,
+                    user_agent=user_agent
+                ))
+                continue
+
+            # update
+            values = dict(op['data'])
+            previous = {task_id: (tasks[task_id].status, tasks[task_id].assigned_to, tasks[task_id].sprint_id) for task_id in ids}
+
+            if values.get('status') == 'done':
+                Task.query.filter(Task.id.in_(ids), Task.status != 'done').update({'completed_at': now})
+            Task.query.filter(Task.id.in_(ids)).update({**values, 'updated_at': now})
+
+            for task_id in ids:
+                task = tasks[task_id]
+                old_status, old_assignee, old_sprint = previous[task_id]
+                TaskFlowService.record_transition(task, old_status, task.status, user.id, now)
+                if 'sprint_id' in values or 'status' in values:
+                    touched_sprints.update((old_sprint, task.sprint_id))
+                if 'assigned_to' in values and old_assignee != task.assigned_to:
+                    notify(task.assigned_to, 'task_assigned', task)
+                    notify(old_assignee, 'task_unassigned', task)
+                else:
+                    notify(task.assigned_to, 'task_updated', task)
+
+            if 'assigned_to' in values or 'tags' in values:
+                SearchIndex.index_tasks([tasks[task_id] for task_id in ids])
+            if 'tags' in values:
+                TagService.sync_tasks([tasks[task_id] for task_id in ids])
+
+            updated_ids.update(ids)
+            db.session.add(AuditLog(
+                user_id=user.id,
+                project_id=project.id,
+                action='tasks_bulk_updated',
+                entity_type='task',
+                details={'task_ids': ids, 'fields': list(values.keys())},
+                ip_address=ip_address,
+                user_agent=user_agent
+            ))
+
+        if created:
+            db.session.flush()
+            SearchIndex.index_tasks(created)
+            TagService.sync_tasks([task for task in created if task.tags])
+            for task in created:
+                TaskFlowService.record_transition(task, None, task.status, user.id, now)
+                touched_sprints.add(task.sprint_id)
+                notify(task.assigned_to, 'task_assigned', task)
+            db.session.add(AuditLog(
+                user_id=user.id,
+                project_id=project.id,
+                action='tasks_bulk_created',
+                entity_type='task',
+                details={'task_ids': [t.id for t in created]},
+                ip_address=ip_address,
+                user_agent=user_agent
+            ))
+
+        SprintMetricsService.refresh_sprints(touched_sprints)
+        ProjectVersionService.bump(project.id, 'tasks')
+        notifications = TaskBulkService._create_notifications(project.id, user, events)
+
+        return {
+            'created': created,
+            'updated': len(updated_ids),
+            'deleted': len(deleted_ids),
+            'notifications': len(notifications)
+        }
+
+    @staticmethod
+    def _create_notifications(project_id, user, events):
+        """Una notificación por destinatario con el resumen de sus cambios, publicada tras el commit"""
+        notifications = []
+        for recipient, items in events.items():
+            # Una misma tarea puede aparecer en varias operaciones del lote
+            unique = OrderedDict()
+            for notification_type, task in items:
+                unique[task.id] = (notification_type, task)
+            items = list(unique.values())
+
+            if len(items) == 1:
+                notification_type, task = items[0]
+                if notification_type == 'task_assigned':
+                    message = f'{user.name} te asignó “{task.title}”.'
+                elif notification_type == 'task_unassigned':
+                    message = f'La tarea “{task.title}” fue reasignada.'
+                else:
+                    message = f'{user.name} actualizó “{task.title}”.'
+                entity_id = task.id
+            else:
+                notification_type = 'task_updated'
+                titles = ', '.join(f'“{task.title}”' for _, task in items[:3])
+                rest = len(items) - 3
+                message = f'{user.name} actualizó {len(items)} tareas: {titles}'
+                message += f' y {rest} más.' if rest > 0 else '.'
+                entity_id = None
+
+            notifications.append(Notification(
+                user_id=recipient,
+                project_id=project_id,
+                type=notification_type,
+                message=message,
+                entity_type='task',
+                entity_id=entity_id
+            ))
+
+        if notifications:
+            db.session.add_all(notifications)
+            db.session.flush()
+            after_commit(TaskBulkService._publish, [(n.user_id, n.to_dict()) for n in notifications])
+        return notifications
+
+    @staticmethod
+    def _publish(items):
+        for user_id, notification in items:
+            notifications_hub.publish(user_id, {'notification': notification})
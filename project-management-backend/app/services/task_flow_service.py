@@ -0,0 +1,265 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, time
+from sqlalchemy import func
+from app import db
+from app.models import TaskStatusTransition, TaskFlowDaily
+from app.services.project_deletion_service import ProjectDeletionService
+
+
+TASK_STATUSES = ('pending', 'in_progress', 'in_review', 'blocked', 'done')
+
+# Estados que marcan el inicio del trabajo (para el cycle time)
+ACTIVE_STATUSES = ('in_progress', 'in_review', 'blocked')
+
+# Rangos (en días) del histograma de cycle/lead time
+HISTOGRAM_BUCKETS = (1, 2, 3, 5, 8, 13, 21)
+
+
+class TaskFlowService:
+    """Servicio para el historial de estados y métricas de flujo (CFD, cycle y lead time)"""
+
+    @staticmethod
+    def record_transition(task, from_status, to_status, user_id=None, now=None):
+        """
+        Registrar un cambio de estado de la tarea. No hace commit.
+
+        Al pasar a 'done' se guardan el lead time (desde la creación) y el cycle
+        time (desde la primera vez que la tarea entró en un estado activo).
+        """
+        if from_status == to_status:
+            return None
+
+        now = now or datetime.utcnow()
+        lead_seconds = None
+        cycle_seconds = None
+        if to_status == 'done':
+            if task.created_at:
+                lead_seconds = max(int((now - task.created_at).total_seconds()), 0)
+            if from_status is None:
+                cycle_seconds = 0
+            else:
+                started_at = db.session.query(func.min(TaskStatusTransition.created_at)).filter(
+                    TaskStatusTransition.task_id == task.id,
+                    TaskStatusTransition.to_status.in_(ACTIVE_STATUSES)
+                ).scalar()
+                if started_at:
+                    cycle_seconds = max(int((now - started_at).total_seconds()), 0)
+
+        transition = TaskStatusTransition(
+            task_id=task.id,
+            project_id=task.project_id,
+            changed_by=user_id,
+            from_status=from_status,
+            to_status=to_status,
+            lead_seconds=lead_seconds,
+            cycle_seconds=cycle_seconds,
+            created_at=now
+        )
+        db.session.add(transition)
+        return transition
+
+    @staticmethod
+    def _rolled_until():
+        """Último día consolidado en task_flow_daily (None si aún no hay rollups)"""
+        return db.session.query(func.max(TaskFlowDaily.day)).scalar()
+
+    @staticmethod
+    def _apply(counts, from_status, to_status):
+        if from_status:
+            counts[from_status] = counts.get(from_status, 0) - 1
+        if to_status:
+            counts[to_status] = counts.get(to_status, 0) + 1
+
+    @staticmethod
+    def _latest_counts(project_ids, before_day=None):
+        """
+        Conteos de la última fila consolidada por proyecto (opcionalmente antes de un día).
+
+        Returns:
+            dict project_id -> {status: count}
+        """
+        if not project_ids:
+            return {}
+        last_day = db.session.query(
+            TaskFlowDaily.project_id,
+            func.max(TaskFlowDaily.day).label('day')
+        ).filter(TaskFlowDaily.project_id.in_(project_ids))
+        if before_day is not None:
+            last_day = last_day.filter(TaskFlowDaily.day < before_day)
+        last_day = last_day.group_by(TaskFlowDaily.project_id).subquery()
+
+        rows = db.session.query(TaskFlowDaily).join(
+            last_day,
+            (TaskFlowDaily.project_id == last_day.c.project_id) & (TaskFlowDaily.day == last_day.c.day)
+        ).all()
+
+        result = {}
+        for row in rows:
+            result.setdefault(row.project_id, {})[row.status] = row.task_count
+        return result
+
+    @staticmethod
+    def rollup(until_day=None):
+        """
+        Consolidar en task_flow_daily los días completos aún no procesados.
+
+        Solo lee las transiciones posteriores al último día consolidado, así que
+        el costo depende de los días pendientes y no de la antigüedad de los
+        proyectos. No hace commit.
+
+        Returns:
+            Número de filas escritas
+        """
+        until_day = until_day or datetime.utcnow().date()
+        rolled_until = TaskFlowService._rolled_until()
+
+        query = db.session.query(
+            TaskStatusTransition.project_id,
+            TaskStatusTransition.created_at,
+            TaskStatusTransition.from_status,
+            TaskStatusTransition.to_status
+        ).filter(TaskStatusTransition.created_at < datetime.combine(until_day, time.min))
+        if rolled_until is not None:
+            query = query.filter(
+                TaskStatusTransition.created_at >= datetime.combine(rolled_until + timedelta(days=1), time.min)
+            )
+
+        # project_id -> day -> [(from, to)]
+        pending = defaultdict(lambda: defaultdict(list))
+        for project_id, created_at, from_status, to_status in query.yield_per(1000):
+            pending[project_id][created_at.date()].append((from_status, to_status))
+
+        # Los proyectos en eliminación no admiten escrituras: sus días no se consolidan
+        for (project_id,) in db.session.execute(ProjectDeletionService.deleting_projects()).all():
+            pending.pop(project_id, None)
+
+        if not pending:
+            return 0
+
+        base = TaskFlowService._latest_counts(list(pending.keys()))
+        rows = []
+        for project_id, days in pending.items():
+            counts = dict(base.get(project_id, {}))
+            for day in sorted(days):
+                for from_status, to_status in days[day]:
+                    TaskFlowService._apply(counts, from_status, to_status)
+                for status in TASK_STATUSES:
+                    rows.append({
+                        'project_id': project_id,
+                        'day': day,
+                        'status': status,
+                        'task_count': counts.get(status, 0)
+                    })
+
+        db.session.execute(TaskFlowDaily.__table__.insert(), rows)
+        return len(rows)
+
+    @staticmethod
+    def get_cumulative_flow(project_id, start, end):
+        """
+        Serie diaria del flujo acumulado entre start y end (fechas, inclusive).
+
+        Los días consolidados salen de task_flow_daily y los posteriores al
+        último rollup se calculan con las transiciones pendientes del proyecto.
+        """
+        rolled_until = TaskFlowService._rolled_until()
+        counts = TaskFlowService._latest_counts([project_id], before_day=start).get(project_id, {})
+
+        rolled_by_day = {}
+        if rolled_until is not None:
+            rows = TaskFlowDaily.query.filter(
+                TaskFlowDaily.project_id == project_id,
+                TaskFlowDaily.day >= start,
+                TaskFlowDaily.day <= min(end, rolled_until)
+            ).all()
+            for row in rows:
+                rolled_by_day.setdefault(row.day, {})[row.status] = row.task_count
+
+        live_by_day = defaultdict(list)
+        if rolled_until is None or end > rolled_until:
+            live = db.session.query(
+                TaskStatusTransition.created_at,
+                TaskStatusTransition.from_status,
+                TaskStatusTransition.to_status
+            ).filter(
+                TaskStatusTransition.project_id == project_id,
+                TaskStatusTransition.created_at < datetime.combine(end + timedelta(days=1), time.min)
+            )
+            if rolled_until is not None:
+                live = live.filter(
+                    TaskStatusTransition.created_at >= datetime.combine(rolled_until + timedelta(days=1), time.min)
+                )
+            for created_at, from_status, to_status in live.order_by(TaskStatusTransition.created_at.asc()):
+                day = created_at.date()
+                if day < start:
+                    # Transiciones aún no consolidadas anteriores al rango
+                    TaskFlowService._apply(counts, from_status, to_status)
+                else:
+                    live_by_day[day].append((from_status, to_status))
+
+        series = []
+        day = start
+        while day <= end:
+            if day in rolled_by_day:
+                counts = dict(rolled_by_day[day])
+            for from_status, to_status in live_by_day.get(day, ()):
+                TaskFlowService._apply(counts, from_status, to_status)
+            item = {'date': day.isoformat()}
+            for status in TASK_STATUSES:
+                item[status] = max(counts.get(status, 0), 0)
+            series.append(item)
+            day += timedelta(days=1)
+
+        return series
+
+    @staticmethod
+    def _distribution(seconds_list):
+        values = sorted(s / 86400 for s in seconds_list)
+        count = len(values)
+
+        def percentile(p):
+            if not values:
+                return None
+            index = max(int(round(p / 100 * count + 0.5)) - 1, 0)
+            return round(values[min(index, count - 1)], 2)
+
+        histogram = []
+        lower = 0
+        for upper in HISTOGRAM_BUCKETS + (None,):
+            histogram.append({
+                'from_days': lower,
+                'to_days': upper,
+                'count': sum(1 for v in values if v >= lower and (upper is None or v < upper))
+            })
+            lower = upper
+
+        return {
+            'count': count,
+            'average_days': round(sum(values) / count, 2) if count else None,
+            'p50_days': percentile(50),
+            'p85_days': percentile(85),
+            'p95_days': percentile(95),
+            'histogram': histogram
+        }
+
+    @staticmethod
+    def get_flow_times(project_id, start, end):
+        """
+        Distribuciones de cycle time y lead time de las tareas completadas entre
+        start y end (fechas, inclusive). Una tarea reabierta y cerrada de nuevo
+        cuenta una vez por cada cierre.
+        """
+        rows = db.session.query(
+            TaskStatusTransition.lead_seconds,
+            TaskStatusTransition.cycle_seconds
+        ).filter(
+            TaskStatusTransition.project_id == project_id,
+            TaskStatusTransition.to_status == 'done',
+            TaskStatusTransition.created_at >= datetime.combine(start, time.min),
+            TaskStatusTransition.created_at < datetime.combine(end + timedelta(days=1), time.min)
+        ).all()
+
+        return {
+            'cycle_time': TaskFlowService._distribution([r.cycle_seconds for r in rows if r.cycle_seconds is not None]),
+            'lead_time': TaskFlowService._distribution([r.lead_seconds for r in rows if r.lead_seconds is not None])
+        }
@@ -0,0 +1,306 @@
+import codecs
+import csv
+import io
+import json
+import re
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from marshmallow import ValidationError
+from app import db
+from app.models import Task, Sprint, Membership, User, Notification, AuditLog, TaskStatusTransition
+from app.realtime.notifications_hub import notifications_hub
+from app.schemas import TaskCreateSchema
+from app.search import SearchIndex
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.services.tag_service import TagService
+from app.services.project_version_service import ProjectVersionService
+from app.utils.transaction import after_commit
+
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Columnas que se escriben en tasks (mismo orden para INSERT y COPY)
+TASK_COLUMNS = (
+    'id', 'project_id', 'sprint_id', 'title', 'description', 'status', 'priority',
+    'assigned_to', 'created_by', 'due_date', 'start_date', 'completed_at', 'tags',
+    'checklist', 'created_at', 'updated_at'
+)
+
+_TAG_SEPARATORS = re.compile(r'[;|,]')
+
+
+class TaskImportService:
+    """Servicio para importar tareas desde CSV o NDJSON en streaming"""
+
+    BATCH_SIZE = 500
+    MAX_REPORTED_ERRORS = 100
+
+    @staticmethod
+    def detect_format(filename=None, content_type=None):
+        """Deducir el formato por extensión o content-type (None si no se reconoce)"""
+        name = (filename or '').lower()
+        mimetype = (content_type or '').split(';')[0].strip().lower()
+        if name.endswith('.csv') or mimetype in ('text/csv', 'application/csv'):
+            return 'csv'
+        if name.endswith(('.ndjson', '.jsonl')) or mimetype in ('application/x-ndjson', 'application/jsonl'):
+            return 'ndjson'
+        return None
+
+    @staticmethod
+    def iter_records(stream, fmt):
+        """
+        Recorrer un stream binario registro por registro.
+
+        Yields:
+            (línea, dict o None, error o None)
+        """
+        lines = codecs.iterdecode(stream, 'utf-8-sig')
+        if fmt == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, None, 'La fila tiene más columnas que el encabezado'
+                    continue
+                yield reader.line_num, TaskImportService._normalize_csv_row(row), None
+            return
+
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f'JSON inválido: {e}'
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, 'Cada línea debe ser un objeto JSON'
+                continue
+            yield line_number, record, None
+
+    @staticmethod
+    def _normalize_csv_row(row):
+        """Celdas vacías como ausentes y tags separadas por ';', '|' o ','"""
+        record = {}
+        for key, value in row.items():
+            key = (key or '').strip()
+            value = (value or '').strip()
+            if not key or value == '':
+                continue
+            if key == 'tags':
+                record[key] = [tag.strip() for tag in _TAG_SEPARATORS.split(value) if tag.strip()]
+            elif key == 'checklist':
+                try:
+                    record[key] = json.loads(value)
+                except ValueError:
+                    record[key] = value
+            else:
+                record[key] = value
+        return record
+
+    @staticmethod
+    def _to_utc_naive(value):
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def import_tasks(project, stream, fmt, creator_id, ip_address=None, user_agent=None):
+        """
+        Importar tareas validando cada registro con TaskCreateSchema.
+
+        Los registros inválidos se reportan y se omiten sin abortar la
+        importación. Las filas válidas se insertan por lotes (COPY en PostgreSQL,
+        INSERT multi-fila en otros motores) y se hace commit por lote, por lo
+        que la memoria no depende del tamaño del archivo.
+
+        Returns:
+            dict con imported, failed, errors (primeros MAX_REPORTED_ERRORS) y errors_truncated
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f'Formato no soportado. Opciones: {", ".join(IMPORT_FORMATS)}')
+
+        schema = TaskCreateSchema()
+
+        # Referencias del proyecto: acotadas por el tamaño del equipo, no del archivo
+        member_rows = db.session.query(Membership.user_id, User.email).join(
+            User, User.id == Membership.user_id
+        ).filter(Membership.project_id == project.id, Membership.status == 'active').all()
+        member_ids = {row.user_id for row in member_rows}
+        member_by_email = {row.email.lower(): row.user_id for row in member_rows if row.email}
+        sprint_status = dict(db.session.query(Sprint.id, Sprint.status).filter_by(project_id=project.id).all())
+
+        summary = {'imported': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+        assigned_counts = Counter()
+        touched_sprints = set()
+
+        def fail(line, errors):
+            summary['failed'] += 1
+            if len(summary['errors']) < TaskImportService.MAX_REPORTED_ERRORS:
+                summary['errors'].append({'line': line, 'errors': errors})
+            else:
+                summary['errors_truncated'] = True
+
+        batch = []
+        for line, record, error in TaskImportService.iter_records(stream, fmt):
+            if error:
+                fail(line, error)
+                continue
+
+            email = record.pop('assignee_email', None)
+            if email and not record.get('assigned_to'):
+                record['assigned_to'] = member_by_email.get(str(email).lower(), email)
+
+            try:
+                data = schema.load(record)
+            except ValidationError as err:
+                fail(line, err.messages)
+                continue
+
+            assigned_to = data.get('assigned_to')
+            if assigned_to and assigned_to not in member_ids:
+                fail(line, {'assigned_to': ['El usuario no es miembro del proyecto']})
+                continue
+            sprint_id = data.get('sprint_id')
+            if sprint_id:
+                if not project.sprint_enabled:
+                    fail(line, {'sprint_id': ['Sprints no habilitados para este proyecto']})
+                    continue
+                if sprint_id not in sprint_status:
+                    fail(line, {'sprint_id': ['Sprint inválido para este proyecto']})
+                    continue
+                if sprint_status[sprint_id] == 'closed':
+                    fail(line, {'sprint_id': ['No se pueden asignar tareas a un sprint cerrado']})
+                    continue
+
+            batch.append((line, data))
+            if len(batch) >= TaskImportService.BATCH_SIZE:
+                TaskImportService._flush_batch(project, batch, creator_id, summary, fail, assigned_counts, touched_sprints)
+                batch = []
+
+        if batch:
+            TaskImportService._flush_batch(project, batch, creator_id, summary, fail, assigned_counts, touched_sprints)
+
+        SprintMetricsService.refresh_sprints(touched_sprints)
+        TaskImportService._notify_assignees(project.id, creator_id, assigned_counts)
+        db.session.add(AuditLog(
+            user_id=creator_id,
+            project_id=project.id,
+            action='tasks_imported',
+            entity_type='task',
+            details={'format': fmt, 'imported': summary['imported'], 'failed': summary['failed']},
+            ip_address=ip_address,
+            user_agent=user_agent
+        ))
+        db.session.commit()
+        return summary
+
+    @staticmethod
+    def _flush_batch(project, batch, creator_id, summary, fail, assigned_counts, touched_sprints):
+        """Insertar un lote de tareas validadas y hacer commit"""
+        now = datetime.utcnow()
+        rows = []
+        transitions = []
+        for _, data in batch:
+            task_id = str(uuid.uuid4())
+            status = data.get('status', 'pending')
+            rows.append({
+                'id': task_id,
+                'project_id': project.id,
+                'sprint_id': data.get('sprint_id'),
+                'title': data['title'],
+                'description': data.get('description'),
+                'status': status,
+                'priority': data.get('priority', 'medium'),
+                'assigned_to': data.get('assigned_to'),
+                'created_by': creator_id,
+                'due_date': TaskImportService._to_utc_naive(data.get('due_date')),
+                'start_date': TaskImportService._to_utc_naive(data.get('start_date')),
+                'completed_at': now if status == 'done' else None,
+                'tags': data.get('tags'),
+                'checklist': data.get('checklist') or [],
+                'created_at': now,
+                'updated_at': now
+            })
+            transitions.append({
+                'task_id': task_id,
+                'project_id': project.id,
+                'changed_by': creator_id,
+                'from_status': None,
+                'to_status': status,
+                'lead_seconds': 0 if status == 'done' else None,
+                'cycle_seconds': 0 if status == 'done' else None,
+                'created_at': now
+            })
+
+        try:
+            if db.session.get_bind().dialect.name == 'postgresql':
+                TaskImportService._copy_rows(rows)
+            else:
+                db.session.execute(Task.__table__.insert(), rows)
+            db.session.execute(TaskStatusTransition.__table__.insert(), transitions)
+            SearchIndex.insert_documents([SearchIndex.task_document(row) for row in rows])
+            TagService.insert_for_rows(project.id, rows)
+            ProjectVersionService.bump(project.id, 'tasks')
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for line, _ in batch:
+                fail(line, f'Error al guardar el lote: {e}')
+            return
+
+        summary['imported'] += len(rows)
+        for row in rows:
+            if row['assigned_to'] and row['assigned_to'] != creator_id:
+                assigned_counts[row['assigned_to']] += 1
+            if row['sprint_id']:
+                touched_sprints.add(row['sprint_id'])
+
+    @staticmethod
+    def _copy_rows(rows):
+        """COPY ... FROM STDIN sobre la conexión de la sesión (misma transacción)"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([TaskImportService._copy_value(row[column]) for column in TASK_COLUMNS])
+        buffer.seek(0)
+
+        dbapi_connection = db.session.connection().connection.dbapi_connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY tasks ({", ".join(TASK_COLUMNS)}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+    @staticmethod
+    def _copy_value(value):
+        if value is None:
+            return None
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, ensure_ascii=False)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _notify_assignees(project_id, creator_id, assigned_counts):
+        """Una notificación por asignado con la cantidad de tareas importadas"""
+        if not assigned_counts:
+            return
+        creator = User.query.get(creator_id)
+        name = creator.name if creator else 'Owner'
+        notifications = []
+        for user_id, count in assigned_counts.items():
+            notifications.append(Notification(
+                user_id=user_id,
+                project_id=project_id,
+                type='task_assigned',
+                message=f'{name} te asignó {count} tareas importadas.' if count > 1 else f'{name} te asignó 1 tarea importada.',
+                entity_type='task'
+            ))
+        db.session.add_all(notifications)
+        db.session.flush()
+        after_commit(TaskImportService._publish, [(n.user_id, n.to_dict()) for n in notifications])
+
+    @staticmethod
+    def _publish(items):
+        for user_id, notification in items:
+            notifications_hub.publish(user_id, {'notification': notification})
@@ -1,8 +1,16 @@
 from datetime import datetime, timedelta
 from app import db
 from app.models import Task, User, Project, Sprint, Membership, Notification, AuditLog
-from sqlalchemy import or_, and_
+from sqlalchemy import and_
 from app.realtime.notifications_hub import notifications_hub
+from app.services.sprint_metrics_service import SprintMetricsService
+from app.services.task_flow_service import TaskFlowService
+from app.services.tag_service import TagService
+from app.services.project_version_service import ProjectVersionService
+from app.search import TaskSearch, SearchIndex
+
+# Campos que cambian el documento de la tarea en el índice de búsqueda
+SEARCH_INDEXED_FIELDS = {'title', 'description', 'tags', 'assigned_to'}
 
 
 class TaskService:
@@ -69,6 +77,13 @@ class TaskService:
         
         db.session.add(new_task)
         db.session.flush()
+
+        TaskFlowService.record_transition(new_task, None, new_task.status, creator_id)
+        SprintMetricsService.refresh_sprints([new_task.sprint_id])
+        SearchIndex.index_task(new_task)
+        if new_task.tags:
+            TagService.sync_task_tags(new_task)
+        ProjectVersionService.bump(project_id, 'tasks')
         
         return new_task
     
@@ -119,6 +134,7 @@ class TaskService:
         if user_role == 'EMPLOYEE':
             # Permitir cambio de status
             if 'status' in data:
+                TaskFlowService.record_transition(task, task.status, data['status'], user_id)
                 task.status = data['status']
             
             # Permitir cambio de checklist (solo toggle, ya validado arriba)
@@ -126,10 +142,15 @@ class TaskService:
                 task.checklist = data['checklist']
             
             task.updated_at = datetime.utcnow()
+
+            if 'status' in data:
+                SprintMetricsService.refresh_sprints([task.sprint_id])
+            ProjectVersionService.bump(task.project_id, 'tasks')
             return task
         
         # Owner puede cambiar todo
         old_status = task.status
+        old_sprint_id = task.sprint_id
         for key, value in data.items():
             if hasattr(task, key):
                 setattr(task, key, value)
@@ -149,8 +170,17 @@ class TaskService:
         if 'status' in data:
             if data['status'] == 'done' and old_status != 'done':
                 task.completed_at = datetime.utcnow()
+            TaskFlowService.record_transition(task, old_status, task.status, user_id)
         
         task.updated_at = datetime.utcnow()
+
+        if 'status' in data or 'sprint_id' in data:
+            SprintMetricsService.refresh_sprints([old_sprint_id, task.sprint_id])
+        if SEARCH_INDEXED_FIELDS & data.keys():
+            SearchIndex.index_task(task)
+        if 'tags' in data:
+            TagService.sync_task_tags(task)
+        ProjectVersionService.bump(task.project_id, 'tasks')
         
         return task
     
@@ -167,12 +197,23 @@ class TaskService:
         if not project or project.owner_id != user_id:
             return False
         
+        sprint_id = task.sprint_id
+        TaskFlowService.record_transition(task, task.status, None, user_id)
+        SearchIndex.remove_tasks([task.id])
+        TagService.remove_tasks([task.id])
         db.session.delete(task)
+        SprintMetricsService.refresh_sprints([sprint_id])
+        ProjectVersionService.bump(project.id, 'tasks')
         return True
     
     @staticmethod
-    def list_tasks(project_id, filters, user_id, user_role):
-        """Listar tareas con filtros"""
+    def list_tasks(project_id, filters, user_id, user_role, columns=None):
+        """
+        Listar tareas con filtros
+
+        Con columns (p. ej. task_encoder.columns()) devuelve filas Core con esas
+        columnas en lugar de objetos Task.
+        """
         query = Task.query.filter_by(project_id=project_id)
         
         # Filtro por rol
@@ -210,25 +251,32 @@ class TaskService:
                     )
                 )
         
-        # Búsqueda por texto
+        # Etiquetas (índice task_tags): tag_mode 'and' (todas) u 'or' (alguna)
+        if filters.get('tags'):
+            query = TagService.apply_filter(query, project_id, filters['tags'], filters.get('tag_mode') or 'and')
+
+        # Búsqueda por texto (índice de texto completo; ILIKE si no existe)
+        relevance = None
         if filters.get('search'):
-            search = f"%{filters['search']}%"
-            query = query.filter(
-                or_(
-                    Task.title.ilike(search),
-                    Task.description.ilike(search)
-                )
-            )
+            query, relevance = TaskSearch.apply(query, filters['search'])
         
         # Ordenamiento
         sort_by = filters.get('sort_by', 'created_at')
         sort_order = filters.get('sort_order', 'desc')
         
-        if hasattr(Task, sort_by):
+        if sort_by == 'relevance':
+            if relevance is not None:
+                query = query.order_by(relevance, Task.created_at.desc())
+            else:
+                query = query.order_by(Task.created_at.desc())
+        elif hasattr(Task, sort_by):
             if sort_order == 'asc':
                 query = query.order_by(getattr(Task, sort_by).asc())
             else:
                 query = query.order_by(getattr(Task, sort_by).desc())
+
+        if columns is not None:
+            query = query.with_entities(*columns)
         
         return query.all()
     
@@ -277,6 +325,8 @@ class TaskService:
         old_assigned_to = task.assigned_to
         task.assigned_to = assignee_id
         task.updated_at = datetime.utcnow()
+        SearchIndex.index_task(task)
+        ProjectVersionService.bump(task.project_id, 'tasks')
         
         return task, old_assigned_to
     
@@ -295,6 +345,10 @@ class TaskService:
         # Si se marca como done, guardar fecha de completado
         if new_status == 'done' and old_status != 'done':
             task.completed_at = datetime.utcnow()
+
+        TaskFlowService.record_transition(task, old_status, new_status, user_id)
+        SprintMetricsService.refresh_sprints([task.sprint_id])
+        ProjectVersionService.bump(task.project_id, 'tasks')
         
         return task
     
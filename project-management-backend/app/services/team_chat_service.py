@@ -1,9 +1,37 @@
+import re
+from datetime import datetime
+from sqlalchemy import tuple_
 from app import db
 from app.models.team_message import TeamMessage
+from app.models.team_message_mention import TeamMessageMention
 from app.models.project import Project
 from app.models.membership import Membership
 from app.models.user import User
 from app.models.notification import Notification
+from app.models.task import Task
+from app.models.types import uuid7
+from app.search import SearchIndex
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.transaction import after_commit
+from app.realtime.chat_tail_cache import chat_tail_cache
+from app.realtime.notifications_hub import notifications_hub
+from app.services.project_version_service import ProjectVersionService
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# @all, @department, @ana.perez@empresa.com o @ana.perez (parte local del email)
+MENTION_PATTERN = re.compile(r'(?<![\w@])@(\w[\w.+-]*(?:@[\w-]+(?:\.[\w-]+)+)?)')
+MENTION_ALL_TOKENS = ('all', 'todos')
+MENTION_DEPARTMENT_TOKENS = ('department', 'departamento')
+MENTION_INSERT_BATCH_SIZE = 500
+
+# Campos de un mensaje serializado (serialize_messages), para ?fields=
+MESSAGE_FIELDS = (
+    'id', 'project_id', 'user_id', 'task_id', 'mentioned_user_id', 'content', 'created_at',
+    'updated_at', 'user_name', 'user_email', 'user_avatar', 'task_title', 'mentioned_user_name',
+    'mentioned_user_ids', 'mention_groups'
+)
 
 class TeamChatService:
     @staticmethod
@@ -37,68 +65,324 @@ class TeamChatService:
         return False, 'FORBIDDEN'
 
     @staticmethod
-    def get_project_messages(project_id, user_id, user_role, limit=50):
+    def serialize_messages(messages):
         """
-        Obtiene los mensajes del chat de un proyecto.
+        Serializar mensajes con datos del autor, la tarea y el usuario mencionado.
+        Usuarios y tareas se resuelven en una consulta cada uno (sin lazy loads).
         """
-        has_access, error = TeamChatService._check_access(project_id, user_id, user_role)
-        if not has_access:
-            return None, error
-            
-        # Obtener mensajes ordenados por fecha ascendente (los más antiguos primero para renderizarlos de arriba a abajo en el frontend)
-        # o limitados para no sobrecargar
-        messages = TeamMessage.query.filter_by(project_id=project_id)\
-            .order_by(TeamMessage.created_at.desc())\
-            .limit(limit).all()
-            
-        # Revertir para que el orden final sea cronológico
-        messages.reverse()
-        
-        # Formatear el resultado e incluir info del usuario y de la tarea
+        user_ids = {m.user_id for m in messages} | {m.mentioned_user_id for m in messages if m.mentioned_user_id}
+        task_ids = {m.task_id for m in messages if m.task_id}
+        message_ids = [m.id for m in messages]
+        users = {
+            row.id: row for row in db.session.query(User.id, User.name, User.email, User.avatar)
+            .filter(User.id.in_(user_ids)).all()
+        } if user_ids else {}
+        task_titles = dict(
+            db.session.query(Task.id, Task.title).filter(Task.id.in_(task_ids)).all()
+        ) if task_ids else {}
+
+        # Menciones directas y grupos (@all / @department) de la página
+        mentioned_ids = {}
+        mention_groups = {}
+        if message_ids:
+            for message_id, mentioned_id in db.session.query(TeamMessageMention.message_id, TeamMessageMention.user_id)\
+                    .filter(TeamMessageMention.message_id.in_(message_ids), TeamMessageMention.kind == 'user')\
+                    .order_by(TeamMessageMention.message_id, TeamMessageMention.user_id).all():
+                mentioned_ids.setdefault(message_id, []).append(mentioned_id)
+            for message_id, kind in db.session.query(TeamMessageMention.message_id, TeamMessageMention.kind)\
+                    .filter(TeamMessageMention.message_id.in_(message_ids), TeamMessageMention.kind != 'user')\
+                    .distinct().order_by(TeamMessageMention.message_id, TeamMessageMention.kind).all():
+                mention_groups.setdefault(message_id, []).append(kind)
+
         result = []
         for msg in messages:
+            sender = users.get(msg.user_id)
+            mentioned = users.get(msg.mentioned_user_id)
             msg_dict = msg.to_dict()
-            msg_dict['user_name'] = msg.user.name if msg.user else 'Desconocido'
-            msg_dict['user_email'] = msg.user.email if msg.user else ''
-            msg_dict['user_avatar'] = msg.user.avatar if msg.user else None
-            msg_dict['task_title'] = msg.task.title if msg.task else None
-            msg_dict['mentioned_user_name'] = msg.mentioned_user.name if msg.mentioned_user else None
+            msg_dict['user_name'] = sender.name if sender else 'Desconocido'
+            msg_dict['user_email'] = sender.email if sender else ''
+            msg_dict['user_avatar'] = sender.avatar if sender else None
+            msg_dict['task_title'] = task_titles.get(msg.task_id)
+            msg_dict['mentioned_user_name'] = mentioned.name if mentioned else None
+            msg_dict['mentioned_user_ids'] = mentioned_ids.get(msg.id, [])
+            msg_dict['mention_groups'] = mention_groups.get(msg.id, [])
             result.append(msg_dict)
-            
-        return result, None
+        return result
+
+    @staticmethod
+    def get_project_messages(project_id, user_id, user_role, limit=50, before=None, after=None):
+        """
+        Obtiene una página de mensajes del chat de un proyecto, en orden cronológico.
+
+        Paginación por keyset sobre (created_at, id), apoyada en el índice
+        ix_team_messages_project_created: cualquier página cuesta lo mismo
+        sin importar su antigüedad.
+
+        Args:
+            limit: tamaño de página (1..MAX_PAGE_SIZE)
+            before: cursor; devuelve los mensajes anteriores a él
+            after: cursor; devuelve los mensajes posteriores a él (polling)
+
+        Returns:
+            ({'messages': [...], 'pagination': {...}}, error)
+        """
+        has_access, error = TeamChatService._check_access(project_id, user_id, user_role)
+        if not has_access:
+            return None, error
+
+        limit = max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+        before_key = decode_cursor(before) if before else None
+        after_key = decode_cursor(after) if after else None
+
+        page = TeamChatService._page_from_tail(project_id, limit, before_key, after_key)
+        if page is None:
+            page = TeamChatService._page_from_db(project_id, limit, before_key, after_key)
+        entries, has_more = page
+
+        # has_more se refiere a la dirección pedida (sin cursor: hacia atrás)
+        pagination = {
+            'limit': limit,
+            'direction': 'after' if after else 'before',
+            'has_more': has_more,
+            'before': encode_cursor(*entries[0][0]) if entries else before,
+            'after': encode_cursor(*entries[-1][0]) if entries else after
+        }
+        return {'messages': [item for _, item in entries], 'pagination': pagination}, None
+
+    @staticmethod
+    def _page_from_db(project_id, limit, before_key=None, after_key=None):
+        """Página por keyset desde la base: ([(key, mensaje serializado)], has_more)"""
+        key = tuple_(TeamMessage.created_at, TeamMessage.id)
+        query = TeamMessage.query.filter(TeamMessage.project_id == project_id)
+
+        if after_key:
+            query = query.filter(key > after_key)\
+                .order_by(TeamMessage.created_at.asc(), TeamMessage.id.asc())
+        else:
+            if before_key:
+                query = query.filter(key < before_key)
+            query = query.order_by(TeamMessage.created_at.desc(), TeamMessage.id.desc())
+
+        # Una fila extra indica si quedan más mensajes en esa dirección
+        messages = query.limit(limit + 1).all()
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if not after_key:
+            # Revertir para que el orden final sea cronológico
+            messages.reverse()
+
+        items = TeamChatService.serialize_messages(messages)
+        return [((m.created_at, m.id), item) for m, item in zip(messages, items)], has_more
+
+    @staticmethod
+    def _page_from_tail(project_id, limit, before_key=None, after_key=None):
+        """
+        Página desde la caché de la cola del chat, o None si no cabe en ella.
+
+        Antes de servir se compara la cabeza de la caché con el último mensaje
+        en la base (consulta solo sobre ix_team_messages_project_created); si
+        difieren (p. ej. otro worker escribió), la cola se recarga.
+        """
+        if limit > chat_tail_cache.capacity:
+            return None
+
+        head = db.session.query(TeamMessage.created_at, TeamMessage.id)\
+            .filter(TeamMessage.project_id == project_id)\
+            .order_by(TeamMessage.created_at.desc(), TeamMessage.id.desc())\
+            .first()
+        head = tuple(head) if head else None
+
+        cached, cached_head = chat_tail_cache.peek_head(project_id)
+        if not cached or cached_head != head:
+            if before_key:
+                # Scroll hacia atrás: no vale la pena cargar la cola
+                return None
+            generation = chat_tail_cache.generation(project_id)
+            entries, has_older = TeamChatService._page_from_db(project_id, chat_tail_cache.capacity)
+            chat_tail_cache.store(project_id, entries, has_older, generation)
+
+        return chat_tail_cache.page(project_id, limit, before=before_key, after=after_key)
+
+
+    @staticmethod
+    def parse_mentions(content):
+        """Tokens de mención del texto, en minúsculas y sin duplicados ('ana.perez', 'all', ...)"""
+        tokens = []
+        for match in MENTION_PATTERN.finditer(content or ''):
+            token = match.group(1).rstrip('.-').lower()
+            if token and token not in tokens:
+                tokens.append(token)
+        return tokens
+
+    @staticmethod
+    def _chat_audience(project):
+        """
+        Usuarios que leen el chat: Owner y miembros activos con chat habilitado.
+
+        Returns:
+            dict {user_id: (email, department)}
+        """
+        rows = db.session.query(User.id, User.email, User.department)\
+            .join(Membership, Membership.user_id == User.id)\
+            .filter(
+                Membership.project_id == project.id,
+                Membership.status == 'active',
+                Membership.chat_enabled.is_(True)
+            ).all()
+        audience = {row.id: (row.email, row.department) for row in rows}
+        owner = db.session.query(User.id, User.email, User.department).filter(User.id == project.owner_id).first()
+        if owner:
+            audience[owner.id] = (owner.email, owner.department)
+        return audience
+
+    @staticmethod
+    def resolve_mentions(project, sender_id, content, explicit_ids=None):
+        """
+        Resolver los destinatarios de las menciones de un mensaje.
+
+        Combina las menciones explícitas (mentioned_user_id/mentioned_user_ids) con
+        las del texto: @all/@todos, @department/@departamento (departamento del
+        autor), @email o @parte-local-del-email. Solo cuentan usuarios que leen el
+        chat y nunca el propio autor.
+
+        Returns:
+            dict ordenado {user_id: kind} con kind 'user', 'all' o 'department'
+        """
+        explicit_ids = [user_id for user_id in (explicit_ids or []) if user_id]
+        tokens = TeamChatService.parse_mentions(content)
+        if not explicit_ids and not tokens:
+            return {}
+
+        audience = TeamChatService._chat_audience(project)
+        recipients = {}
+
+        def add(user_id, kind):
+            if user_id == sender_id or user_id not in audience:
+                return
+            if kind == 'user' or user_id not in recipients:
+                recipients[user_id] = kind
+
+        for user_id in explicit_ids:
+            add(user_id, 'user')
+
+        by_email = {}
+        by_local_part = {}
+        for user_id, (email, _) in audience.items():
+            email = (email or '').lower()
+            by_email[email] = user_id
+            by_local_part.setdefault(email.split('@')[0], []).append(user_id)
+
+        sender_department = (audience.get(sender_id, (None, None))[1] or '').strip().lower()
+        for token in tokens:
+            if token in MENTION_ALL_TOKENS:
+                for user_id in audience:
+                    add(user_id, 'all')
+            elif token in MENTION_DEPARTMENT_TOKENS:
+                if not sender_department:
+                    continue
+                for user_id, (_, department) in audience.items():
+                    if (department or '').strip().lower() == sender_department:
+                        add(user_id, 'department')
+            elif token in by_email:
+                add(by_email[token], 'user')
+            elif len(by_local_part.get(token, [])) == 1:
+                # Parte local ambigua (varios miembros la comparten): se ignora
+                add(by_local_part[token][0], 'user')
+
+        return recipients
+
+    @staticmethod
+    def _create_mentions(message, sender_name, recipients):
+        """
+        Guardar las menciones y sus notificaciones con un INSERT multi-fila por
+        tabla, y publicarlas en un solo lote tras el commit. No hace commit.
+        """
+        now = datetime.utcnow()
+        mention_rows = []
+        notification_rows = []
+        for recipient_id, kind in recipients.items():
+            mention_rows.append({
+                'message_id': message.id,
+                'user_id': recipient_id,
+                'project_id': message.project_id,
+                'kind': kind,
+                'created_at': now
+            })
+            if kind == 'all':
+                text = f"{sender_name} mencionó a todo el equipo en el chat."
+            elif kind == 'department':
+                text = f"{sender_name} mencionó a tu departamento en el chat."
+            else:
+                text = f"{sender_name} te mencionó en el chat del equipo."
+            notification_rows.append({
+                'id': uuid7(),
+                'user_id': recipient_id,
+                'project_id': message.project_id,
+                'type': 'chat_mention',
+                'message': text,
+                'read': False,
+                'entity_type': 'chat_message',
+                'entity_id': message.id,
+                'created_at': now
+            })
+
+        for start in range(0, len(mention_rows), MENTION_INSERT_BATCH_SIZE):
+            db.session.execute(
+                TeamMessageMention.__table__.insert().values(mention_rows[start:start + MENTION_INSERT_BATCH_SIZE])
+            )
+            db.session.execute(
+                Notification.__table__.insert().values(notification_rows[start:start + MENTION_INSERT_BATCH_SIZE])
+            )
+
+        # Mismo formato que Notification.to_dict()
+        payloads = [
+            (row['user_id'], {'notification': dict(row, created_at=now.isoformat(), read_at=None)})
+            for row in notification_rows
+        ]
+        after_commit(notifications_hub.publish_batch, payloads)
 
     @staticmethod
-    def create_message(project_id, user_id, user_role, content, task_id=None, mentioned_user_id=None):
+    def create_message(project_id, user_id, user_role, content, task_id=None, mentioned_user_id=None,
+                       mentioned_user_ids=None):
         """
         Crea un nuevo mensaje en el chat del proyecto.
+
+        Las menciones se resuelven en el servidor (ver resolve_mentions); cada
+        destinatario recibe una notificación 'chat_mention'.
         """
         has_access, error = TeamChatService._check_access(project_id, user_id, user_role)
         if not has_access:
             return None, error
             
         try:
+            project = Project.query.get(project_id)
+            explicit_ids = ([mentioned_user_id] if mentioned_user_id else []) + list(mentioned_user_ids or [])
+            recipients = TeamChatService.resolve_mentions(project, user_id, content, explicit_ids)
+            direct = [recipient_id for recipient_id, kind in recipients.items() if kind == 'user']
+
             message = TeamMessage(
                 project_id=project_id,
                 user_id=user_id,
                 content=content,
                 task_id=task_id,
-                mentioned_user_id=mentioned_user_id
+                # Compatibilidad: primera mención directa
+                mentioned_user_id=direct[0] if direct else None
             )
             db.session.add(message)
-            
-            # If a user is mentioned, create a notification
-            if mentioned_user_id:
+            db.session.flush()
+
+            if recipients:
                 sender = User.query.get(user_id)
-                sender_name = sender.name if sender else "Un usuario"
-                notification = Notification(
-                    user_id=mentioned_user_id,
-                    project_id=project_id,
-                    type='chat_mention',
-                    message=f"{sender_name} te mencionó en el chat del equipo.",
-                    entity_type='chat_message',
-                    entity_id=message.id
-                )
-                db.session.add(notification)
+                TeamChatService._create_mentions(message, sender.name if sender else "Un usuario", recipients)
+
+            SearchIndex.index_message(message)
+            ProjectVersionService.bump(project_id, 'chat')
+            after_commit(
+                chat_tail_cache.append,
+                project_id,
+                (message.created_at, message.id),
+                TeamChatService.serialize_messages([message])[0]
+            )
                 
             # No hacemos commit aquí para dejarlo al route caller (igual que otros servicios)
             return message, None
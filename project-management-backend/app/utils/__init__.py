@@ -4,14 +4,26 @@ from app.utils.decorators import (
     role_required,
     project_member_required,
     get_current_user_id,
+    get_active_membership,
+    reject_writes_on_deleting_project,
     get_current_project_id,
     get_current_user_role
 )
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.etag import conditional_get, make_etag
+from app.db_routing import read_replica
 
 __all__ = [
     'role_required',
     'project_member_required',
     'get_current_user_id',
+    'get_active_membership',
+    'reject_writes_on_deleting_project',
     'get_current_project_id',
-    'get_current_user_role'
+    'get_current_user_role',
+    'encode_cursor',
+    'decode_cursor',
+    'conditional_get',
+    'make_etag',
+    'read_replica'
 ]
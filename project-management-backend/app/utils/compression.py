@@ -0,0 +1,276 @@
+"""
+Compresión de respuestas HTTP (Content-Encoding negociado)
+
+Un after_request comprime las respuestas de tipos de texto (JSON, NDJSON, CSV)
+según el Accept-Encoding del cliente. gzip está siempre disponible; brotli y
+zstd se usan solo si el paquete correspondiente está instalado (brotli,
+zstandard o compression.zstd de Python 3.14).
+
+- Las respuestas en memoria se comprimen de una vez si superan
+  COMPRESSION_MIN_SIZE; por debajo no compensa el costo de CPU.
+- Las respuestas en streaming (exportaciones) se comprimen por partes a medida
+  que se generan, sin cargarlas completas en memoria. Con flush_each_chunk()
+  cada chunk se envía apenas se genera (p. ej. POST /api/batch en streaming).
+- Los streams SSE (text/event-stream) nunca se comprimen: los proxies y
+  navegadores retendrían los eventos en el buffer del compresor.
+"""
+
+import logging
+import zlib
+from flask import request
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+try:
+    from compression import zstd as _stdlib_zstd
+except ImportError:  # pragma: no cover - Python < 3.14
+    _stdlib_zstd = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependencia opcional
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+    'text/html',
+)
+
+# Tamaño mínimo del chunk comprimido antes de enviarlo en una respuesta en streaming
+STREAM_FLUSH_BYTES = 64 * 1024
+
+
+class _GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def start(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    @staticmethod
+    def feed(compressor, data):
+        return compressor.compress(data)
+
+    @staticmethod
+    def sync(compressor):
+        return compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.flush()
+
+
+class _BrotliEncoder:
+    name = 'br'
+
+    def __init__(self, level):
+        self.level = level
+
+    def start(self):
+        return brotli.Compressor(quality=self.level)
+
+    @staticmethod
+    def feed(compressor, data):
+        return compressor.process(data)
+
+    @staticmethod
+    def sync(compressor):
+        return compressor.flush()
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.finish()
+
+
+class _ZstdEncoder:
+    name = 'zstd'
+
+    def __init__(self, level):
+        self.level = level
+
+    def start(self):
+        if _stdlib_zstd is not None:
+            return _stdlib_zstd.ZstdCompressor(level=self.level)
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    @staticmethod
+    def feed(compressor, data):
+        return compressor.compress(data)
+
+    @staticmethod
+    def sync(compressor):
+        if _stdlib_zstd is not None and isinstance(compressor, _stdlib_zstd.ZstdCompressor):
+            return compressor.flush(_stdlib_zstd.ZstdCompressor.FLUSH_BLOCK)
+        return compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    @staticmethod
+    def finish(compressor):
+        return compressor.flush()
+
+
+def flush_each_chunk(response):
+    """Marcar una respuesta en streaming para que cada chunk se envíe comprimido sin esperar al buffer"""
+    response.compress_each_chunk = True
+    return response
+
+
+def available_encodings():
+    """Codificaciones que este proceso puede generar"""
+    encodings = ['gzip']
+    if brotli is not None:
+        encodings.append('br')
+    if _stdlib_zstd is not None or zstandard is not None:
+        encodings.append('zstd')
+    return encodings
+
+
+def parse_accept_encoding(header):
+    """'gzip;q=0.8, br' -> {'gzip': 0.8, 'br': 1.0}"""
+    weights = {}
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    return weights
+
+
+class ResponseCompressor:
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.preference = ('zstd', 'br', 'gzip')
+        self.encoders = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', self.min_size)
+        available = available_encodings()
+        self.preference = tuple(
+            name for name in app.config.get('COMPRESSION_ALGORITHMS', self.preference) if name in available
+        )
+        self.encoders = {
+            'gzip': _GzipEncoder(app.config.get('COMPRESSION_GZIP_LEVEL', 6)),
+            'br': _BrotliEncoder(app.config.get('COMPRESSION_BROTLI_LEVEL', 5)),
+            'zstd': _ZstdEncoder(app.config.get('COMPRESSION_ZSTD_LEVEL', 3)),
+        }
+        app.after_request(self.after_request)
+        app.extensions['response_compressor'] = self
+
+    def choose(self, accept_encoding):
+        """Codificación preferida por el servidor entre las que acepta el cliente (o None)"""
+        weights = parse_accept_encoding(accept_encoding)
+        wildcard = weights.get('*', 0.0)
+        candidates = [
+            (weights.get(name, wildcard), -position, name)
+            for position, name in enumerate(self.preference)
+        ]
+        candidates = [c for c in candidates if c[0] > 0]
+        return max(candidates)[2] if candidates else None
+
+    def _eligible(self, response):
+        if not self.enabled or request.method == 'HEAD':
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.mimetype == 'text/event-stream':
+            return False
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return False
+        if 'Content-Encoding' in response.headers or response.direct_passthrough:
+            return False
+        return True
+
+    def after_request(self, response):
+        if not self._eligible(response):
+            return response
+
+        # La representación depende del Accept-Encoding aunque esta no se comprima
+        response.vary.add('Accept-Encoding')
+
+        encoding = self.choose(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        try:
+            if response.is_streamed:
+                return self._compress_stream(response, encoding)
+            return self._compress_buffered(response, encoding)
+        except Exception as e:
+            # Ante un error del compresor se responde sin comprimir
+            logger.error(f'Error comprimiendo la respuesta con {encoding}: {e}')
+            return response
+
+    def _compress_buffered(self, response, encoding):
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        encoder = self.encoders[encoding]
+        compressor = encoder.start()
+        compressed = encoder.feed(compressor, data) + encoder.finish(compressor)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _compress_stream(self, response, encoding):
+        if response.content_length is not None and response.content_length < self.min_size:
+            return response
+
+        encoder = self.encoders[encoding]
+        source = response.response
+        chunks = response.iter_encoded()
+        flush_bytes = 0 if getattr(response, 'compress_each_chunk', False) else STREAM_FLUSH_BYTES
+
+        def generate():
+            compressor = encoder.start()
+            pending = []
+            pending_size = 0
+            try:
+                for chunk in chunks:
+                    data = encoder.feed(compressor, chunk)
+                    if not flush_bytes:
+                        data += encoder.sync(compressor)
+                    if data:
+                        pending.append(data)
+                        pending_size += len(data)
+                    if pending_size and pending_size >= flush_bytes:
+                        yield b''.join(pending)
+                        pending = []
+                        pending_size = 0
+                pending.append(encoder.finish(compressor))
+                yield b''.join(pending)
+            finally:
+                # El iterable original (stream_with_context) libera su contexto al cerrarse
+                close = getattr(source, 'close', None)
+                if close is not None:
+                    close()
+
+        response.response = generate()
+        response.headers.pop('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+response_compressor = ResponseCompressor()
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import jsonify, request
+from flask import jsonify, request, g
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 
 
@@ -95,6 +95,49 @@ def get_current_user_id():
     return get_jwt_identity()
 
 
+def get_active_membership(user_id):
+    """
+    Membresía activa del usuario (o None)
+
+    Se memoriza en g: dentro de una petición se consulta una sola vez, y las
+    subpeticiones de POST /api/batch (que comparten el contexto) la reutilizan.
+    Solo para lecturas: no refleja cambios hechos después en la misma petición.
+    """
+    from app.models import Membership
+    memberships = g.setdefault('_active_memberships', {})
+    if user_id not in memberships:
+        memberships[user_id] = Membership.query.filter_by(user_id=user_id, status='active').first()
+    return memberships[user_id]
+
+
+def reject_writes_on_deleting_project():
+    """
+    before_request de los blueprints con escrituras de proyecto
+
+    Responde 409 PROJECT_DELETING a POST/PUT/PATCH/DELETE si el proyecto del
+    usuario se está eliminando (ver ProjectDeletionService.ensure_writable).
+
+    Uso:
+        tasks_bp.before_request(reject_writes_on_deleting_project)
+    """
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return None
+    from flask_jwt_extended import get_jwt_identity
+    from app.services.project_deletion_service import ProjectDeletionService
+
+    verify_jwt_in_request(optional=True)
+    user_id = get_jwt_identity()
+    if user_id and ProjectDeletionService.user_project_deleting(user_id):
+        return jsonify({
+            'success': False,
+            'error': {
+                'code': 'PROJECT_DELETING',
+                'message': 'El proyecto se está eliminando'
+            }
+        }), 409
+    return None
+
+
 def get_current_project_id():
     """
     Obtener el project_id del token JWT actual
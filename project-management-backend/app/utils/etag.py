@@ -0,0 +1,69 @@
+"""
+GET condicionales (ETag / If-None-Match)
+
+El decorador calcula una huella barata de los datos (agregados indexados) antes
+de ejecutar la vista. Si coincide con el If-None-Match del cliente responde 304
+sin correr la consulta ni la serialización; si no, ejecuta la vista y agrega el
+ETag a la respuesta 200.
+"""
+
+import hashlib
+import logging
+from functools import wraps
+from flask import request, make_response, current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(*parts):
+    """ETag débil a partir de la ruta con query string y las partes de la huella"""
+    raw = '|'.join([request.full_path] + [repr(part) for part in parts])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def _mark(response, etag):
+    response.set_etag(etag, weak=True)
+    # La respuesta depende del usuario: solo caché privada y siempre revalidando
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+    return response
+
+
+def conditional_get(fingerprint):
+    """
+    Decorador para endpoints GET que se consultan por polling.
+
+    fingerprint(user_id, user_role, **kwargs) devuelve una tupla que cambia
+    cuando cambian los datos de la respuesta, o None para no usar ETag (p. ej.
+    sin proyecto: la vista arma su propio error). Va debajo de @jwt_required().
+
+    Uso:
+        @jwt_required()
+        @conditional_get(FreshnessService.tasks)
+        def list_tasks(): ...
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('ETAGS_ENABLED', True):
+                return fn(*args, **kwargs)
+            try:
+                parts = fingerprint(get_jwt_identity(), get_jwt().get('role'), **kwargs)
+            except Exception as e:
+                # Sin huella se responde normal, nunca con un 304 dudoso
+                logger.warning(f'No se pudo calcular el ETag de {fn.__name__}: {e}')
+                parts = None
+            if parts is None:
+                return fn(*args, **kwargs)
+
+            etag = make_etag(*parts)
+            if request.if_none_match.contains_weak(etag):
+                return _mark(make_response('', 304), etag)
+
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                _mark(response, etag)
+            return response
+        return wrapper
+    return decorator
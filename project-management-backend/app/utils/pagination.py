@@ -0,0 +1,30 @@
+"""
+Cursores opacos para paginación por keyset
+
+Un cursor codifica (created_at, id) de la última fila vista; el cliente lo
+devuelve tal cual en `before`/`after` para pedir la página siguiente.
+"""
+
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at, entity_id):
+    raw = f'{created_at.isoformat()}|{entity_id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        (created_at, id)
+
+    Raises:
+        ValueError si el cursor no es válido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, entity_id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(created_at), entity_id
+    except (ValueError, UnicodeError) as e:
+        raise ValueError('Cursor inválido') from e
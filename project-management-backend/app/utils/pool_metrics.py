@@ -0,0 +1,104 @@
+"""
+Métricas del pool de conexiones
+
+InstrumentedQueuePool mide cuánto espera cada checkout en el pool (incluye
+abrir la conexión si hace falta) y cuenta los timeouts por agotamiento. El
+estado instantáneo (conexiones en uso, overflow) se lee del pool del engine.
+Las métricas son por proceso: cada worker de gunicorn tiene su propio pool.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Esperas por encima de este umbral se registran como warning
+SLOW_CHECKOUT_SECONDS = 0.5
+WAIT_SAMPLES = 1000
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.checked_out_max = 0
+        self.overflow_max = 0
+
+    def record_checkout(self, pool, waited):
+        checked_out = pool.checkedout()
+        overflow = max(pool.overflow(), 0)
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.checked_out_max = max(self.checked_out_max, checked_out)
+            self.overflow_max = max(self.overflow_max, overflow)
+            self._waits.append(waited)
+        if waited >= SLOW_CHECKOUT_SECONDS:
+            logger.warning(
+                f'Checkout lento del pool: {waited * 1000:.0f} ms '
+                f'(en uso {checked_out}/{pool.size()}, overflow {overflow})'
+            )
+
+    def record_timeout(self, pool):
+        with self._lock:
+            self.timeouts += 1
+        logger.error(f'Pool de conexiones agotado: {pool.status()}')
+
+    def reset(self):
+        with self._lock:
+            self._waits.clear()
+            self.checkouts = self.timeouts = 0
+            self.wait_total = self.wait_max = 0.0
+            self.checked_out_max = self.overflow_max = 0
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            waits = sorted(self._waits)
+            data = {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'checked_out_max': self.checked_out_max,
+                'overflow_max': self.overflow_max,
+                'wait_ms': {
+                    'avg': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                    'p95': round(waits[int(len(waits) * 0.95) - 1] * 1000, 3) if waits else 0.0,
+                    'max': round(self.wait_max * 1000, 3)
+                }
+            }
+        if pool is not None and hasattr(pool, 'checkedout'):
+            data.update({
+                'pool_class': type(pool).__name__,
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow(),
+                'max_overflow': getattr(pool, '_max_overflow', None),
+                'timeout_seconds': pool.timeout()
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que registra la espera de cada checkout en pool_metrics"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout(self)
+            raise
+        pool_metrics.record_checkout(self, time.perf_counter() - start)
+        return record
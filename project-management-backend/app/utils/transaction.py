@@ -0,0 +1,54 @@
+"""
+Hooks transaccionales
+Permite diferir efectos secundarios (publicaciones en tiempo real, jobs,
+invalidaciones de caché) hasta que la transacción actual haga commit.
+"""
+
+import logging
+from sqlalchemy import event
+from app import db
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = 'after_commit_callbacks'
+
+
+def after_commit(fn, *args, **kwargs):
+    """
+    Registra un callback que se ejecuta solo si la transacción actual hace commit.
+
+    Si la transacción hace rollback, el callback se descarta (el rollback de un
+    savepoint no cuenta: solo el de la transacción externa). El callback corre
+    fuera de la transacción: no debe usar db.session.
+
+    Uso:
+        after_commit(notifications_hub.publish, user_id, payload)
+    """
+    session = db.session()
+    session.info.setdefault(_PENDING_KEY, []).append((fn, args, kwargs))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _run_after_commit(session):
+    # after_commit también se emite al liberar un savepoint: esperar al commit externo
+    if session.in_nested_transaction():
+        return
+    callbacks = session.info.pop(_PENDING_KEY, None)
+    if not callbacks:
+        return
+    for fn, args, kwargs in callbacks:
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            # Un efecto secundario fallido no debe romper la respuesta
+            logger.error(f'Error en callback after_commit {getattr(fn, "__name__", fn)}: {e}')
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _discard_after_rollback(session, previous_transaction):
+    # Solo cuenta el rollback de la transacción externa. El de un savepoint
+    # (begin_nested) o el del flush que falló dentro de él no la deshace: lo
+    # registrado antes sigue pendiente de su commit
+    if previous_transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,113 @@
+"""
+Benchmark de compresión de respuestas
+
+Crea una base SQLite temporal con N tareas, pide GET /api/tasks con cada
+codificación disponible y muestra el tamaño transferido, el tiempo de la
+petición en el servidor y el tiempo estimado de descarga en enlaces lentos.
+Verifica que el cuerpo descomprimido sea idéntico a la respuesta sin comprimir.
+
+Uso:
+    python bench_compression.py [--rows 2000] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_FILE}'
+os.environ.setdefault('SCHEDULER_ENABLED', 'false')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench-' + uuid.uuid4().hex)
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask_jwt_extended import create_access_token
+from run import app
+from app import db
+from app.models import User, Project, Task
+from app.utils import compression
+
+# Enlaces de referencia (kbit/s)
+LINKS = (('3G lento', 400), ('3G', 1600), ('4G', 10000))
+
+
+def seed(rows):
+    owner = User(email='bench@example.com', password_hash='x', name='Bench Ñandú', role='OWNER')
+    db.session.add(owner)
+    db.session.flush()
+    project = Project(name='Bench', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    db.session.execute(Task.__table__.insert(), [{
+        'id': str(uuid.uuid4()),
+        'project_id': project.id,
+        'title': f'Tarea {i} — revisión',
+        'description': f'Descripción de la tarea {i}. ' * 5,
+        'status': ('pending', 'in_progress', 'done')[i % 3],
+        'priority': 'medium',
+        'created_by': owner.id,
+        'assigned_to': owner.id if i % 2 else None,
+        'due_date': now + timedelta(days=i % 30),
+        'tags': ['backend', f'tag-{i % 7}'],
+        'checklist': [{'id': str(uuid.uuid4()), 'text': 'Paso', 'completed': bool(i % 2)}],
+        'created_at': now - timedelta(seconds=i),
+        'updated_at': now,
+    } for i in range(rows)])
+    db.session.commit()
+    return create_access_token(identity=owner.id, additional_claims={'role': 'OWNER'})
+
+
+def decode(encoding, body):
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br':
+        return compression.brotli.decompress(body)
+    if encoding == 'zstd':
+        if compression._stdlib_zstd is not None:
+            return compression._stdlib_zstd.decompress(body)
+        return compression.zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        token = seed(args.rows)
+
+    client = app.test_client()
+    url = '/api/tasks'
+    baseline = None
+    print(f'{args.rows} tareas, GET {url}, mejor de {args.repeat}\n')
+    print(f'  {"codificación":<12} {"bytes":>10} {"servidor":>10}  ' + '  '.join(f'{name:>9}' for name, _ in LINKS))
+
+    for encoding in ['identity'] + compression.available_encodings():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get(url, headers={'Authorization': f'Bearer {token}', 'Accept-Encoding': encoding})
+            body = response.get_data()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        served = response.headers.get('Content-Encoding', 'identity')
+        plain = decode(served, body)
+        if baseline is None:
+            baseline = plain
+        check = '' if plain == baseline else '  DIFERENTE'
+        transfers = '  '.join(f'{len(body) * 8 / kbps:8.0f}ms' for _, kbps in LINKS)
+        print(f'  {served:<12} {len(body):>10} {best * 1000:8.1f}ms  {transfers}{check}')
+
+
+if __name__ == '__main__':
+    main()
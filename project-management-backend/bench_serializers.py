@@ -0,0 +1,137 @@
+"""
+Benchmark de serialización de listados: marshmallow + jsonify vs encoders precompilados
+
+Crea una base SQLite temporal con N tareas y notificaciones, verifica que las
+respuestas sean idénticas byte a byte y mide:
+  - marshmallow: Task.query.all() + TaskSchema.dump + jsonify (camino anterior)
+  - encoder ORM: Task.query.all() + task_encoder + json_response
+  - encoder Core: filas Core (sin hidratar modelos) + task_encoder + json_response
+
+Uso:
+    python bench_serializers.py [--rows 5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), 'bench.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_FILE}'
+os.environ.setdefault('SCHEDULER_ENABLED', 'false')
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask import jsonify
+from run import app
+from app import db
+from app.models import User, Project, Task, Notification
+from app.schemas import TaskSchema
+from app.schemas.notification_schema import NotificationSchema
+from app.serialization import task_encoder, notification_encoder, json_response
+
+
+def seed(rows):
+    owner = User(email='bench@example.com', password_hash='x', name='Bench Ñandú', role='OWNER')
+    db.session.add(owner)
+    db.session.flush()
+    project = Project(name='Bench', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    db.session.execute(Task.__table__.insert(), [{
+        'id': str(uuid.uuid4()),
+        'project_id': project.id,
+        'title': f'Tarea {i} — revisión',
+        'description': 'Descripción larga ' * 20,
+        'status': ('pending', 'in_progress', 'done')[i % 3],
+        'priority': 'medium',
+        'created_by': owner.id,
+        'assigned_to': owner.id if i % 2 else None,
+        'due_date': now + timedelta(days=i % 30),
+        'start_date': None,
+        'completed_at': now if i % 3 == 2 else None,
+        'tags': ['backend', f'tag-{i % 7}'],
+        'checklist': [{'id': str(uuid.uuid4()), 'text': 'Paso', 'completed': bool(i % 2)}],
+        'created_at': now - timedelta(seconds=i),
+        'updated_at': now,
+    } for i in range(rows)])
+    db.session.execute(Notification.__table__.insert(), [{
+        'id': str(uuid.uuid4()),
+        'user_id': owner.id,
+        'project_id': project.id,
+        'type': 'task_assigned',
+        'message': f'Te asignaron “Tarea {i}”',
+        'read': bool(i % 2),
+        'entity_type': 'task',
+        'entity_id': None,
+        'created_at': now - timedelta(seconds=i),
+        'read_at': None,
+    } for i in range(rows)])
+    db.session.commit()
+    return project.id, owner.id
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        body = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    task_schema = TaskSchema(many=True)
+    notification_schema = NotificationSchema(many=True)
+
+    with app.app_context(), app.test_request_context():
+        db.create_all()
+        project_id, owner_id = seed(args.rows)
+        tasks = Task.query.filter_by(project_id=project_id).order_by(Task.created_at.desc())
+        notifications = Notification.query.filter_by(user_id=owner_id).order_by(Notification.created_at.desc())
+
+        cases = {
+            'tasks': [
+                ('marshmallow', lambda: jsonify({'tasks': task_schema.dump(tasks.all())}).get_data()),
+                ('encoder ORM', lambda: json_response({'tasks': task_encoder.encode_many(tasks.all())})[0].get_data()),
+                ('encoder Core', lambda: json_response({
+                    'tasks': task_encoder.encode_many(tasks.with_entities(*task_encoder.columns()).all())
+                })[0].get_data()),
+            ],
+            'notifications': [
+                ('marshmallow', lambda: jsonify({'notifications': notification_schema.dump(notifications.all())}).get_data()),
+                ('encoder ORM', lambda: json_response({
+                    'notifications': notification_encoder.encode_many(notifications.all())
+                })[0].get_data()),
+                ('encoder Core', lambda: json_response({
+                    'notifications': notification_encoder.encode_many(
+                        notifications.with_entities(*notification_encoder.columns()).all()
+                    )
+                })[0].get_data()),
+            ],
+        }
+
+        print(f'{args.rows} filas, mejor de {args.repeat}')
+        for name, variants in cases.items():
+            baseline_time, baseline_body = timed(variants[0][1], args.repeat)
+            print(f'\n{name} ({len(baseline_body) / 1024:.0f} KiB)')
+            print(f'  {variants[0][0]:<14} {baseline_time * 1000:8.1f} ms')
+            for label, fn in variants[1:]:
+                elapsed, body = timed(fn, args.repeat)
+                identical = 'idéntico' if body == baseline_body else 'DIFERENTE'
+                print(f'  {label:<14} {elapsed * 1000:8.1f} ms  x{baseline_time / elapsed:4.1f}  {identical}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Benchmark de ids VARCHAR(36) vs uuid nativo (PostgreSQL)
+
+Crea dos esquemas con las mismas tablas y los mismos datos (users, projects,
+tasks, comments, con las PK, FK e índices de la aplicación): bench_text con
+ids VARCHAR(36) y bench_uuid con uuid. Muestra el tamaño de tablas e índices
+y el tiempo de ejecución en el servidor (EXPLAIN ANALYZE, mediana de N
+corridas) de los joins y búsquedas por id más frecuentes. Al final compara
+inserciones con ids uuid4 (aleatorios) y uuid7 (ordenados por tiempo, los
+de notifications, audit_logs, team_messages y comments): tiempo y tamaño
+del índice de la PK.
+
+Requiere DATABASE_URL apuntando a un PostgreSQL 13+ (gen_random_uuid). Los
+esquemas se borran al terminar salvo con --keep.
+
+Uso:
+    DATABASE_URL=postgresql://... python bench_uuid.py [--tasks 1000000] [--repeat 7]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app.models.types import uuid7
+
+SCHEMAS = {'bench_text': 'varchar(36)', 'bench_uuid': 'uuid'}
+
+DDL = """
+CREATE TABLE {schema}.users (
+    id {id_type} PRIMARY KEY,
+    name varchar(100) NOT NULL
+);
+CREATE TABLE {schema}.projects (
+    id {id_type} PRIMARY KEY,
+    owner_id {id_type} NOT NULL UNIQUE REFERENCES {schema}.users(id),
+    name varchar(100) NOT NULL
+);
+CREATE TABLE {schema}.tasks (
+    id {id_type} PRIMARY KEY,
+    project_id {id_type} NOT NULL REFERENCES {schema}.projects(id),
+    assigned_to {id_type} REFERENCES {schema}.users(id),
+    created_by {id_type} NOT NULL REFERENCES {schema}.users(id),
+    status varchar(20) NOT NULL,
+    title varchar(200) NOT NULL
+);
+CREATE INDEX ix_tasks_project_id ON {schema}.tasks (project_id);
+CREATE INDEX ix_tasks_assigned_to ON {schema}.tasks (assigned_to);
+CREATE INDEX ix_tasks_created_by ON {schema}.tasks (created_by);
+CREATE TABLE {schema}.comments (
+    id {id_type} PRIMARY KEY,
+    task_id {id_type} NOT NULL REFERENCES {schema}.tasks(id),
+    user_id {id_type} NOT NULL REFERENCES {schema}.users(id),
+    content text NOT NULL
+);
+CREATE INDEX ix_comments_task_id ON {schema}.comments (task_id);
+CREATE INDEX ix_comments_user_id ON {schema}.comments (user_id);
+"""
+
+# Las consultas usan parámetros de texto, igual que la aplicación con psycopg2
+QUERIES = {
+    'tareas del proyecto + asignado': """
+        SELECT t.id, t.title, u.name
+        FROM {schema}.tasks t LEFT JOIN {schema}.users u ON u.id = t.assigned_to
+        WHERE t.project_id = :project_id
+    """,
+    'comentarios por proyecto (3 tablas)': """
+        SELECT p.id, count(c.id)
+        FROM {schema}.projects p
+        JOIN {schema}.tasks t ON t.project_id = p.id
+        JOIN {schema}.comments c ON c.task_id = t.id
+        WHERE p.id = ANY(CAST(:project_ids AS {id_type}[]))
+        GROUP BY p.id
+    """,
+    'hash join comentarios-tareas completo': """
+        SELECT count(*)
+        FROM {schema}.comments c JOIN {schema}.tasks t ON t.id = c.task_id
+        WHERE t.status = 'done'
+    """,
+    '1000 tareas por PK': """
+        SELECT id, status FROM {schema}.tasks WHERE id = ANY(CAST(:task_ids AS {id_type}[]))
+    """,
+}
+
+
+def seed(connection, schema, id_type, args):
+    connection.execute(text(f'DROP SCHEMA IF EXISTS {schema} CASCADE'))
+    connection.execute(text(f'CREATE SCHEMA {schema}'))
+    for statement in DDL.format(schema=schema, id_type=id_type).split(';'):
+        if statement.strip():
+            connection.execute(text(statement))
+
+    if schema == 'bench_uuid':
+        connection.execute(text(f"""
+            INSERT INTO {schema}.users (id, name)
+            SELECT gen_random_uuid(), 'Usuario ' || g FROM generate_series(1, :n) g
+        """), {'n': args.users})
+        connection.execute(text(f"""
+            INSERT INTO {schema}.projects (id, owner_id, name)
+            SELECT gen_random_uuid(), u.id, 'Proyecto ' || u.rn
+            FROM (SELECT id, row_number() OVER () AS rn FROM {schema}.users) u
+            WHERE u.rn <= :n
+        """), {'n': args.projects})
+        connection.execute(text(f"""
+            WITH p AS (SELECT id, row_number() OVER () - 1 AS rn FROM {schema}.projects),
+                 u AS (SELECT id, row_number() OVER () - 1 AS rn FROM {schema}.users)
+            INSERT INTO {schema}.tasks (id, project_id, assigned_to, created_by, status, title)
+            SELECT gen_random_uuid(), p.id, a.id, c.id,
+                   (ARRAY['pending', 'in_progress', 'in_review', 'blocked', 'done'])[1 + g % 5],
+                   'Tarea ' || g
+            FROM generate_series(1, :n) g
+            JOIN p ON p.rn = g % :projects
+            JOIN u a ON a.rn = (g * 7) % :users
+            JOIN u c ON c.rn = (g * 13) % :users
+        """), {'n': args.tasks, 'projects': args.projects, 'users': args.users})
+        connection.execute(text(f"""
+            WITH t AS (SELECT id, row_number() OVER () - 1 AS rn FROM {schema}.tasks),
+                 u AS (SELECT id, row_number() OVER () - 1 AS rn FROM {schema}.users)
+            INSERT INTO {schema}.comments (id, task_id, user_id, content)
+            SELECT gen_random_uuid(), t.id, u.id, 'Comentario ' || g
+            FROM generate_series(1, :n) g
+            JOIN t ON t.rn = (g * 31) % :tasks
+            JOIN u ON u.rn = (g * 17) % :users
+        """), {'n': args.tasks * args.comments_per_task, 'tasks': args.tasks, 'users': args.users})
+    else:
+        # Los mismos ids como texto, para comparar exactamente los mismos datos
+        source = 'bench_uuid'
+        connection.execute(text(f'INSERT INTO {schema}.users SELECT id::text, name FROM {source}.users'))
+        connection.execute(text(f'INSERT INTO {schema}.projects SELECT id::text, owner_id::text, name FROM {source}.projects'))
+        connection.execute(text(f"""
+            INSERT INTO {schema}.tasks
+            SELECT id::text, project_id::text, assigned_to::text, created_by::text, status, title FROM {source}.tasks
+        """))
+        connection.execute(text(f'INSERT INTO {schema}.comments SELECT id::text, task_id::text, user_id::text, content FROM {source}.comments'))
+
+    connection.execute(text(f'VACUUM ANALYZE {schema}.users'))
+    for table in ('projects', 'tasks', 'comments'):
+        connection.execute(text(f'VACUUM ANALYZE {schema}.{table}'))
+
+
+def sizes(connection, schema):
+    tables = connection.execute(text("""
+        SELECT c.relname AS name, pg_table_size(c.oid) AS heap, pg_indexes_size(c.oid) AS indexes
+        FROM pg_class c
+        WHERE c.relnamespace = CAST(:schema AS regnamespace) AND c.relkind = 'r'
+        ORDER BY c.relname
+    """), {'schema': schema}).fetchall()
+    indexes = connection.execute(text("""
+        SELECT i.relname AS name, pg_relation_size(i.oid) AS size
+        FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE i.relnamespace = CAST(:schema AS regnamespace)
+        ORDER BY i.relname
+    """), {'schema': schema}).fetchall()
+    return {row.name: (row.heap, row.indexes) for row in tables}, {row.name: row.size for row in indexes}
+
+
+def execution_ms(connection, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        plan = connection.execute(text(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}'), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        timings.append(plan[0]['Execution Time'])
+    return statistics.median(timings)
+
+
+def insert_ids(connection, generator, rows, batch_size=1000):
+    """Insertar filas con ids de generator en una tabla con PK uuid; (segundos, tamaño de la PK)"""
+    connection.execute(text('DROP TABLE IF EXISTS bench_uuid.inserts'))
+    connection.execute(text(
+        'CREATE TABLE bench_uuid.inserts (id uuid PRIMARY KEY, created_at timestamp NOT NULL DEFAULT now())'
+    ))
+    started = time.perf_counter()
+    for start in range(0, rows, batch_size):
+        batch = [{'id': generator()} for _ in range(min(batch_size, rows - start))]
+        connection.execute(text('INSERT INTO bench_uuid.inserts (id) VALUES (CAST(:id AS uuid))'), batch)
+    elapsed = time.perf_counter() - started
+    size = connection.execute(text("SELECT pg_relation_size('bench_uuid.inserts_pkey')")).scalar()
+    return elapsed, size
+
+
+def mb(value):
+    return f'{value / 1024 / 1024:9.1f} MB'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--tasks', type=int, default=1000000)
+    parser.add_argument('--comments-per-task', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--inserts', type=int, default=200000, help='Filas de la prueba uuid4 vs uuid7 (0 = omitir)')
+    parser.add_argument('--keep', action='store_true', help='No borrar los esquemas al terminar')
+    args = parser.parse_args()
+
+    url = os.getenv('DATABASE_URL', '')
+    if not url.startswith(('postgres://', 'postgresql')):
+        print('DATABASE_URL debe apuntar a PostgreSQL: en SQLite los ids siguen siendo texto')
+        sys.exit(2)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+
+    engine = create_engine(url, isolation_level='AUTOCOMMIT')
+    with engine.connect() as connection:
+        print(f'Sembrando {args.users} usuarios, {args.projects} proyectos, {args.tasks} tareas, '
+              f'{args.tasks * args.comments_per_task} comentarios...')
+        for schema in ('bench_uuid', 'bench_text'):
+            seed(connection, schema, SCHEMAS[schema], args)
+
+        print('\nTamaño en disco (heap / índices)')
+        text_tables, text_indexes = sizes(connection, 'bench_text')
+        uuid_tables, uuid_indexes = sizes(connection, 'bench_uuid')
+        print(f'  {"tabla":<12} {"varchar heap":>13} {"uuid heap":>13} {"varchar idx":>13} {"uuid idx":>13}  ahorro idx')
+        for table, (heap, indexes) in text_tables.items():
+            uuid_heap, uuid_idx = uuid_tables[table]
+            print(f'  {table:<12} {mb(heap)} {mb(uuid_heap)} {mb(indexes)} {mb(uuid_idx)}  {100 * (1 - uuid_idx / indexes):5.1f}%')
+        print('\n  índice' + ' ' * 22 + 'varchar        uuid')
+        for name, size in text_indexes.items():
+            print(f'  {name:<26} {mb(size)} {mb(uuid_indexes.get(name, 0))}')
+
+        sample = connection.execute(text(
+            'SELECT id::text FROM bench_uuid.projects ORDER BY id LIMIT 20'
+        )).scalars().all()
+        task_ids = connection.execute(text(
+            'SELECT id::text FROM bench_uuid.tasks TABLESAMPLE SYSTEM (1) LIMIT 1000'
+        )).scalars().all()
+        params = {'project_id': sample[0], 'project_ids': sample, 'task_ids': task_ids}
+
+        print(f'\nTiempo de ejecución en el servidor (mediana de {args.repeat}, ms)')
+        print(f'  {"consulta":<40} {"varchar":>9} {"uuid":>9}  mejora')
+        for name, sql in QUERIES.items():
+            results = {}
+            for schema, id_type in SCHEMAS.items():
+                statement = sql.format(schema=schema, id_type=id_type)
+                execution_ms(connection, statement, params, 1)  # calentar caché
+                results[schema] = execution_ms(connection, statement, params, args.repeat)
+            text_ms, uuid_ms = results['bench_text'], results['bench_uuid']
+            print(f'  {name:<40} {text_ms:9.2f} {uuid_ms:9.2f}  {text_ms / uuid_ms if uuid_ms else 0:5.2f}x')
+
+        if args.inserts:
+            print(f'\nInserción de {args.inserts} filas (lotes de 1000) en una tabla con PK uuid')
+            for name, generator in (('uuid4', lambda: str(uuid.uuid4())), ('uuid7', uuid7)):
+                elapsed, size = insert_ids(connection, generator, args.inserts)
+                print(f'  {name}: {elapsed:6.1f}s  {args.inserts / elapsed:8.0f} filas/s  PK {mb(size)}')
+
+        if not args.keep:
+            for schema in SCHEMAS:
+                connection.execute(text(f'DROP SCHEMA {schema} CASCADE'))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv, find_dotenv
 from datetime import timedelta
+from app.config.database import EngineOptions, default_profile, replica_binds
 
 _dotenv_path = find_dotenv('.env.local', usecwd=True)
 if _dotenv_path:
@@ -40,6 +41,17 @@ class Config:
         SQLALCHEMY_DATABASE_URI = 'sqlite:///app.db'
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Pool de conexiones: perfil por entorno + overrides DB_* (ver app/config/database.py)
+    DB_PROFILE = default_profile(SQLALCHEMY_DATABASE_URI)
+    DB_ENGINE_OPTIONS = EngineOptions.from_env(DB_PROFILE)
+    SQLALCHEMY_ENGINE_OPTIONS = DB_ENGINE_OPTIONS.engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Réplica de lectura opcional (endpoints con @read_replica, ver app/db_routing.py)
+    SQLALCHEMY_REPLICA_URI = _normalize_database_url(os.getenv('DATABASE_REPLICA_URL'))
+    SQLALCHEMY_BINDS = replica_binds(SQLALCHEMY_REPLICA_URI, DB_ENGINE_OPTIONS)
+    # Tras una escritura, el usuario lee del primario durante esta ventana
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
     SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'false').lower() == 'true'
     
     # JWT Configuration
@@ -53,6 +65,42 @@ class Config:
     JWT_BLACKLIST_ENABLED = False  # Por ahora deshabilitado
     JWT_BLACKLIST_TOKEN_CHECKS = ['access', 'refresh']
 
+    # Scheduler en proceso (cierre automático de sprints, etc.)
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    SCHEDULER_TICK_SECONDS = int(os.getenv('SCHEDULER_TICK_SECONDS', '30'))
+    SCHEDULER_LEADER_RETRY_SECONDS = int(os.getenv('SCHEDULER_LEADER_RETRY_SECONDS', '60'))
+
+    # Eliminación de proyectos en segundo plano
+    PROJECT_DELETE_BATCH_SIZE = int(os.getenv('PROJECT_DELETE_BATCH_SIZE', '1000'))
+    PROJECT_DELETE_SLICE_SECONDS = float(os.getenv('PROJECT_DELETE_SLICE_SECONDS', '2'))
+
+    # Caché en memoria de los últimos mensajes del chat (por proyecto, LRU)
+    CHAT_TAIL_CACHE_SIZE = int(os.getenv('CHAT_TAIL_CACHE_SIZE', '100'))
+    CHAT_TAIL_CACHE_PROJECTS = int(os.getenv('CHAT_TAIL_CACHE_PROJECTS', '256'))
+
+    # GET condicionales (ETag / If-None-Match) en los endpoints de polling
+    ETAGS_ENABLED = os.getenv('ETAGS_ENABLED', 'true').lower() == 'true'
+
+    # Caché de lecturas de servicios (local | redis | none)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'local')
+    CACHE_DEFAULT_TTL = int(os.getenv('CACHE_DEFAULT_TTL', '30'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2048'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'pm:cache:')
+
+    # Compresión de respuestas (gzip siempre; br/zstd si están instalados)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_ALGORITHMS = tuple(
+        name.strip() for name in os.getenv('COMPRESSION_ALGORITHMS', 'zstd,br,gzip').split(',') if name.strip()
+    )
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv('COMPRESSION_BROTLI_LEVEL', '5'))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv('COMPRESSION_ZSTD_LEVEL', '3'))
+
+    # Dashboard: threads para las consultas en paralelo (1 = secuencial)
+    DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', '4'))
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -63,11 +111,22 @@ class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SQLALCHEMY_ECHO = False
+    DB_PROFILE = 'production'
+    DB_ENGINE_OPTIONS = EngineOptions.from_env(DB_PROFILE)
+    SQLALCHEMY_ENGINE_OPTIONS = DB_ENGINE_OPTIONS.engine_options(Config.SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = replica_binds(Config.SQLALCHEMY_REPLICA_URI, DB_ENGINE_OPTIONS)
 
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+    SCHEDULER_ENABLED = False
+    DB_PROFILE = 'testing'
+    DB_ENGINE_OPTIONS = EngineOptions.from_env(DB_PROFILE)
+    SQLALCHEMY_ENGINE_OPTIONS = DB_ENGINE_OPTIONS.engine_options(SQLALCHEMY_DATABASE_URI)
+    # Una segunda base local hace de réplica; se copia con replica_router.sync_from_primary()
+    SQLALCHEMY_REPLICA_URI = os.getenv('TEST_REPLICA_DATABASE_URL', 'sqlite:///test_replica.db')
+    SQLALCHEMY_BINDS = replica_binds(SQLALCHEMY_REPLICA_URI, DB_ENGINE_OPTIONS)
 
 
 config = {
@@ -0,0 +1,180 @@
+"""
+Prueba de carga del pool de conexiones
+
+Simula un worker de gunicorn gthread: N threads hacen peticiones en paralelo
+(mezcla de lecturas del dashboard/listados y algunas escrituras) durante un
+tiempo fijo, usando la configuración de pool del perfil activo. Al final
+muestra latencias, el máximo de conexiones en uso/overflow, la espera de
+checkout y los timeouts del pool. Sale con código 1 si el pool se agotó o
+hubo errores 5xx.
+
+Por defecto usa una base SQLite temporal; con DATABASE_URL apunta a otra base
+(p. ej. un Postgres de staging, con DB_PROFILE=production).
+
+Uso:
+    python loadtest_pool.py [--threads 8] [--seconds 20] [--tasks 500] [--write-ratio 0.05]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+if not os.getenv('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(tempfile.mkdtemp(), "loadtest.db")}'
+os.environ.setdefault('SCHEDULER_ENABLED', 'false')
+os.environ.setdefault('JWT_SECRET_KEY', 'loadtest-' + uuid.uuid4().hex)
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask_jwt_extended import create_access_token
+from run import app
+from app import db
+from app.models import User, Project, Membership, Task
+from app.utils.pool_metrics import pool_metrics
+
+READ_PATHS = (
+    '/api/dashboard',
+    '/api/tasks',
+    '/api/members',
+    '/api/sprints',
+    '/api/notifications/unread-count',
+    '/api/projects/settings',
+)
+BATCH_BODY = {'requests': [{'id': path, 'path': path} for path in READ_PATHS[1:]]}
+
+
+def seed(tasks, employees):
+    suffix = uuid.uuid4().hex[:8]
+    owner = User(email=f'loadtest-{suffix}@example.com', password_hash='x', name='Load Owner', role='OWNER')
+    db.session.add(owner)
+    db.session.flush()
+    project = Project(name='Load test', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+
+    tokens = [create_access_token(identity=owner.id, additional_claims={'role': 'OWNER'})]
+    member_ids = []
+    for i in range(employees):
+        user = User(email=f'loadtest-{suffix}-{i}@example.com', password_hash='x', name=f'Empleado {i}', role='EMPLOYEE')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Membership(user_id=user.id, project_id=project.id, role='EMPLOYEE'))
+        member_ids.append(user.id)
+        tokens.append(create_access_token(identity=user.id, additional_claims={'role': 'EMPLOYEE'}))
+
+    now = datetime.utcnow()
+    task_ids = [str(uuid.uuid4()) for _ in range(tasks)]
+    db.session.execute(Task.__table__.insert(), [{
+        'id': task_id,
+        'project_id': project.id,
+        'title': f'Tarea {i}',
+        'description': 'Carga',
+        'status': 'pending',
+        'priority': 'medium',
+        'created_by': owner.id,
+        'assigned_to': member_ids[i % len(member_ids)] if member_ids else None,
+        'due_date': now + timedelta(days=(i % 20) - 5),
+        'tags': [],
+        'checklist': [],
+        'created_at': now,
+        'updated_at': now,
+    } for i, task_id in enumerate(task_ids)])
+    db.session.commit()
+    return tokens, task_ids
+
+
+def worker(deadline, tokens, task_ids, write_ratio, results, lock):
+    client = app.test_client()
+    latencies = []
+    statuses = Counter()
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        headers = {'Authorization': f'Bearer {rng.choice(tokens)}'}
+        roll = rng.random()
+        start = time.perf_counter()
+        if roll < write_ratio:
+            response = client.patch(
+                f'/api/tasks/{rng.choice(task_ids)}',
+                json={'priority': rng.choice(['low', 'medium', 'high'])},
+                headers={'Authorization': f'Bearer {tokens[0]}'}
+            )
+        elif roll < write_ratio + 0.1:
+            response = client.post('/api/batch', json=BATCH_BODY, headers=headers)
+        else:
+            response = client.get(rng.choice(READ_PATHS), headers=headers)
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] += 1
+        response.close()
+    with lock:
+        results['latencies'].extend(latencies)
+        results['statuses'].update(statuses)
+
+
+def percentile(values, fraction):
+    return values[max(int(len(values) * fraction) - 1, 0)] * 1000 if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=int(os.getenv('GUNICORN_THREADS', '8')))
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--employees', type=int, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.05)
+    args = parser.parse_args()
+
+    with app.app_context(), contextlib.redirect_stdout(io.StringIO()):
+        db.create_all()
+        tokens, task_ids = seed(args.tasks, args.employees)
+        pool = db.engine.pool
+
+    options = app.config['DB_ENGINE_OPTIONS']
+    print(f'Perfil {app.config["DB_PROFILE"]}: pool_size={options.pool_size} max_overflow={options.max_overflow} '
+          f'pool_timeout={options.pool_timeout}s, {args.threads} threads, {args.seconds:.0f}s')
+
+    pool_metrics.reset()
+    results = {'latencies': [], 'statuses': Counter()}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(deadline, tokens, task_ids, args.write_ratio, results, lock))
+        for _ in range(args.threads)
+    ]
+    started = time.perf_counter()
+    # El log de cada petición (before_request) iría a stdout: se descarta durante la carga
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(results['latencies'])
+    stats = pool_metrics.snapshot(pool)
+    server_errors = sum(count for status, count in results['statuses'].items() if status >= 500)
+
+    print(f'\n{len(latencies)} peticiones, {len(latencies) / elapsed:.0f} req/s')
+    print(f'  status: {dict(sorted(results["statuses"].items()))}')
+    print(f'  latencia ms: p50 {percentile(latencies, 0.5):.1f}  p95 {percentile(latencies, 0.95):.1f}  '
+          f'p99 {percentile(latencies, 0.99):.1f}  max {percentile(latencies, 1.0):.1f}')
+    print(f'\nPool: {stats["checkouts"]} checkouts, en uso máx {stats["checked_out_max"]}/{stats.get("size")}, '
+          f'overflow máx {stats["overflow_max"]}/{stats.get("max_overflow")}')
+    print(f'  espera de checkout ms: avg {stats["wait_ms"]["avg"]}  p95 {stats["wait_ms"]["p95"]}  max {stats["wait_ms"]["max"]}')
+    print(f'  timeouts del pool: {stats["timeouts"]}')
+
+    if stats['timeouts'] or server_errors:
+        print('\nFALLA: el pool se agotó o hubo errores 5xx')
+        sys.exit(1)
+    print('\nOK: sin agotamiento del pool')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Add normalized tags and task_tags tables
+
+Revision ID: a6c8e0b2d4f7
+Revises: f4b2d6e8a1c3
+Create Date: 2026-10-19
+
+"""
+
+import json
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a6c8e0b2d4f7'
+down_revision = 'f4b2d6e8a1c3'
+branch_labels = None
+depends_on = None
+
+TAG_MAX_LENGTH = 100
+BATCH_SIZE = 1000
+
+
+def _normalize(values):
+    result = {}
+    for value in values or []:
+        name = str(value).strip().lower()[:TAG_MAX_LENGTH]
+        if name and name not in result:
+            result[name] = str(value).strip()[:TAG_MAX_LENGTH]
+    return result
+
+
+def upgrade():
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('label', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_tags_project_id_projects', ondelete='CASCADE'),
+        sa.UniqueConstraint('project_id', 'name', name='uq_tags_project_name'),
+    )
+    op.create_table(
+        'task_tags',
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.PrimaryKeyConstraint('tag_id', 'task_id', name='pk_task_tags'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], name='fk_task_tags_tag_id_tags', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], name='fk_task_tags_task_id_tasks', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_task_tags_project_id_projects', ondelete='CASCADE'),
+    )
+    op.create_index('ix_task_tags_task_id', 'task_tags', ['task_id'])
+    op.create_index('ix_task_tags_project_tag', 'task_tags', ['project_id', 'tag_id'])
+
+    # Backfill desde tasks.tags (JSON), por lotes
+    bind = op.get_bind()
+    tags_table = sa.table(
+        'tags',
+        sa.column('id', sa.Integer), sa.column('project_id', sa.String), sa.column('name', sa.String),
+        sa.column('label', sa.String), sa.column('created_at', sa.DateTime)
+    )
+    task_tags_table = sa.table(
+        'task_tags',
+        sa.column('tag_id', sa.Integer), sa.column('task_id', sa.String), sa.column('project_id', sa.String)
+    )
+
+    tag_ids = {}
+    now = datetime.utcnow()
+    result = bind.execution_options(stream_results=True).execute(
+        sa.text('SELECT id, project_id, tags FROM tasks WHERE tags IS NOT NULL')
+    )
+    while True:
+        rows = result.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        links = []
+        for task_id, project_id, tags in rows:
+            if isinstance(tags, str):
+                try:
+                    tags = json.loads(tags)
+                except ValueError:
+                    continue
+            if not isinstance(tags, list):
+                continue
+            for name, label in _normalize(tags).items():
+                key = (project_id, name)
+                if key not in tag_ids:
+                    tag_ids[key] = bind.execute(
+                        tags_table.insert().values(project_id=project_id, name=name, label=label, created_at=now)
+                    ).inserted_primary_key[0]
+                links.append({'tag_id': tag_ids[key], 'task_id': task_id, 'project_id': project_id})
+        if links:
+            bind.execute(task_tags_table.insert(), links)
+
+
+def downgrade():
+    op.drop_index('ix_task_tags_project_tag', table_name='task_tags')
+    op.drop_index('ix_task_tags_task_id', table_name='task_tags')
+    op.drop_table('task_tags')
+    op.drop_table('tags')
@@ -0,0 +1,40 @@
+"""Add sprint_snapshots table
+
+Revision ID: b5e8f1a2c3d4
+Revises: 48b30321d2db
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b5e8f1a2c3d4'
+down_revision = '48b30321d2db'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sprint_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('sprint_id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('remaining_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['sprint_id'], ['sprints.id'], name='fk_sprint_snapshots_sprint_id_sprints', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_sprint_snapshots_project_id_projects', ondelete='CASCADE'),
+        sa.UniqueConstraint('sprint_id', 'day', name='uq_sprint_snapshots_sprint_day'),
+    )
+    op.create_index('ix_sprint_snapshots_project_id', 'sprint_snapshots', ['project_id'])
+
+
+def downgrade():
+    op.drop_index('ix_sprint_snapshots_project_id', table_name='sprint_snapshots')
+    op.drop_table('sprint_snapshots')
@@ -0,0 +1,23 @@
+"""Add (project_id, created_at, id) index on team_messages
+
+Revision ID: b7d9f1a3c5e8
+Revises: a6c8e0b2d4f7
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+
+
+revision = 'b7d9f1a3c5e8'
+down_revision = 'a6c8e0b2d4f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_team_messages_project_created', 'team_messages', ['project_id', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_team_messages_project_created', table_name='team_messages')
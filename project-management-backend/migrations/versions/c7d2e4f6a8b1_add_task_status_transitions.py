@@ -0,0 +1,92 @@
+"""Add task_status_transitions and task_flow_daily tables
+
+Revision ID: c7d2e4f6a8b1
+Revises: b5e8f1a2c3d4
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c7d2e4f6a8b1'
+down_revision = 'b5e8f1a2c3d4'
+branch_labels = None
+depends_on = None
+
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    transitions = op.create_table(
+        'task_status_transitions',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('task_id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('changed_by', sa.String(length=36), nullable=True),
+        sa.Column('from_status', sa.String(length=20), nullable=True),
+        sa.Column('to_status', sa.String(length=20), nullable=True),
+        sa.Column('lead_seconds', sa.Integer(), nullable=True),
+        sa.Column('cycle_seconds', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_task_status_transitions_project_id_projects', ondelete='CASCADE'),
+    )
+    op.create_index('ix_task_status_transitions_task_id', 'task_status_transitions', ['task_id'])
+    op.create_index('ix_task_status_transitions_project_created', 'task_status_transitions', ['project_id', 'created_at'])
+
+    op.create_table(
+        'task_flow_daily',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('task_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_task_flow_daily_project_id_projects', ondelete='CASCADE'),
+        sa.UniqueConstraint('project_id', 'day', 'status', name='uq_task_flow_daily_project_day_status'),
+    )
+    op.create_index('ix_task_flow_daily_day', 'task_flow_daily', ['day'])
+
+    # Backfill aproximado: creación como 'pending' y, si la tarea ya avanzó,
+    # un cambio a su estado actual (completed_at para 'done', updated_at para el resto).
+    # El rollup diario se genera en el primer arranque del scheduler.
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        'SELECT id, project_id, status, created_at, updated_at, completed_at FROM tasks'
+    ))
+    rows = []
+    for task_id, project_id, status, created_at, updated_at, completed_at in result:
+        rows.append({
+            'task_id': task_id,
+            'project_id': project_id,
+            'from_status': None,
+            'to_status': 'pending',
+            'created_at': created_at
+        })
+        if status != 'pending':
+            changed_at = (completed_at if status == 'done' else updated_at) or created_at
+            lead_seconds = None
+            if status == 'done':
+                lead_seconds = max(int((changed_at - created_at).total_seconds()), 0)
+            rows.append({
+                'task_id': task_id,
+                'project_id': project_id,
+                'from_status': 'pending',
+                'to_status': status,
+                'lead_seconds': lead_seconds,
+                'created_at': changed_at
+            })
+        if len(rows) >= BATCH_SIZE:
+            op.bulk_insert(transitions, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(transitions, rows)
+
+
+def downgrade():
+    op.drop_index('ix_task_flow_daily_day', table_name='task_flow_daily')
+    op.drop_table('task_flow_daily')
+    op.drop_index('ix_task_status_transitions_project_created', table_name='task_status_transitions')
+    op.drop_index('ix_task_status_transitions_task_id', table_name='task_status_transitions')
+    op.drop_table('task_status_transitions')
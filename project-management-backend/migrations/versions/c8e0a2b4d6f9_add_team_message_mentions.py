@@ -0,0 +1,47 @@
+"""Add team_message_mentions table for multiple chat mentions
+
+Revision ID: c8e0a2b4d6f9
+Revises: b7d9f1a3c5e8
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c8e0a2b4d6f9'
+down_revision = 'b7d9f1a3c5e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'team_message_mentions',
+        sa.Column('message_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('message_id', 'user_id', name='pk_team_message_mentions'),
+        sa.ForeignKeyConstraint(['message_id'], ['team_messages.id'], name='fk_team_message_mentions_message_id_team_messages', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_team_message_mentions_user_id_users', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_team_message_mentions_project_id_projects', ondelete='CASCADE'),
+    )
+    op.create_index('ix_team_message_mentions_user', 'team_message_mentions', ['user_id', 'created_at'])
+    op.create_index('ix_team_message_mentions_project', 'team_message_mentions', ['project_id'])
+
+    # Backfill: la mención única existente pasa a ser una mención directa
+    op.execute("""
+        INSERT INTO team_message_mentions (message_id, user_id, project_id, kind, created_at)
+        SELECT id, mentioned_user_id, project_id, 'user', created_at
+        FROM team_messages
+        WHERE mentioned_user_id IS NOT NULL AND mentioned_user_id <> user_id
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_team_message_mentions_project', table_name='team_message_mentions')
+    op.drop_index('ix_team_message_mentions_user', table_name='team_message_mentions')
+    op.drop_table('team_message_mentions')
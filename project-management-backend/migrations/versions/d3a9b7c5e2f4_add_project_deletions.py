@@ -0,0 +1,51 @@
+"""Add project_deletions table and 'deleting' project status
+
+Revision ID: d3a9b7c5e2f4
+Revises: c7d2e4f6a8b1
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd3a9b7c5e2f4'
+down_revision = 'c7d2e4f6a8b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # ADD VALUE no puede ejecutarse dentro de un bloque de transacción en PostgreSQL < 12
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE project_status ADD VALUE IF NOT EXISTS 'deleting'")
+
+    op.create_table(
+        'project_deletions',
+        sa.Column('id', sa.String(length=36), primary_key=True, nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('project_name', sa.String(length=255), nullable=True),
+        sa.Column('requested_by', sa.String(length=36), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('current_step', sa.String(length=50), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('processed_rows', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('details', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], name='fk_project_deletions_requested_by_users', ondelete='SET NULL'),
+    )
+    op.create_index('ix_project_deletions_project_id', 'project_deletions', ['project_id'])
+    op.create_index('ix_project_deletions_status', 'project_deletions', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_project_deletions_status', table_name='project_deletions')
+    op.drop_index('ix_project_deletions_project_id', table_name='project_deletions')
+    op.drop_table('project_deletions')
+    # PostgreSQL no permite quitar valores de un ENUM; 'deleting' se conserva
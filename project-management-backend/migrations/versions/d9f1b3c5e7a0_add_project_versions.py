@@ -0,0 +1,41 @@
+"""Add project_versions counters per project and domain
+
+Revision ID: d9f1b3c5e7a0
+Revises: c8e0a2b4d6f9
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd9f1b3c5e7a0'
+down_revision = 'c8e0a2b4d6f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'project_versions',
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('tasks', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('members', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('sprints', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('chat', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('settings', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('project_id', name='pk_project_versions'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_project_versions_project_id_projects', ondelete='CASCADE'),
+    )
+
+    # Una fila por proyecto existente; las nuevas se crean con la primera escritura
+    op.execute("""
+        INSERT INTO project_versions (project_id, tasks, members, sprints, chat, settings, updated_at)
+        SELECT id, 0, 0, 0, 0, 0, CURRENT_TIMESTAMP FROM projects
+    """)
+
+
+def downgrade():
+    op.drop_table('project_versions')
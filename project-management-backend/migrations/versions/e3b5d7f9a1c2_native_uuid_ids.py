@@ -0,0 +1,93 @@
+"""Native uuid columns for ids and references (PostgreSQL)
+
+Revision ID: e3b5d7f9a1c2
+Revises: d9f1b3c5e7a0
+Create Date: 2026-10-19
+
+Camino offline: ALTER COLUMN ... TYPE uuid reescribe las tablas con lock
+exclusivo. En bases grandes correr antes `flask uuid prepare|backfill|index|
+swap|validate` (conversión en línea); esta migración solo convierte las
+columnas que sigan en texto, así que después solo registra la revisión.
+En SQLite no hace nada: los ids siguen siendo VARCHAR(36).
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+
+revision = 'e3b5d7f9a1c2'
+down_revision = 'd9f1b3c5e7a0'
+branch_labels = None
+depends_on = None
+
+# Mismas columnas que usan GUID en los modelos (entity_id queda en texto: es polimórfico)
+UUID_COLUMNS = {
+    'users': ('id',),
+    'projects': ('id', 'owner_id'),
+    'memberships': ('id', 'user_id', 'project_id'),
+    'sprints': ('id', 'project_id'),
+    'tasks': ('id', 'project_id', 'sprint_id', 'assigned_to', 'created_by'),
+    'invites': ('id', 'project_id', 'invited_by'),
+    'notifications': ('id', 'user_id', 'project_id'),
+    'comments': ('id', 'task_id', 'user_id'),
+    'audit_logs': ('id', 'user_id', 'project_id'),
+    'team_messages': ('id', 'project_id', 'user_id', 'task_id', 'mentioned_user_id'),
+    'team_message_mentions': ('message_id', 'user_id', 'project_id'),
+    'sprint_snapshots': ('sprint_id', 'project_id'),
+    'task_status_transitions': ('task_id', 'project_id', 'changed_by'),
+    'task_flow_daily': ('project_id',),
+    'project_deletions': ('id', 'project_id', 'requested_by'),
+    'project_versions': ('project_id',),
+    'search_documents': ('project_id', 'task_id', 'author_id', 'acl_user_id'),
+    'tags': ('project_id',),
+    'task_tags': ('task_id', 'project_id'),
+}
+
+
+def _columns_with_type(bind, data_type):
+    rows = bind.execute(text("""
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND data_type = :data_type
+    """), {'data_type': data_type}).fetchall()
+    found = {}
+    for table, column in rows:
+        if column in UUID_COLUMNS.get(table, ()):
+            found.setdefault(table, []).append(column)
+    return found
+
+
+def _convert(bind, columns, target_type, using):
+    if not columns:
+        return
+    tables = list(columns)
+    # Las FK no admiten tipos distintos a cada lado: se recrean después del cambio
+    foreign_keys = bind.execute(text("""
+        SELECT c.conname AS name, c.conrelid::regclass::text AS table_name, pg_get_constraintdef(c.oid) AS definition
+        FROM pg_constraint c
+        WHERE c.contype = 'f'
+          AND (c.conrelid = ANY(CAST(:tables AS regclass[])) OR c.confrelid = ANY(CAST(:tables AS regclass[])))
+    """), {'tables': tables}).fetchall()
+    for fk in foreign_keys:
+        op.execute(f'ALTER TABLE {fk.table_name} DROP CONSTRAINT {fk.name}')
+
+    for table, names in columns.items():
+        alters = ', '.join(f'ALTER COLUMN {name} TYPE {target_type} USING {using.format(name)}' for name in names)
+        op.execute(f'ALTER TABLE {table} {alters}')
+
+    for fk in foreign_keys:
+        op.execute(f'ALTER TABLE {fk.table_name} ADD CONSTRAINT {fk.name} {fk.definition}')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    _convert(bind, _columns_with_type(bind, 'character varying'), 'uuid', '{}::uuid')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    _convert(bind, _columns_with_type(bind, 'uuid'), 'varchar(36)', '{}::text')
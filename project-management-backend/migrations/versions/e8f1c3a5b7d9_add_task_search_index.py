@@ -0,0 +1,76 @@
+"""Add full-text search index for tasks
+
+Revision ID: e8f1c3a5b7d9
+Revises: d3a9b7c5e2f4
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+
+
+revision = 'e8f1c3a5b7d9'
+down_revision = 'd3a9b7c5e2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+        op.execute("""
+            DO $$
+            BEGIN
+              IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+                CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+                ALTER TEXT SEARCH CONFIGURATION es_unaccent
+                  ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+              END IF;
+            END $$;
+        """)
+        op.execute("""
+            ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+              GENERATED ALWAYS AS (
+                setweight(to_tsvector('es_unaccent'::regconfig, coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent'::regconfig, coalesce(description, '')), 'B')
+              ) STORED
+        """)
+        op.execute('CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)')
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+              title, description,
+              content='tasks', content_rowid='rowid',
+              tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+              INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+              INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+              INSERT INTO tasks_fts(tasks_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+              INSERT INTO tasks_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+            END
+        """)
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_tasks_search_vector')
+        op.execute('ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector')
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('tasks_fts_ai', 'tasks_fts_ad', 'tasks_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS tasks_fts')
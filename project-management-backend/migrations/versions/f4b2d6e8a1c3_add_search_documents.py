@@ -0,0 +1,112 @@
+"""Add search_documents table for unified project search
+
+Revision ID: f4b2d6e8a1c3
+Revises: e8f1c3a5b7d9
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f4b2d6e8a1c3'
+down_revision = 'e8f1c3a5b7d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'search_documents',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True, nullable=False),
+        sa.Column('project_id', sa.String(length=36), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.String(length=36), nullable=False),
+        sa.Column('task_id', sa.String(length=36), nullable=True),
+        sa.Column('author_id', sa.String(length=36), nullable=True),
+        sa.Column('acl_user_id', sa.String(length=36), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('body', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_search_documents_project_id_projects', ondelete='CASCADE'),
+        sa.UniqueConstraint('project_id', 'entity_type', 'entity_id', name='uq_search_documents_entity'),
+    )
+    op.create_index('ix_search_documents_task_id', 'search_documents', ['task_id'])
+
+    # Backfill desde las tablas de origen (las etiquetas de tareas se agregan
+    # con `flask search reindex`)
+    op.execute("""
+        INSERT INTO search_documents (project_id, entity_type, entity_id, task_id, author_id, acl_user_id, title, body, created_at, updated_at)
+        SELECT project_id, 'task', id, id, created_by, assigned_to, title, description, created_at, coalesce(updated_at, created_at)
+        FROM tasks
+    """)
+    op.execute("""
+        INSERT INTO search_documents (project_id, entity_type, entity_id, task_id, author_id, acl_user_id, title, body, created_at, updated_at)
+        SELECT t.project_id, 'comment', c.id, c.task_id, c.user_id, t.assigned_to, NULL, c.content, c.created_at, coalesce(c.updated_at, c.created_at)
+        FROM comments c JOIN tasks t ON t.id = c.task_id
+    """)
+    op.execute("""
+        INSERT INTO search_documents (project_id, entity_type, entity_id, task_id, author_id, acl_user_id, title, body, created_at, updated_at)
+        SELECT project_id, 'message', id, task_id, user_id, NULL, NULL, content, created_at, coalesce(updated_at, created_at)
+        FROM team_messages
+    """)
+    op.execute("""
+        INSERT INTO search_documents (project_id, entity_type, entity_id, task_id, author_id, acl_user_id, title, body, created_at, updated_at)
+        SELECT m.project_id, 'member', u.id, NULL, u.id, NULL, u.name,
+               coalesce(u.email, '') || ' ' || coalesce(u.job_title, '') || ' ' || coalesce(u.department, '') || ' ' ||
+               coalesce(u.skills, '') || ' ' || coalesce(u.responsibilities, '') || ' ' || coalesce(u.description, ''),
+               m.created_at, m.created_at
+        FROM memberships m JOIN users u ON u.id = m.user_id
+        WHERE m.status = 'active'
+    """)
+
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Requiere la configuración es_unaccent creada en e8f1c3a5b7d9
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+        op.execute("""
+            ALTER TABLE search_documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+              GENERATED ALWAYS AS (
+                setweight(to_tsvector('es_unaccent'::regconfig, coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('es_unaccent'::regconfig, coalesce(body, '')), 'B')
+              ) STORED
+        """)
+        op.execute('CREATE INDEX IF NOT EXISTS ix_search_documents_vector ON search_documents USING GIN (project_id, search_vector)')
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5(
+              title, body,
+              content='search_documents', content_rowid='id',
+              tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS search_documents_fts_ai AFTER INSERT ON search_documents BEGIN
+              INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS search_documents_fts_ad AFTER DELETE ON search_documents BEGIN
+              INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER IF NOT EXISTS search_documents_fts_au AFTER UPDATE OF title, body ON search_documents BEGIN
+              INSERT INTO search_documents_fts(search_documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+              INSERT INTO search_documents_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+            END
+        """)
+        op.execute("INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('search_documents_fts_ai', 'search_documents_fts_ad', 'search_documents_fts_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS search_documents_fts')
+    op.drop_index('ix_search_documents_task_id', table_name='search_documents')
+    op.drop_table('search_documents')
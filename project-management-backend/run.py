@@ -53,7 +53,7 @@ def log_request():
 from app.models import User, Project, Membership, Task, Sprint, Invite, Notification, Comment, AuditLog, TeamMessage
 
 # Importar rutas
-from app.routes import auth_bp, projects_bp, invites_bp, members_bp, tasks_bp, sprints_bp, notifications_bp, comments_bp, admin_bp, team_chat_bp
+from app.routes import auth_bp, projects_bp, invites_bp, members_bp, tasks_bp, sprints_bp, notifications_bp, comments_bp, admin_bp, team_chat_bp, search_bp, batch_bp, dashboard_bp
 
 def ensure_user_schema():
     columns = db.session.execute(text("""
@@ -140,6 +140,23 @@ def ensure_project_schema():
     """))
     db.session.commit()
 
+    db.session.execute(text("""
+        DO $$
+        BEGIN
+          IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'project_status') THEN
+            IF NOT EXISTS (
+              SELECT 1
+              FROM pg_enum e
+              JOIN pg_type t ON t.oid = e.enumtypid
+              WHERE t.typname = 'project_status' AND e.enumlabel = 'deleting'
+            ) THEN
+              ALTER TYPE project_status ADD VALUE 'deleting';
+            END IF;
+          END IF;
+        END $$;
+    """))
+    db.session.commit()
+
     team_message_columns = db.session.execute(text("""
         SELECT column_name
         FROM information_schema.columns
@@ -187,6 +204,38 @@ app.register_blueprint(notifications_bp)
 app.register_blueprint(comments_bp)
 app.register_blueprint(admin_bp)
 app.register_blueprint(team_chat_bp)
+app.register_blueprint(search_bp)
+app.register_blueprint(batch_bp)
+app.register_blueprint(dashboard_bp)
+
+# Scheduler de jobs en segundo plano (solo el proceso líder ejecuta jobs)
+from app.jobs import scheduler, register_sprint_jobs, register_task_flow_jobs, register_project_jobs
+scheduler.init_app(app)
+register_sprint_jobs(scheduler)
+register_task_flow_jobs(scheduler)
+register_project_jobs(scheduler)
+if app.config.get('SCHEDULER_ENABLED'):
+    scheduler.start()
+
+# Caché de la cola del chat por proyecto
+from app.realtime.chat_tail_cache import chat_tail_cache
+chat_tail_cache.init_app(app)
+
+# Caché de lecturas de servicios (configuración, miembros, sprints)
+from app.cache import read_cache
+read_cache.init_app(app)
+
+# Lecturas de endpoints @read_replica en la réplica (si DATABASE_REPLICA_URL)
+from app.db_routing import replica_router
+replica_router.init_app(app)
+
+# Compresión de respuestas JSON/NDJSON según Accept-Encoding
+from app.utils.compression import response_compressor
+response_compressor.init_app(app)
+
+# Comandos CLI (flask tasks ...)
+from app.cli import register_cli
+register_cli(app)
 
 # JWT Callbacks
 @jwt.expired_token_loader
@@ -325,6 +374,12 @@ def _run_inline_migrations():
                     except Exception as e:
                         _logger.error(f"Error añadiendo 'shift': {e}")
                         db.session.rollback()
+
+            # 4. Índices de búsqueda de texto completo (tareas y búsqueda unificada)
+            if 'tasks' in inspector.get_table_names():
+                from app.search import ensure_search_schema
+                if ensure_search_schema(db.engine):
+                    _logger.info("Índices de búsqueda disponibles")
     except Exception as e:
         import logging as _log
         _log.getLogger(__name__).warning(f"Migraciones inline omitidas (DB no disponible): {e}")
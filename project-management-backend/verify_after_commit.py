@@ -0,0 +1,128 @@
+"""
+Verificación de los hooks after_commit y de ProjectVersionService.bump frente a savepoints
+
+Un IntegrityError capturado dentro de begin_nested() (fallback de carrera en
+snapshot_sprint, ensure_tags, etc.) no debe descartar los callbacks ni los
+bumps que la transacción externa registró antes; un rollback de la
+transacción externa sí.
+
+Uso:
+    python verify_after_commit.py
+"""
+
+import os
+import sys
+
+# Base en memoria: no toca instance/app.db
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ.setdefault('SCHEDULER_ENABLED', 'false')
+sys.path.insert(0, os.path.abspath('.'))
+
+from sqlalchemy.exc import IntegrityError
+from run import app
+from app import db
+from app.models import Project, User
+from app.services.project_version_service import ProjectVersionService
+from app.utils.transaction import after_commit
+
+
+def _user(email):
+    return User(email=email, password_hash='x', name='Verificación', role='EMPLOYEE')
+
+
+def _savepoint_conflict(email):
+    """Insert duplicado dentro de un savepoint, capturado como en los fallbacks de carrera"""
+    try:
+        with db.session.begin_nested():
+            db.session.add(_user(email))
+    except IntegrityError:
+        pass
+
+
+def check_savepoint_rollback_keeps_callbacks():
+    ran = []
+    db.session.add(_user('savepoint@x.com'))
+    db.session.flush()
+    after_commit(ran.append, 'antes del savepoint')
+
+    _savepoint_conflict('savepoint@x.com')
+    after_commit(ran.append, 'después del savepoint')
+    db.session.commit()
+
+    return ran == ['antes del savepoint', 'después del savepoint'], ran
+
+
+def check_savepoint_release_defers_callbacks():
+    ran = []
+    after_commit(ran.append, 'descartado')
+    with db.session.begin_nested():
+        db.session.add(_user('release@x.com'))
+    # El savepoint se liberó, pero la transacción externa todavía puede deshacerse
+    db.session.rollback()
+
+    return ran == [], ran
+
+
+def check_outer_rollback_discards_callbacks():
+    ran = []
+    db.session.add(_user('rollback@x.com'))
+    db.session.flush()
+    after_commit(ran.append, 'descartado')
+    db.session.rollback()
+
+    # El siguiente commit no debe arrastrar callbacks de la transacción deshecha
+    db.session.add(_user('rollback@x.com'))
+    db.session.commit()
+
+    return ran == [], ran
+
+
+def check_failed_flush_then_rollback_discards_callbacks():
+    ran = []
+    after_commit(ran.append, 'descartado')
+    db.session.add(_user('savepoint@x.com'))
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+    db.session.commit()
+
+    return ran == [], ran
+
+
+def check_savepoint_rollback_keeps_version_bumps():
+    owner = User.query.filter_by(email='savepoint@x.com').first()
+    project = Project(name='Verificación', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    before = ProjectVersionService.get(project.id)['tasks']
+
+    ProjectVersionService.bump(project.id, 'tasks')
+    _savepoint_conflict('savepoint@x.com')
+    db.session.commit()
+
+    after = ProjectVersionService.get(project.id)['tasks']
+    return after == before + 1, (before, after)
+
+
+def verify():
+    checks = [
+        ('rollback de savepoint conserva callbacks', check_savepoint_rollback_keeps_callbacks),
+        ('savepoint liberado no adelanta callbacks', check_savepoint_release_defers_callbacks),
+        ('rollback externo descarta callbacks', check_outer_rollback_discards_callbacks),
+        ('flush fallido + rollback descarta callbacks', check_failed_flush_then_rollback_discards_callbacks),
+        ('rollback de savepoint conserva bumps de versión', check_savepoint_rollback_keeps_version_bumps),
+    ]
+    failed = 0
+    with app.app_context():
+        db.create_all()
+        for name, check in checks:
+            ok, detail = check()
+            print(f"[{'OK' if ok else 'FALLO'}] {name}: {detail}")
+            failed += 0 if ok else 1
+        db.session.remove()
+    return failed
+
+
+if __name__ == '__main__':
+    sys.exit(1 if verify() else 0)